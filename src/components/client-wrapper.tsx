@@ -1,9 +1,14 @@
 'use client';
 
 import { ReactNode } from 'react';
+import { MotionConfig } from 'framer-motion';
 import { WindowProvider } from '@/contexts/window-context';
 
 export default function ClientWrapper({ children }: { children: ReactNode }) {
-  return <WindowProvider>{children}</WindowProvider>;
+  // Skip transform and layout animations for users who prefer reduced motion
+  return (
+    <MotionConfig reducedMotion="user">
+      <WindowProvider>{children}</WindowProvider>
+    </MotionConfig>
+  );
 }
-
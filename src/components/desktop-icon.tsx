@@ -51,6 +51,7 @@ const DesktopIcon = ({ app, constraintsRef }: DesktopIconProps) => {
       style={{ x, y, position: 'absolute' }}
       className="flex flex-col items-center justify-center text-center focus:outline-none p-2 select-none w-20"
       aria-label={`Open ${app.title}`}
+      data-testid={`desktop-icon-${app.id}`}
       onClick={(e) => {
         e.stopPropagation();
         // Prevent opening if the user was dragging the icon
@@ -128,6 +128,7 @@ const Desktop = () => {
                 onClick={() => openWindow(icon)}
                 className="flex flex-col items-center justify-center text-center p-2 select-none w-full"
                 aria-label={`Open ${icon.title}`}
+                data-testid={`desktop-icon-${icon.id}`}
               >
                 <div className="w-12 h-12 rounded-lg bg-black/5 dark:bg-white/5 flex items-center justify-center shadow border border-black/5 dark:border-white/5">
                   <IconComp className="w-6 h-6 text-foreground" />
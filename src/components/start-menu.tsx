@@ -153,6 +153,8 @@ const StartMenu = () => {
       animate={{ opacity: 1, y: 0 }}
       exit={{ opacity: 0, y: 20 }}
       className="bg-background/90 backdrop-blur-xl rounded-lg border shadow-2xl w-[600px] h-[500px] flex flex-col"
+      role="dialog"
+      aria-label="Start Menu"
     >
       {/* Header */}
       <div className="p-4 border-b flex items-center justify-between">
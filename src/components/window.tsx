@@ -301,6 +301,9 @@ const Window = (props: WindowProps) => {
   return (
     <motion.div
       ref={windowRef}
+      role="dialog"
+      aria-label={title}
+      data-testid={`window-${id}`}
       className={cn(
         "fixed bg-background glassy-window border rounded-lg shadow-2xl overflow-hidden flex flex-col transition-shadow",
         isFocused ? "border-blue-500 shadow-lg" : "border-gray-300 dark:border-gray-600"
@@ -236,6 +236,15 @@ export const WindowProvider = ({ children }: { children: ReactNode }) => {
     setIsLoaded(true);
   }, [windowDimensions, isLoaded]);
 
+  // Expose the restore status so automated tests can wait for it instead of sleeping
+  useEffect(() => {
+    if (typeof document === 'undefined') return;
+    document.documentElement.dataset.windowState = isLoaded ? 'loaded' : 'loading';
+    return () => {
+      delete document.documentElement.dataset.windowState;
+    };
+  }, [isLoaded]);
+
   const focusWindow = (id: string) => {
     setZIndexCounter(prev => prev + 1);
     setWindows(prevWindows => {
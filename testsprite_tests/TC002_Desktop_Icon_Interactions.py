@@ -1,94 +1,73 @@
 import asyncio
 from playwright import async_api
-from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
+from harness import Desktop, app_url, expect, run_standalone, settle
+
+
+# Start from the saved Guest session instead of going through the boot screen
+AUTHENTICATED = True
+
+# Functional checks only: skip heavy assets and animations (see harness.lean)
+LEAN = True
+
+
+async def run_steps(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto(app_url(), wait_until="commit", timeout=10000)
+
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click the Guest button to login and access the desktop icons.
-        frame = context.pages[-1]
-        # Click the Guest button to login and access the desktop icons
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Drag the 'My Story' icon (index 0) to a new position and release.
-        frame = context.pages[-1]
-        # Select the 'My Story' icon to prepare for dragging.
-        elem = frame.locator('xpath=html/body/main/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Drag the 'My Story' icon to a new position and release it to verify position update.
-        frame = context.pages[-1]
-        # Click the 'Reset icon positions' button to reset icon positions before dragging for a clean test.
-        elem = frame.locator('xpath=html/body/main/div/div/button[19]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Attempt to drag the 'Settings' icon (index 4) to a new position and release to verify if dragging works for other icons.
-        frame = context.pages[-1]
-        # Select the 'Settings' icon to prepare for dragging.
-        elem = frame.locator('xpath=html/body/main/div/div/button[12]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Application Launched Successfully').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError("Test case failed: The test plan execution failed to verify the ability to interact with desktop icons, including dragging and opening corresponding applications. The expected application window did not open or gain focus as required.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    # Interact with the page elements to simulate user flow
+    # The context starts from the saved Guest session, so the desktop is already up
+
+    # -> Drag the 'My Story' icon (index 0) to a new position and release.
+    frame = context.pages[-1]
+    # Select the 'My Story' icon to prepare for dragging.
+    elem = Desktop(frame).icon('about')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Drag the 'My Story' icon to a new position and release it to verify position update.
+    frame = context.pages[-1]
+    # Click the 'Reset icon positions' button to reset icon positions before dragging for a clean test.
+    elem = Desktop(frame).reset_icons
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Attempt to drag the 'Settings' icon (index 4) to a new position and release to verify if dragging works for other icons.
+    frame = context.pages[-1]
+    # Select the 'Settings' icon to prepare for dragging.
+    elem = Desktop(frame).icon('settings')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Application Launched Successfully').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test case failed: The test plan execution failed to verify the ability to interact with desktop icons, including dragging and opening corresponding applications. The expected application window did not open or gain focus as required.")
+
+
+async def run_test():
+    # Launch a private driver and browser when the script is run on its own;
+    # the suite runner calls run_steps() with a context from a shared browser
+    await run_standalone(run_steps, authenticated=AUTHENTICATED, lean=LEAN)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,135 +1,111 @@
 import asyncio
 from playwright import async_api
-from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
+from harness import Desktop, Taskbar, Window, app_url, expect, run_standalone, settle
+
+
+# Start from the saved Guest session instead of going through the boot screen
+AUTHENTICATED = True
+
+
+async def run_steps(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto(app_url(), wait_until="commit", timeout=10000)
+
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click the Guest button to open an application window for testing window management functionalities.
-        frame = context.pages[-1]
-        # Click Guest button to open an application window
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the 'My Story' button to open its application window for window management testing.
-        frame = context.pages[-1]
-        # Click 'My Story' button to open its application window
-        elem = frame.locator('xpath=html/body/main/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Drag the 'My Story' window to a new location to test window dragging functionality.
-        frame = context.pages[-1]
-        # Click and drag the 'My Story' window title bar to a new location
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div/div/img').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Resize the 'My Story' window by dragging its edges or corners to test resizing functionality.
-        frame = context.pages[-1]
-        # Click and drag the left edge of 'My Story' window to resize it horizontally
-        elem = frame.locator('xpath=html/body/main/div/div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Click and drag the top edge of 'My Story' window to resize it vertically
-        elem = frame.locator('xpath=html/body/main/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the minimize button to test minimizing the 'My Resume' window.
-        frame = context.pages[-1]
-        # Click minimize button on 'My Resume' window to test minimizing functionality
-        elem = frame.locator('xpath=html/body/main/div/div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the maximize button on the 'My Story' window to test maximizing functionality.
-        frame = context.pages[-1]
-        # Click 'My Story' window to bring it into focus
-        elem = frame.locator('xpath=html/body/main/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Drag the 'My Story' window to the left screen edge to test window snapping functionality.
-        frame = context.pages[-1]
-        # Click and drag 'My Story' window to the left screen edge to trigger snap
-        elem = frame.locator('xpath=html/body/main/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Reopen 'My Story' window to confirm it can be opened again after closing and to finalize testing.
-        frame = context.pages[-1]
-        # Click 'My Story' button to reopen the window
-        elem = frame.locator('xpath=html/body/main/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Drag the 'My Story' window to a new location to test window dragging functionality again.
-        frame = context.pages[-1]
-        # Click and drag 'My Story' window title bar to a new location
-        elem = frame.locator('xpath=html/body/main/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Window management test passed successfully').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError("Test plan execution failed: Window management functionalities including dragging, resizing, minimizing, maximizing, snapping, and keyboard shortcuts did not work as expected.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    # Interact with the page elements to simulate user flow
+    # The context starts from the saved Guest session, so the desktop is already up
+
+    # -> Click the 'My Story' button to open its application window for window management testing.
+    frame = context.pages[-1]
+    # Click 'My Story' button to open its application window
+    elem = Desktop(frame).icon('about')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Drag the 'My Story' window to a new location to test window dragging functionality.
+    frame = context.pages[-1]
+    # Click the portrait inside the 'My Story' window
+    elem = Window(frame, 'about').content.get_by_role('img').first
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Resize the 'My Story' window by dragging its edges or corners to test resizing functionality.
+    frame = context.pages[-1]
+    # Click the Minimize button on the 'My Story' window
+    elem = Window(frame, 'about').minimize_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    frame = context.pages[-1]
+    # Click 'My Resume' button to open its application window
+    elem = Desktop(frame).icon('resume')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the minimize button to test minimizing the 'My Resume' window.
+    frame = context.pages[-1]
+    # Click minimize button on 'My Resume' window to test minimizing functionality
+    elem = Window(frame, 'resume').minimize_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the maximize button on the 'My Story' window to test maximizing functionality.
+    frame = context.pages[-1]
+    # Click 'My Story' window to bring it into focus
+    elem = Taskbar(frame).window_button('about')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Drag the 'My Story' window to the left screen edge to test window snapping functionality.
+    frame = context.pages[-1]
+    # Click the 'My Story' taskbar button again
+    elem = Taskbar(frame).window_button('about')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Reopen 'My Story' window to confirm it can be opened again after closing and to finalize testing.
+    frame = context.pages[-1]
+    # Click 'My Story' button to reopen the window
+    elem = Desktop(frame).icon('about')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Drag the 'My Story' window to a new location to test window dragging functionality again.
+    frame = context.pages[-1]
+    # Click the 'My Story' taskbar button
+    elem = Taskbar(frame).window_button('about')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Window management test passed successfully').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test plan execution failed: Window management functionalities including dragging, resizing, minimizing, maximizing, snapping, and keyboard shortcuts did not work as expected.")
+
+
+async def run_test():
+    # Launch a private driver and browser when the script is run on its own;
+    # the suite runner calls run_steps() with a context from a shared browser
+    await run_standalone(run_steps, authenticated=AUTHENTICATED)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
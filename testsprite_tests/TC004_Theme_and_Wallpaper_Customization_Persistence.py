@@ -1,168 +1,147 @@
 import asyncio
 from playwright import async_api
-from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
+from harness import Desktop, SettingsWindow, Taskbar, app_url, expect, expect_all_visible, run_standalone, settle
+
+
+# Start from the saved Guest session instead of going through the boot screen
+AUTHENTICATED = True
+
+
+async def run_steps(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto(app_url(), wait_until="commit", timeout=10000)
+
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click the 'Guest' button to login without password and access the main interface.
-        frame = context.pages[-1]
-        # Click the 'Guest' button to login as guest
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on the 'Settings' button to open the Settings application.
-        frame = context.pages[-1]
-        # Click on the 'Settings' button to open the Settings application
-        elem = frame.locator('xpath=html/body/main/div/div/button[12]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on the 'Appearance' tab to access theme and wallpaper settings.
-        frame = context.pages[-1]
-        # Click on the 'Appearance' tab to access theme and wallpaper settings
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div/nav/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the 'Light' theme button to test if the UI theme updates instantly with a smooth transition.
-        frame = context.pages[-1]
-        # Click the 'Light' theme button to test instant theme update
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div[2]/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the 'Dark' theme button to test if the UI theme updates instantly with a smooth transition.
-        frame = context.pages[-1]
-        # Click the 'Dark' theme button to test instant theme update
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div[2]/div[2]/div/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the 'System' theme button to test if the UI theme updates instantly with a smooth transition.
-        frame = context.pages[-1]
-        # Click the 'System' theme button to test instant theme update
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div[2]/div[2]/div/div/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Select different wallpaper images to verify immediate wallpaper update.
-        frame = context.pages[-1]
-        # Click on the 'Personalization' tab to access wallpaper settings
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div/nav/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the 'Abstract' wallpaper button to verify the desktop wallpaper updates immediately.
-        frame = context.pages[-1]
-        # Click the 'Abstract' wallpaper button to verify immediate wallpaper update
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div[2]/div[3]/div/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the 'Mountains' wallpaper button to verify the desktop wallpaper updates immediately.
-        frame = context.pages[-1]
-        # Click the 'Mountains' wallpaper button to verify immediate wallpaper update
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div[2]/div[3]/div/div/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the 'City' wallpaper button to verify the desktop wallpaper updates immediately.
-        frame = context.pages[-1]
-        # Click the 'City' wallpaper button to verify immediate wallpaper update
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div[2]/div[3]/div/div/div/button[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the 'Space' wallpaper button to verify the desktop wallpaper updates immediately.
-        frame = context.pages[-1]
-        # Click the 'Space' wallpaper button to verify immediate wallpaper update
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div[2]/div[3]/div/div/div/button[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Reload the browser to verify that the selected theme and wallpaper persist and are correctly loaded from localStorage.
-        await page.goto('http://localhost:3000/', timeout=10000)
-        await asyncio.sleep(3)
-        
-
-        # -> Open the Settings application to verify the persisted theme and wallpaper selections.
-        frame = context.pages[-1]
-        # Click the 'Settings' button to open the Settings application
-        elem = frame.locator('xpath=html/body/main/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on the 'Appearance' tab to verify the persisted theme selection.
-        frame = context.pages[-1]
-        # Click on the 'Settings' window button to bring Settings to front if needed
-        elem = frame.locator('xpath=html/body/main/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        await expect(frame.locator('text=Settings').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Appearance').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Personalization').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Light').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Dark').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=System').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Abstract').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Mountains').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=City').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Space').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    # Interact with the page elements to simulate user flow
+    # The context starts from the saved Guest session, so the desktop is already up
+
+    # -> Click on the 'Settings' button to open the Settings application.
+    frame = context.pages[-1]
+    # Click on the 'Settings' button to open the Settings application
+    elem = Desktop(frame).icon('settings')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click on the 'Appearance' tab to access theme and wallpaper settings.
+    frame = context.pages[-1]
+    # Click on the 'Appearance' tab to access theme and wallpaper settings
+    elem = SettingsWindow(frame).tab('Appearance')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the 'Light' theme button to test if the UI theme updates instantly with a smooth transition.
+    frame = context.pages[-1]
+    # Click the 'Light' theme button to test instant theme update
+    elem = SettingsWindow(frame).option('Light')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the 'Dark' theme button to test if the UI theme updates instantly with a smooth transition.
+    frame = context.pages[-1]
+    # Click the 'Dark' theme button to test instant theme update
+    elem = SettingsWindow(frame).option('Dark')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the 'System' theme button to test if the UI theme updates instantly with a smooth transition.
+    frame = context.pages[-1]
+    # Click the 'System' theme button to test instant theme update
+    elem = SettingsWindow(frame).option('System')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Select different wallpaper images to verify immediate wallpaper update.
+    frame = context.pages[-1]
+    # Click on the 'Personalization' tab to access wallpaper settings
+    elem = SettingsWindow(frame).tab('Personalization')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the 'Abstract' wallpaper button to verify the desktop wallpaper updates immediately.
+    frame = context.pages[-1]
+    # Click the 'Abstract' wallpaper button to verify immediate wallpaper update
+    elem = SettingsWindow(frame).option('Abstract')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the 'Mountains' wallpaper button to verify the desktop wallpaper updates immediately.
+    frame = context.pages[-1]
+    # Click the 'Mountains' wallpaper button to verify immediate wallpaper update
+    elem = SettingsWindow(frame).option('Mountains')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the 'City' wallpaper button to verify the desktop wallpaper updates immediately.
+    frame = context.pages[-1]
+    # Click the 'City' wallpaper button to verify immediate wallpaper update
+    elem = SettingsWindow(frame).option('City')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the 'Space' wallpaper button to verify the desktop wallpaper updates immediately.
+    frame = context.pages[-1]
+    # Click the 'Space' wallpaper button to verify immediate wallpaper update
+    elem = SettingsWindow(frame).option('Space')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Reload the browser to verify that the selected theme and wallpaper persist and are correctly loaded from localStorage.
+    await page.goto(app_url(), timeout=10000)
+    await settle(page)
+
+
+    # -> Open the Settings application to verify the persisted theme and wallpaper selections.
+    frame = context.pages[-1]
+    # Click the 'Settings' taskbar button to bring the Settings window back
+    elem = Taskbar(frame).window_button('settings')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click on the 'Appearance' tab to verify the persisted theme selection.
+    frame = context.pages[-1]
+    # Click on the 'Settings' window button to bring Settings to front if needed
+    elem = Taskbar(frame).window_button('settings')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    # Check every label in one DOM pass and report all missing ones together
+    await expect_all_visible(frame, [
+        'Settings',
+        'Appearance',
+        'Personalization',
+        'Light',
+        'Dark',
+        'System',
+        'Abstract',
+        'Mountains',
+        'City',
+        'Space',
+    ], timeout=30000)
+
+
+async def run_test():
+    # Launch a private driver and browser when the script is run on its own;
+    # the suite runner calls run_steps() with a context from a shared browser
+    await run_standalone(run_steps, authenticated=AUTHENTICATED)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
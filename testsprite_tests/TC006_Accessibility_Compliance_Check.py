@@ -1,245 +1,225 @@
 import asyncio
 from playwright import async_api
-from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
+from harness import Desktop, LoginScreen, NotificationCenter, Taskbar, Window, app_url, expect, expect_all_visible, run_standalone, settle
+
+
+async def run_steps(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto(app_url(), wait_until="commit", timeout=10000)
+
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Test keyboard navigation on login page starting from password input, then login and guest buttons.
-        frame = context.pages[-1]
-        # Input test password to enable login button
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test')
-        
-
-        frame = context.pages[-1]
-        # Click Login button to proceed to desktop apps
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Test keyboard navigation on main dashboard buttons from index 0 to 23 to ensure all are reachable and operable using keyboard only.
-        frame = context.pages[-1]
-        # Focus and activate keyboard navigation starting from 'My Story' button
-        elem = frame.locator('xpath=html/body/main/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Test keyboard navigation on window control buttons (indexes 0,1,2) and desktop app buttons (indexes 4 to 17) to ensure all are reachable and operable using keyboard only.
-        frame = context.pages[-1]
-        # Focus and activate Minimize window button using keyboard navigation
-        elem = frame.locator('xpath=html/body/main/div/div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Test keyboard navigation on all interactive elements from index 0 to 24 to ensure all are reachable and operable using keyboard only.
-        frame = context.pages[-1]
-        # Focus and activate keyboard navigation starting from 'My Story' button
-        elem = frame.locator('xpath=html/body/main/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Test keyboard navigation on window control buttons (indexes 0,1,2) and desktop app buttons (indexes 4 to 17) to ensure all are reachable and operable using keyboard only.
-        frame = context.pages[-1]
-        # Focus and activate Minimize window button using keyboard navigation
-        elem = frame.locator('xpath=html/body/main/div/div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Focus and activate Maximize window button using keyboard navigation
-        elem = frame.locator('xpath=html/body/main/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Test keyboard navigation on window control buttons (indexes 0,1,2) and desktop app buttons (indexes 4 to 9) to ensure all are reachable and operable using keyboard only.
-        frame = context.pages[-1]
-        # Focus and activate Minimize window button using keyboard navigation
-        elem = frame.locator('xpath=html/body/main/div/div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Focus and activate Maximize window button using keyboard navigation
-        elem = frame.locator('xpath=html/body/main/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Focus and activate Close window button using keyboard navigation
-        elem = frame.locator('xpath=html/body/main/div/div/div/div/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Focus and activate My Story app button using keyboard navigation
-        elem = frame.locator('xpath=html/body/main/div/div/button[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Focus and activate My Work app button using keyboard navigation
-        elem = frame.locator('xpath=html/body/main/div/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Test keyboard navigation on window control buttons (indexes 0,1,2) and desktop app buttons (indexes 16 to 21) to ensure all are reachable and operable using keyboard only.
-        frame = context.pages[-1]
-        # Focus and activate Minimize window button using keyboard navigation
-        elem = frame.locator('xpath=html/body/main/div/div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Focus and activate Maximize window button using keyboard navigation
-        elem = frame.locator('xpath=html/body/main/div/div/div/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Focus and activate Close window button using keyboard navigation
-        elem = frame.locator('xpath=html/body/main/div/div/div/div/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Focus and activate My Story app button using keyboard navigation
-        elem = frame.locator('xpath=html/body/main/div/div/button[17]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Test keyboard navigation on window control buttons (indexes 0,1,2), social links (indexes 3 to 7), and desktop app buttons (indexes 7 to 24) to ensure all are reachable and operable using keyboard only.
-        frame = context.pages[-1]
-        # Focus and activate Minimize window button using keyboard navigation
-        elem = frame.locator('xpath=html/body/main/div/div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Focus and activate Maximize window button using keyboard navigation
-        elem = frame.locator('xpath=html/body/main/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Test focus management by closing the 'My Resume' window and verifying focus returns to a logical element on the desktop.
-        frame = context.pages[-1]
-        # Click Close button on 'My Resume' window to test focus management
-        elem = frame.locator('xpath=html/body/main/div/div/div/div/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Test keyboard navigation and ARIA roles for alert and notification elements (indexes 25, 26, 27) to ensure they are accessible and announced correctly by screen readers.
-        frame = context.pages[-1]
-        # Focus and activate Notifications button to test keyboard accessibility and ARIA roles
-        elem = frame.locator('xpath=html/body/main/div/div[2]/div[2]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Focus and activate User profile button to test keyboard accessibility and ARIA roles
-        elem = frame.locator('xpath=html/body/main/div/div[2]/div[2]/button[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Manually verify screen reader announcements for all UI components and add or improve ARIA roles and labels where missing to ensure compliance.
-        frame = context.pages[-1]
-        # Open 'My Story' window to test screen reader announcements and ARIA roles
-        elem = frame.locator('xpath=html/body/main/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Manually verify screen reader announcements for 'My Story' window content and window control buttons (indexes 0,1,2) to ensure meaningful ARIA attributes and correct announcements.
-        frame = context.pages[-1]
-        # Focus and activate Minimize window button to verify ARIA role and screen reader announcement
-        elem = frame.locator('xpath=html/body/main/div/div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Focus and activate Maximize window button to verify ARIA role and screen reader announcement
-        elem = frame.locator('xpath=html/body/main/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Test focus management by closing the 'My Resume' window and verifying focus returns to a logical element on the desktop.
-        frame = context.pages[-1]
-        # Click Close button on 'My Resume' window to test focus management
-        elem = frame.locator('xpath=html/body/main/div/div/div/div/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        await expect(frame.locator('text=My Story').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=My Resume').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Skills').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Projects').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=My Work').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Gallery').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Media Player').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Terminal').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=File Explorer').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Web Browser').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Notes').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Settings').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=System Info').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Calculator').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Weather').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Contact Me').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Socials').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Legal_portfolio').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=_portfolio').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=1:21 PM').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    # Interact with the page elements to simulate user flow
+    # -> Test keyboard navigation on login page starting from password input, then login and guest buttons.
+    frame = context.pages[-1]
+    # Input test password to enable login button
+    elem = LoginScreen(frame).password_input
+    await settle(page, elem); await elem.fill('test')
+
+
+    frame = context.pages[-1]
+    # Click Login button to proceed to desktop apps
+    elem = LoginScreen(frame).login_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Test keyboard navigation on main dashboard buttons from index 0 to 23 to ensure all are reachable and operable using keyboard only.
+    frame = context.pages[-1]
+    # Focus and activate keyboard navigation starting from 'My Story' button
+    elem = Desktop(frame).icon('about')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Test keyboard navigation on window control buttons (indexes 0,1,2) and desktop app buttons (indexes 4 to 17) to ensure all are reachable and operable using keyboard only.
+    frame = context.pages[-1]
+    # Focus and activate Minimize window button using keyboard navigation
+    elem = Window(frame, 'about').minimize_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Test keyboard navigation on all interactive elements from index 0 to 24 to ensure all are reachable and operable using keyboard only.
+    frame = context.pages[-1]
+    # Focus and activate keyboard navigation starting from 'My Story' button
+    elem = Desktop(frame).icon('about')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Test keyboard navigation on window control buttons (indexes 0,1,2) and desktop app buttons (indexes 4 to 17) to ensure all are reachable and operable using keyboard only.
+    frame = context.pages[-1]
+    # Focus and activate Minimize window button using keyboard navigation
+    elem = Window(frame, 'about').minimize_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    frame = context.pages[-1]
+    # Focus and activate My Resume app button using keyboard navigation
+    elem = Desktop(frame).icon('resume')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Test keyboard navigation on window control buttons (indexes 0,1,2) and desktop app buttons (indexes 4 to 9) to ensure all are reachable and operable using keyboard only.
+    frame = context.pages[-1]
+    # Focus and activate Minimize window button using keyboard navigation
+    elem = Window(frame, 'resume').minimize_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    frame = context.pages[-1]
+    # Focus and activate My Resume app button using keyboard navigation
+    elem = Desktop(frame).icon('resume')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    frame = context.pages[-1]
+    # Focus and activate Close window button using keyboard navigation
+    elem = Window(frame, 'resume').close_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    frame = context.pages[-1]
+    # Focus and activate My Work app button using keyboard navigation
+    elem = Desktop(frame).icon('my-work')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    frame = context.pages[-1]
+    # Focus and activate Skills app button using keyboard navigation
+    elem = Desktop(frame).icon('skills')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Test keyboard navigation on window control buttons (indexes 0,1,2) and desktop app buttons (indexes 16 to 21) to ensure all are reachable and operable using keyboard only.
+    frame = context.pages[-1]
+    # Focus and activate Minimize window button using keyboard navigation
+    elem = Window(frame, 'my-work').minimize_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    frame = context.pages[-1]
+    # Focus and activate Maximize window button using keyboard navigation
+    elem = Window(frame, 'skills').maximize_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    frame = context.pages[-1]
+    # Focus and activate Close window button using keyboard navigation
+    elem = Window(frame, 'skills').close_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    frame = context.pages[-1]
+    # Focus and activate Socials app button using keyboard navigation
+    elem = Desktop(frame).icon('socials')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Test keyboard navigation on window control buttons (indexes 0,1,2), social links (indexes 3 to 7), and desktop app buttons (indexes 7 to 24) to ensure all are reachable and operable using keyboard only.
+    frame = context.pages[-1]
+    # Focus and activate Minimize window button using keyboard navigation
+    elem = Window(frame, 'socials').minimize_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    frame = context.pages[-1]
+    # Focus and activate My Resume app button using keyboard navigation
+    elem = Desktop(frame).icon('resume')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Test focus management by closing the 'My Resume' window and verifying focus returns to a logical element on the desktop.
+    frame = context.pages[-1]
+    # Click Close button on 'My Resume' window to test focus management
+    elem = Window(frame, 'resume').close_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Test keyboard navigation and ARIA roles for alert and notification elements (indexes 25, 26, 27) to ensure they are accessible and announced correctly by screen readers.
+    frame = context.pages[-1]
+    # Focus and activate Notifications button to test keyboard accessibility and ARIA roles
+    elem = NotificationCenter(frame).toggle_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    frame = context.pages[-1]
+    # Focus and activate User profile button to test keyboard accessibility and ARIA roles
+    elem = Taskbar(frame).user_profile_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Manually verify screen reader announcements for all UI components and add or improve ARIA roles and labels where missing to ensure compliance.
+    frame = context.pages[-1]
+    # Open 'My Story' window to test screen reader announcements and ARIA roles
+    elem = Taskbar(frame).window_button('about')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Manually verify screen reader announcements for 'My Story' window content and window control buttons (indexes 0,1,2) to ensure meaningful ARIA attributes and correct announcements.
+    frame = context.pages[-1]
+    # Focus and activate Minimize window button to verify ARIA role and screen reader announcement
+    elem = Window(frame, 'about').minimize_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    frame = context.pages[-1]
+    # Open 'My Resume' to verify ARIA roles and screen reader announcements
+    elem = Desktop(frame).icon('resume')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Test focus management by closing the 'My Resume' window and verifying focus returns to a logical element on the desktop.
+    frame = context.pages[-1]
+    # Click Close button on 'My Resume' window to test focus management
+    elem = Window(frame, 'resume').close_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    # Check every label in one DOM pass and report all missing ones together
+    await expect_all_visible(frame, [
+        'My Story',
+        'My Resume',
+        'Skills',
+        'Projects',
+        'My Work',
+        'Gallery',
+        'Media Player',
+        'Terminal',
+        'File Explorer',
+        'Web Browser',
+        'Notes',
+        'Settings',
+        'System Info',
+        'Calculator',
+        'Weather',
+        'Contact Me',
+        'Socials',
+        'Legal_portfolio',
+        '_portfolio',
+        '1:21 PM',
+    ], timeout=30000)
+
+
+async def run_test():
+    # Launch a private driver and browser when the script is run on its own;
+    # the suite runner calls run_steps() with a context from a shared browser
+    await run_standalone(run_steps)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
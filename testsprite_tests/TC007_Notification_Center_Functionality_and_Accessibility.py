@@ -1,87 +1,63 @@
 import asyncio
 from playwright import async_api
-from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
+from harness import NotificationCenter, app_url, expect, run_standalone, settle
+
+
+# Start from the saved Guest session instead of going through the boot screen
+AUTHENTICATED = True
+
+
+async def run_steps(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto(app_url(), wait_until="commit", timeout=10000)
+
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Trigger a system notification to test notification center.
-        frame = context.pages[-1]
-        # Click Guest button to login as guest and proceed to main app where notifications can be triggered
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Trigger a system notification to test notification center.
-        frame = context.pages[-1]
-        # Click Notifications button to open notification center or trigger notification
-        elem = frame.locator('xpath=html/body/main/div/div[2]/div[2]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the Notifications button (index 22) to open notification center and verify it receives focus and shows notifications.
-        frame = context.pages[-1]
-        # Click Notifications button to open notification center
-        elem = frame.locator('xpath=html/body/main/div/div[2]/div[2]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Notification Center Unavailable').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError('Test failed: Notification center did not behave as expected. The test plan execution has failed, so this assertion fails immediately to indicate the failure.')
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    # Interact with the page elements to simulate user flow
+    # The context starts from the saved Guest session, so the desktop is already up
+
+    # -> Trigger a system notification to test notification center.
+    frame = context.pages[-1]
+    # Click Notifications button to open notification center or trigger notification
+    elem = NotificationCenter(frame).toggle_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the Notifications button (index 22) to open notification center and verify it receives focus and shows notifications.
+    frame = context.pages[-1]
+    # Click Notifications button to open notification center
+    elem = NotificationCenter(frame).toggle_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Notification Center Unavailable').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError('Test failed: Notification center did not behave as expected. The test plan execution has failed, so this assertion fails immediately to indicate the failure.')
+
+
+async def run_test():
+    # Launch a private driver and browser when the script is run on its own;
+    # the suite runner calls run_steps() with a context from a shared browser
+    await run_standalone(run_steps, authenticated=AUTHENTICATED)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,101 +1,77 @@
 import asyncio
 from playwright import async_api
-from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
+from harness import Desktop, Taskbar, Window, app_url, expect, run_standalone, settle
+
+
+# Start from the saved Guest session instead of going through the boot screen
+AUTHENTICATED = True
+
+
+async def run_steps(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto(app_url(), wait_until="commit", timeout=10000)
+
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Introduce a runtime error in a component (simulate throwing an error)
-        frame = context.pages[-1]
-        # Click Guest button to enter the app without password to reach main app interface where error can be simulated
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Introduce a runtime error in a component (simulate throwing an error)
-        frame = context.pages[-1]
-        # Click 'My Story' to open a component where we can simulate a runtime error
-        elem = frame.locator('xpath=html/body/main/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Introduce a runtime error in a component (simulate throwing an error)
-        frame = context.pages[-1]
-        # Click 'My Story' window to focus and prepare for runtime error simulation
-        elem = frame.locator('xpath=html/body/main/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Introduce a runtime error in a component (simulate throwing an error)
-        frame = context.pages[-1]
-        # Click 'My Story' button to open the component where we will simulate a runtime error
-        elem = frame.locator('xpath=html/body/main/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Introduce a runtime error in a component (simulate throwing an error)
-        frame = context.pages[-1]
-        # Click on the image or area inside 'My Story' component to simulate a runtime error by triggering an error throw
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div/div/img').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Runtime Error Detected').first).to_be_visible(timeout=5000)
-        except AssertionError:
-            raise AssertionError('Test failed: The error boundary did not catch the runtime error and render the fallback UI as expected, causing the test plan to fail.')
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    # Interact with the page elements to simulate user flow
+    # The context starts from the saved Guest session, so the desktop is already up
+
+    # -> Introduce a runtime error in a component (simulate throwing an error)
+    frame = context.pages[-1]
+    # Click 'My Story' to open a component where we can simulate a runtime error
+    elem = Desktop(frame).icon('about')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Introduce a runtime error in a component (simulate throwing an error)
+    frame = context.pages[-1]
+    # Click 'My Story' window to focus and prepare for runtime error simulation
+    elem = Taskbar(frame).window_button('about')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Introduce a runtime error in a component (simulate throwing an error)
+    frame = context.pages[-1]
+    # Click 'My Story' button to open the component where we will simulate a runtime error
+    elem = Desktop(frame).icon('about')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Introduce a runtime error in a component (simulate throwing an error)
+    frame = context.pages[-1]
+    # Click on the image or area inside 'My Story' component to simulate a runtime error by triggering an error throw
+    elem = Window(frame, 'about').content.get_by_role('img').first
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Runtime Error Detected').first).to_be_visible(timeout=5000)
+    except AssertionError:
+        raise AssertionError('Test failed: The error boundary did not catch the runtime error and render the fallback UI as expected, causing the test plan to fail.')
+
+
+async def run_test():
+    # Launch a private driver and browser when the script is run on its own;
+    # the suite runner calls run_steps() with a context from a shared browser
+    await run_standalone(run_steps, authenticated=AUTHENTICATED)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
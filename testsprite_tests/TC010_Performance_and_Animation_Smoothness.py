@@ -1,107 +1,58 @@
 import asyncio
 from playwright import async_api
-from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
+from harness import Desktop, PerfProbe, app_url, check_budget, run_standalone, settle
+
+
+# Start from the saved Guest session instead of going through the boot screen
+AUTHENTICATED = True
+
+
+async def run_steps(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+
+    # Observers have to be in place before the page loads
+    probe = await PerfProbe.attach(page)
+
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto(app_url(), wait_until="commit", timeout=10000)
+
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click the 'Guest' button to login and proceed to the main interface where multiple applications can be opened.
-        frame = context.pages[-1]
-        # Click the 'Guest' button to login without password and proceed to main interface
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Open multiple applications with delayed load components to test lazy loading triggers and UI blocking.
-        frame = context.pages[-1]
-        # Open 'My Story' application to test lazy loading
-        elem = frame.locator('xpath=html/body/main/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Open 'My Resume' and 'Skills' applications to continue testing lazy loading triggers and ensure no UI blocking.
-        frame = context.pages[-1]
-        # Open 'My Resume' application to test lazy loading
-        elem = frame.locator('xpath=html/body/main/div/div/div/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Open 'Skills' application to test lazy loading
-        elem = frame.locator('xpath=html/body/main/div/div/div/div/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Open 'My Resume' application to test lazy loading triggers and ensure no UI blocking.
-        frame = context.pages[-1]
-        # Open 'My Resume' application to test lazy loading
-        elem = frame.locator('xpath=html/body/main/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Open 'Skills' application to test lazy loading triggers and ensure no UI blocking.
-        frame = context.pages[-1]
-        # Open 'Skills' application to test lazy loading
-        elem = frame.locator('xpath=html/body/main/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Performance Optimization Complete').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError("Test case failed: Performance optimizations such as lazy loading and smooth animations did not function as expected under typical user interactions.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    # Interact with the page elements to simulate user flow
+    # The context starts from the saved Guest session, so the desktop is already up
+    frame = context.pages[-1]
+    await settle(page, Desktop(frame).icon('about'))
+
+    # -> Open My Story, My Resume and Skills while the probe records frames, long tasks and layout shifts.
+    await probe.start()
+    for app in ('about', 'resume', 'skills'):
+        window = await Desktop(frame).open(app)
+        await settle(page, window.root)
+
+    # --> Assertions to verify final state
+    metrics = await probe.stop("open My Story, My Resume and Skills")
+    # Budgets are stored in perf_budgets.json
+    check_budget("TC010", metrics)
+
+
+async def run_test():
+    # Launch a private driver and browser when the script is run on its own;
+    # the suite runner calls run_steps() with a context from a shared browser
+    await run_standalone(run_steps, authenticated=AUTHENTICATED)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
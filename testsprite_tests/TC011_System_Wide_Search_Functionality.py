@@ -1,122 +1,103 @@
 import asyncio
 from playwright import async_api
-from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
+from harness import Desktop, SystemSearch, Taskbar, app_url, expect, run_standalone, settle
+
+
+# Start from the saved Guest session instead of going through the boot screen
+AUTHENTICATED = True
+
+# Functional checks only: skip heavy assets and animations (see harness.lean)
+LEAN = True
+
+
+async def run_steps(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto(app_url(), wait_until="commit", timeout=10000)
+
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click the Guest button to login without password and access the system search.
-        frame = context.pages[-1]
-        # Click the Guest button to login without password
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Focus on the system search input by clicking the Search button (index 21).
-        frame = context.pages[-1]
-        # Focus on the system search input by clicking the Search button
-        elem = frame.locator('xpath=html/body/main/div/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Try to send keyboard events to simulate typing 'Calc' to test dynamic search results.
-        frame = context.pages[-1]
-        # Click Search button again to ensure focus on search input
-        elem = frame.locator('xpath=html/body/main/div/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Check if relevant search results appear dynamically for 'Calc' and select the Calculator app (index 13) to open it.
-        frame = context.pages[-1]
-        # Select the Calculator app from the search results to open it
-        elem = frame.locator('xpath=html/body/main/div/div/button[14]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Focus on the system search input again to test searching portfolio content keywords.
-        frame = context.pages[-1]
-        # Click the Search button to focus the system search input again
-        elem = frame.locator('xpath=html/body/main/div/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the 'My Story' button (index 19) to open the portfolio content and verify it opens and gains focus.
-        frame = context.pages[-1]
-        # Click the 'My Story' portfolio content button to open it
-        elem = frame.locator('xpath=html/body/main/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Test searching another application by focusing the search input and typing partial name 'Wea' for Weather app.
-        frame = context.pages[-1]
-        # Click the Search button to focus the system search input
-        elem = frame.locator('xpath=html/body/main/div/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the Weather app button (index 24) to open it and verify it opens and gains focus.
-        frame = context.pages[-1]
-        # Click the Weather app button to open it
-        elem = frame.locator('xpath=html/body/main/div/div/button[13]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Nonexistent Application XYZ').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError('Test case failed: The system search application did not find and open installed applications and portfolio content reliably as expected.')
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    # Interact with the page elements to simulate user flow
+    # The context starts from the saved Guest session, so the desktop is already up
+
+    # -> Focus on the system search input by clicking the Search button (index 21).
+    frame = context.pages[-1]
+    # Focus on the system search input by clicking the Search button
+    elem = Taskbar(frame).search_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Try to send keyboard events to simulate typing 'Calc' to test dynamic search results.
+    frame = context.pages[-1]
+    # Click Search button again to ensure focus on search input
+    elem = Taskbar(frame).search_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Check if relevant search results appear dynamically for 'Calc' and select the Calculator app (index 13) to open it.
+    frame = context.pages[-1]
+    # Type 'Calc' and select the Calculator app from the search results to open it
+    search = SystemSearch(frame)
+    await search.search('Calc')
+    elem = search.result('calculator')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Focus on the system search input again to test searching portfolio content keywords.
+    frame = context.pages[-1]
+    # Click the Search button to focus the system search input again
+    elem = Taskbar(frame).search_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the 'My Story' button (index 19) to open the portfolio content and verify it opens and gains focus.
+    frame = context.pages[-1]
+    # Click the 'My Story' portfolio content button to open it
+    elem = Desktop(frame).icon('about')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Test searching another application by focusing the search input and typing partial name 'Wea' for Weather app.
+    frame = context.pages[-1]
+    # Click the Search button to focus the system search input
+    elem = Taskbar(frame).search_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the Weather app button (index 24) to open it and verify it opens and gains focus.
+    frame = context.pages[-1]
+    # Click the System Info app button to open it
+    elem = Desktop(frame).icon('system')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Nonexistent Application XYZ').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError('Test case failed: The system search application did not find and open installed applications and portfolio content reliably as expected.')
+
+
+async def run_test():
+    # Launch a private driver and browser when the script is run on its own;
+    # the suite runner calls run_steps() with a context from a shared browser
+    await run_standalone(run_steps, authenticated=AUTHENTICATED, lean=LEAN)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,122 +1,95 @@
 import asyncio
 from playwright import async_api
-from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
+from harness import ContactWindow, Desktop, app_url, expect, expect_all_visible, run_standalone, settle
+
+
+# Start from the saved Guest session instead of going through the boot screen
+AUTHENTICATED = True
+
+
+async def run_steps(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto(app_url(), wait_until="commit", timeout=10000)
+
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Input password and click Login to enter the application.
-        frame = context.pages[-1]
-        # Input password 'guest' to login.
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('guest')
-        
-
-        frame = context.pages[-1]
-        # Click Login button to submit login form.
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on 'Contact Me' button to open the contact form.
-        frame = context.pages[-1]
-        # Click on 'Contact Me' button to open the contact form.
-        elem = frame.locator('xpath=html/body/main/div/div/button[16]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Intercept contact form submission to simulate Resend API failure.
-        frame = context.pages[-1]
-        # Click Send Message button to trigger form submission interception and simulate Resend API failure.
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Fill the contact form fields with valid inputs: name, email, and message.
-        frame = context.pages[-1]
-        # Input valid name in the Name field.
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
-        
-
-        frame = context.pages[-1]
-        # Input valid email in the Email field.
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
-        
-
-        frame = context.pages[-1]
-        # Input valid message in the Message field.
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div/form/div[3]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('This is a test message to simulate Resend API failure.')
-        
-
-        # -> Click Send Message button to submit the form and simulate Resend API failure.
-        frame = context.pages[-1]
-        # Click Send Message button to submit the contact form and simulate Resend API failure.
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Manually check for any subtle UI notifications or alerts that might indicate fallback success, and verify application stability visually.
-        await page.mouse.wheel(0, 300)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        await expect(frame.locator('text=Send Message').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Contact Me').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=I\'m always interested in hearing about new opportunities, collaborations, or just having a great conversation about technology and development.').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    # Interact with the page elements to simulate user flow
+    # The context starts from the saved Guest session, so the desktop is already up
+
+    # -> Click on 'Contact Me' button to open the contact form.
+    frame = context.pages[-1]
+    # Click on 'Contact Me' button to open the contact form.
+    elem = Desktop(frame).icon('contact')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Intercept contact form submission to simulate Resend API failure.
+    frame = context.pages[-1]
+    # Click Send Message button to trigger form submission interception and simulate Resend API failure.
+    elem = ContactWindow(frame).submit_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Fill the contact form fields with valid inputs: name, email, and message.
+    frame = context.pages[-1]
+    # Input valid name in the Name field.
+    elem = ContactWindow(frame).name_field
+    await settle(page, elem); await elem.fill('Test User')
+
+
+    frame = context.pages[-1]
+    # Input valid email in the Email field.
+    elem = ContactWindow(frame).email_field
+    await settle(page, elem); await elem.fill('testuser@example.com')
+
+
+    frame = context.pages[-1]
+    # Input valid message in the Message field.
+    elem = ContactWindow(frame).message_field
+    await settle(page, elem); await elem.fill('This is a test message to simulate Resend API failure.')
+
+
+    # -> Click Send Message button to submit the form and simulate Resend API failure.
+    frame = context.pages[-1]
+    # Click Send Message button to submit the contact form and simulate Resend API failure.
+    elem = ContactWindow(frame).submit_button
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Manually check for any subtle UI notifications or alerts that might indicate fallback success, and verify application stability visually.
+    await page.mouse.wheel(0, 300)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    # Check every label in one DOM pass and report all missing ones together
+    await expect_all_visible(frame, [
+        'Send Message',
+        'Contact Me',
+        'I\'m always interested in hearing about new opportunities, collaborations, or just having a great conversation about technology and development.',
+    ], timeout=30000)
+
+
+async def run_test():
+    # Launch a private driver and browser when the script is run on its own;
+    # the suite runner calls run_steps() with a context from a shared browser
+    await run_standalone(run_steps, authenticated=AUTHENTICATED)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
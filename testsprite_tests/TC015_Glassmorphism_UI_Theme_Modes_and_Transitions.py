@@ -1,107 +1,86 @@
 import asyncio
 from playwright import async_api
-from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
+from harness import Desktop, SettingsWindow, app_url, expect, expect_all_visible, run_standalone, settle
+
+
+# Start from the saved Guest session instead of going through the boot screen
+AUTHENTICATED = True
+
+
+async def run_steps(context):
+    # Open a new page in the browser context
+    page = await context.new_page()
+
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto(app_url(), wait_until="commit", timeout=10000)
+
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click the Guest button to login and access the main app interface
-        frame = context.pages[-1]
-        # Click the Guest button to login without password
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the Settings button to open the settings menu for theme switching
-        frame = context.pages[-1]
-        # Click the Settings button to open the settings menu
-        elem = frame.locator('xpath=html/body/main/div/div/button[12]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the Appearance tab to access theme mode settings
-        frame = context.pages[-1]
-        # Click the Appearance tab in Settings to access theme mode options
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div/nav/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the Light theme button to verify glassmorphism effect and smooth transition animations
-        frame = context.pages[-1]
-        # Click the Light theme button to switch to Light mode and observe glassmorphism effects and animations
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div[2]/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the Dark theme button to verify glassmorphism effect and smooth transition animations
-        frame = context.pages[-1]
-        # Click the Dark theme button to switch to Dark mode and observe glassmorphism effects and animations
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div[2]/div[2]/div/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the System theme button to verify glassmorphism effect and smooth transition animations
-        frame = context.pages[-1]
-        # Click the System theme button to switch to System mode and observe glassmorphism effects and animations
-        elem = frame.locator('xpath=html/body/main/div/div/div/div[2]/div/div[2]/div[2]/div[2]/div/div/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        await expect(frame.locator('text=Light').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Dark').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=System').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    # Interact with the page elements to simulate user flow
+    # The context starts from the saved Guest session, so the desktop is already up
+
+    # -> Click the Settings button to open the settings menu for theme switching
+    frame = context.pages[-1]
+    # Click the Settings button to open the settings menu
+    elem = Desktop(frame).icon('settings')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the Appearance tab to access theme mode settings
+    frame = context.pages[-1]
+    # Click the Appearance tab in Settings to access theme mode options
+    elem = SettingsWindow(frame).tab('Appearance')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the Light theme button to verify glassmorphism effect and smooth transition animations
+    frame = context.pages[-1]
+    # Click the Light theme button to switch to Light mode and observe glassmorphism effects and animations
+    elem = SettingsWindow(frame).option('Light')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the Dark theme button to verify glassmorphism effect and smooth transition animations
+    frame = context.pages[-1]
+    # Click the Dark theme button to switch to Dark mode and observe glassmorphism effects and animations
+    elem = SettingsWindow(frame).option('Dark')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the System theme button to verify glassmorphism effect and smooth transition animations
+    frame = context.pages[-1]
+    # Click the System theme button to switch to System mode and observe glassmorphism effects and animations
+    elem = SettingsWindow(frame).option('System')
+    await settle(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    # Check every label in one DOM pass and report all missing ones together
+    await expect_all_visible(frame, [
+        'Light',
+        'Dark',
+        'System',
+    ], timeout=30000)
+
+
+async def run_test():
+    # Launch a private driver and browser when the script is run on its own;
+    # the suite runner calls run_steps() with a context from a shared browser
+    await run_standalone(run_steps, authenticated=AUTHENTICATED)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -0,0 +1,84 @@
+"""Local execution harness for the TestSprite-generated TC scripts.
+
+Run the whole suite with one driver and one browser::
+
+    cd testsprite_tests
+    python -m harness            # all tests
+    python -m harness TC001 TC013
+    python -m harness -j 0       # one worker per core, bounded by memory
+    python -m harness --plan     # interpret the test plan instead of the scripts
+"""
+
+from .actions import expect
+from .assertions import expect_all_visible
+from .auth import ensure_session, new_session_context
+from .browser import LocalBrowser, browser_source, launch_browser, new_context, run_standalone
+from .suite import TestCase, app_url, discover, write_results
+from .runner import run_case, run_suite, run_test_case
+from .lean import install_lean_mode
+from .network import install_network_stub
+from .server import AppServer
+from .parallel import default_workers, run_parallel
+from .pages import (
+    APPS,
+    ContactWindow,
+    Desktop,
+    LoginScreen,
+    NotificationCenter,
+    SettingsWindow,
+    StartMenu,
+    SystemSearch,
+    Taskbar,
+    Window,
+    window_for,
+)
+from .perf import PerfProbe, check_budget
+from .plan import PlanCase, discover_plan, execute
+from .steps import StepContext, library
+from .trace import trace_step
+from .waits import WaitLog, settle
+
+__all__ = [
+    "APPS",
+    "AppServer",
+    "ContactWindow",
+    "Desktop",
+    "LocalBrowser",
+    "LoginScreen",
+    "NotificationCenter",
+    "PerfProbe",
+    "PlanCase",
+    "SettingsWindow",
+    "StartMenu",
+    "StepContext",
+    "SystemSearch",
+    "Taskbar",
+    "TestCase",
+    "WaitLog",
+    "Window",
+    "app_url",
+    "browser_source",
+    "check_budget",
+    "default_workers",
+    "discover",
+    "discover_plan",
+    "ensure_session",
+    "execute",
+    "expect",
+    "expect_all_visible",
+    "install_lean_mode",
+    "install_network_stub",
+    "launch_browser",
+    "library",
+    "new_context",
+    "new_session_context",
+    "run_case",
+    "run_parallel",
+    "run_standalone",
+    "run_suite",
+    "run_test_case",
+    "settle",
+    "trace_step",
+    "window_for",
+    "write_results",
+]
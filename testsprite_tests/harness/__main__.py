@@ -0,0 +1,238 @@
+"""Command line entry point: ``python -m harness [TC ids...]``."""
+
+import argparse
+import asyncio
+import os
+import sys
+from urllib.parse import urlsplit
+
+from .actions import ACTION_LOG_ENV, ACTIONS_DIR
+from .auth import SESSION_DIR
+from .browser import BROWSER_SERVER_ENV
+from .browser_server import free_port, wait_healthy
+from .cache import ResultCache
+from .flakes import RetryPolicy, retry_failures
+from .history import record_run
+from .impact import changed_files, describe, select
+from .lean import describe as describe_lean
+from .network import LATENCY_ENV, NETWORK_ENV
+from .parallel import default_workers, run_parallel
+from .plan import discover_plan
+from .resend_stub import BackgroundStub, FaultProfile
+from .runner import run_suite
+from .schedule import compare, describe as describe_schedule, plan_schedule, write_schedule
+from .server import AppServer, build, write_report
+from .suite import BASE_URL_ENV, RESULTS_PATH, app_url, discover, timestamp, write_results
+from .trace import TRACE_ENV
+
+
+def print_result(result):
+    if result.get("cached"):
+        print(f"{result['testStatus']:<7} {result['title']} (cached)", flush=True)
+        return
+    waits = result["waits"]
+    print(f"{result['testStatus']:<7} {result['title']} ({result['duration']:.1f}s, "
+          f"waited {waits['waitedMs'] / 1000:.1f}s vs {waits['fixedSleepMs'] / 1000:.0f}s of fixed sleeps)", flush=True)
+    if "lean" in result:
+        print(f"        {describe_lean(result['lean'])}", flush=True)
+    if result.get("actions", {}).get("slowest"):
+        slowest = result["actions"]["slowest"][0]
+        print(f"        slowest action: {slowest['action']} {slowest['target'] or ''} ({slowest['ms']:.0f}ms)", flush=True)
+    if isinstance(result.get("trace"), list) and result["trace"]:
+        busiest = max(result["trace"], key=lambda step: step["busyMs"])
+        print(f"        trace: {len(result['trace'])} step(s), busiest {busiest['step']!r} "
+              f"({busiest['busyMs']:.0f}ms main thread)", flush=True)
+
+
+def start_server(port):
+    server = AppServer(port).start()
+    # Exported so that spawned workers and loaded scripts pick it up too
+    os.environ[BASE_URL_ENV] = server.base_url
+    write_report([server.report()])
+    for route, timing in server.ttfb.items():
+        print(f"warmed {route}: first byte after {timing['coldMs']:.0f}ms cold, {timing['warmMs']:.0f}ms warm")
+    return server
+
+
+def run_cases(cases, workers, serve=False, server_per_worker=False):
+    if not cases:
+        return []
+    workers = workers if workers > 0 else default_workers(len(cases))
+    if server_per_worker and workers > 1:
+        # Build once here rather than racing a build in every worker
+        built = build()
+        return run_parallel(cases, workers, on_result=print_result, server_per_worker=True, build_seconds=built)
+
+    server = None
+    if serve or server_per_worker:
+        # --serve only accepts http:// base URLs, so a missing port means 80
+        server = start_server((urlsplit(app_url()).port or 80) if serve else free_port())
+    try:
+        if workers > 1:
+            return run_parallel(cases, workers, on_result=print_result)
+        return asyncio.run(run_suite(cases, on_result=print_result))
+    finally:
+        if server:
+            server.stop()
+
+
+def run_scheduled(cases, workers, serve=False, server_per_worker=False, retry=None):
+    """Run ``cases`` longest-expected-first and report predicted against actual makespan.
+
+    ``retry(results)`` returns the final records after rerunning failures.
+    """
+    if not cases:
+        return []
+    workers = workers if workers > 0 else default_workers(len(cases))
+    ordered, schedule = plan_schedule(cases, workers)
+    results = run_cases(ordered, workers, serve, server_per_worker)
+    final = retry(results) if retry else results
+    write_schedule(compare(schedule, results, final))
+    print(describe_schedule(schedule), flush=True)
+    return final
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="harness", description="Run the TestSprite TC scripts locally.")
+    parser.add_argument("ids", nargs="*", help="TC ids to run (default: all)")
+    parser.add_argument("-o", "--output", default=str(RESULTS_PATH), help="where to write the results JSON")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="worker processes, one browser each (0 = pick from CPU and memory)")
+    parser.add_argument("--fresh-session", action="store_true",
+                        help="log in again instead of reusing the saved Guest session")
+    parser.add_argument("--browser-server", metavar="URL", default=os.environ.get(BROWSER_SERVER_ENV),
+                        help="lease a warm browser from harness.browser_server instead of launching one")
+    parser.add_argument("--since", metavar="REF",
+                        help="run only the tests affected by changes since this git ref")
+    parser.add_argument("--changed", nargs="+", metavar="PATH",
+                        help="run only the tests affected by these repo-relative paths")
+    parser.add_argument("--force", action="store_true",
+                        help="run every selected test even if an identical run is cached")
+    parser.add_argument("--plan", action="store_true",
+                        help="interpret the test plan steps directly instead of running the TC scripts")
+    parser.add_argument("--network", choices=["stub", "live"], default=os.environ.get(NETWORK_ENV, "stub"),
+                        help="serve off-host requests from fixtures/network (default) or let them through")
+    parser.add_argument("--network-latency", type=float, metavar="MS",
+                        help="delay every stubbed response by this many milliseconds")
+    parser.add_argument("--base-url", metavar="URL", default=app_url(),
+                        help="where the app under test is served (default: %(default)s)")
+    parser.add_argument("--serve", action="store_true",
+                        help="build the app if needed and run it with next start for the duration of the run")
+    parser.add_argument("--server-per-worker", action="store_true",
+                        help="like --serve, but every worker gets its own server on a free port")
+    parser.add_argument("--trace", action="store_true",
+                        help="record a Chrome trace per test and store a per-step summary with its result")
+    parser.add_argument("--keep-trace", action="store_true",
+                        help="like --trace, and also save the raw trace under tmp/traces")
+    parser.add_argument("--no-action-log", action="store_true",
+                        help="do not stream per-action timings to tmp/actions/<run>.jsonl")
+    parser.add_argument("--retry-budget", type=int, metavar="N",
+                        help="rerun at most N failed flaky tests in this run (default: 10%% of the tests, at least 2)")
+    parser.add_argument("--no-retry", action="store_true",
+                        help="never rerun failed tests, even ones the history shows to be flaky")
+    parser.add_argument("--resend-stub", metavar="PROFILE",
+                        help="with --serve, send mail to a local Resend stand-in with these faults, "
+                             "e.g. 'latency=100-900,errors=0.1' (see harness.resend_stub)")
+    args = parser.parse_args(argv)
+    started = timestamp()
+    if args.resend_stub is not None and not (args.serve or args.server_per_worker):
+        parser.error("--resend-stub needs --serve or --server-per-worker, so that the app starts pointed at it")
+    if args.serve and urlsplit(args.base_url).scheme != "http":
+        parser.error("--serve runs next start over plain http; give an http:// --base-url")
+
+    cases = discover_plan(args.ids) if args.plan else discover(args.ids)
+    if not cases:
+        parser.error("no matching test plan entries found" if args.plan else "no matching TC scripts found")
+
+    if args.since or args.changed:
+        paths = args.changed or changed_files(args.since)
+        cases, reasons = select(cases, paths)
+        print(f"{len(paths)} changed file(s) select {len(cases)} test(s):")
+        print(describe(reasons))
+        if not cases:
+            return 0
+
+    if args.browser_server:
+        wait_healthy(args.browser_server, timeout=10)
+        # Exported so that spawned workers and loaded scripts pick it up too
+        os.environ[BROWSER_SERVER_ENV] = args.browser_server
+
+    # Exported so that spawned workers see the same network setup
+    os.environ[NETWORK_ENV] = args.network
+    if args.network_latency is not None:
+        os.environ[LATENCY_ENV] = str(args.network_latency)
+
+    os.environ[BASE_URL_ENV] = args.base_url
+
+    tracing = args.trace or args.keep_trace
+    if tracing and args.browser_server:
+        parser.error("--trace needs a browser per worker; a shared --browser-server would mix other runs' events in")
+    if tracing:
+        os.environ[TRACE_ENV] = "keep" if args.keep_trace else "summary"
+
+    if not args.no_action_log:
+        # Workers append to the same file, one line per action
+        action_log = ACTIONS_DIR / (started.replace(":", "-") + ".jsonl")
+        os.environ[ACTION_LOG_ENV] = str(action_log)
+
+    if args.fresh_session:
+        for path in SESSION_DIR.glob("session-*.json"):
+            path.unlink(missing_ok=True)
+
+    cache = ResultCache(environment={"baseUrl": args.base_url, "resendStub": args.resend_stub})
+    keys = {case.name: cache.key(case) for case in cases}
+    cached, pending = [], []
+    for case in cases:
+        # A cached record has no trace to offer
+        hit = None if args.force or tracing else cache.get(keys[case.name])
+        if hit:
+            cached.append(hit)
+            print_result(hit)
+        else:
+            pending.append(case)
+
+    stub = None
+    if args.resend_stub is not None and pending:
+        stub = BackgroundStub(FaultProfile.parse(args.resend_stub)).start()
+        # Read by the app servers started below, here or in the workers
+        os.environ.update(stub.app_env())
+        print(f"resend stub on {stub.url}: {stub.profile}")
+    try:
+        policy = None if args.no_retry else RetryPolicy.from_history(
+            [case.name for case in pending], args.retry_budget)
+
+        def retry(results):
+            return retry_failures(results, pending, policy, lambda cases: run_cases(
+                cases, args.workers, args.serve, args.server_per_worker))
+
+        ran = run_scheduled(pending, args.workers, args.serve, args.server_per_worker,
+                            retry if policy else None)
+    finally:
+        if stub:
+            stub.stop()
+    for result in ran:
+        # A failure may be the environment's (server down, worker lost); run it again next time
+        if result["testStatus"] == "PASSED":
+            cache.put(keys[result["title"]], result)
+    cache.evict()
+
+    results = cached + ran
+    write_results(results, args.output)
+    record_run(results, started, {
+        "ids": args.ids, "plan": args.plan, "workers": args.workers, "network": args.network,
+        "baseUrl": args.base_url, "serve": args.serve or args.server_per_worker, "trace": tracing,
+        "resendStub": args.resend_stub, "retry": not args.no_retry, "retryBudget": args.retry_budget,
+    })
+
+    failed = sum(r["testStatus"] != "PASSED" for r in results)
+    saved = sum(r["waits"]["savedMs"] for r in ran) / 1000
+    if not args.no_action_log and ran:
+        print(f"action timings in {action_log}")
+    retried = sum(r.get("retries", 0) > 0 for r in ran)
+    print(f"{len(results) - failed} passed, {failed} failed, {len(cached)} from cache, {retried} retried; "
+          f"condition waits saved {saved:.1f}s of sleeps")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
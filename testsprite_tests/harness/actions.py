@@ -0,0 +1,244 @@
+"""Time every Playwright action a test takes, one JSONL line per action.
+
+When a test is slow, the total alone does not say whether the time went to
+navigation, to locators that took long to become actionable, to waits or to
+assertions. While a test has a log open, the runner hands its script the
+browser context through :func:`timed_context`. That stand-in gives out
+stand-ins for every ``Page``, ``Frame`` and ``Locator`` reached from it and
+times their navigation, interaction and wait methods. Assertions are timed
+when made through the harness's :func:`expect`, which scripts import
+instead of Playwright's. Playwright's own classes are left alone, so other
+code in the process is unaffected.
+
+:func:`timed` marks the harness's own :func:`~harness.waits.settle` and
+:func:`~harness.assertions.expect_all_visible`. An action taken while
+another is running (``settle`` calls ``Locator.wait_for``) is counted as
+part of the outer one.
+
+The runner opens a log per test, and its result gets an ``actions`` summary
+of time by kind and the slowest actions. If ``HARNESS_ACTION_LOG`` names a
+file, every action is also appended to it as a line::
+
+    {"test": "TC013_...", "kind": "interaction", "action": "Locator.click",
+     "target": "xpath=html/body/...", "startMs": 5312.4, "ms": 812.9, "error": null}
+
+``python -m harness`` writes ``tmp/actions/<run>.jsonl`` unless
+``--no-action-log`` is given. ``startMs`` counts from the start of the test.
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import os
+import re
+import time
+
+from playwright import async_api
+
+from .suite import TMP_DIR
+
+ACTION_LOG_ENV = "HARNESS_ACTION_LOG"
+
+ACTIONS_DIR = TMP_DIR / "actions"
+
+NAVIGATION = ("goto", "reload", "go_back", "go_forward", "wait_for_load_state", "wait_for_url")
+INTERACTION = ("click", "dblclick", "fill", "press", "type", "hover", "check", "uncheck",
+               "select_option", "set_input_files", "drag_to")
+WAIT = ("wait_for", "wait_for_timeout", "wait_for_function", "wait_for_selector")
+
+# Methods timed on each class, by kind
+TARGETS = {
+    async_api.BrowserContext: {},
+    async_api.Page: {"navigation": NAVIGATION, "interaction": INTERACTION, "wait": WAIT},
+    async_api.Frame: {"navigation": NAVIGATION, "interaction": INTERACTION, "wait": WAIT},
+    async_api.Locator: {"interaction": INTERACTION, "wait": WAIT},
+    async_api.FrameLocator: {},
+}
+KINDS = {cls: {name: kind for kind, names in kinds.items() for name in names} for cls, kinds in TARGETS.items()}
+
+SLOWEST = 5
+
+_current_log = contextvars.ContextVar("action_log", default=None)
+_in_action = contextvars.ContextVar("in_action", default=False)
+
+
+class ActionLog:
+    """Totals for one test, streaming each action to the run's JSONL file."""
+
+    def __init__(self, test, path=None):
+        self.test = test
+        self.sink = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            # Line-buffered appends, so parallel workers can share the file
+            self.sink = open(path, "a", buffering=1, encoding="utf-8")
+        self.origin = time.monotonic()
+        self.count = 0
+        self.by_kind = {}
+        self.slowest = []
+
+    def record(self, kind, action, target, started, ended, error):
+        ms = (ended - started) * 1000
+        self.count += 1
+        self.by_kind[kind] = self.by_kind.get(kind, 0.0) + ms
+        entry = {"test": self.test, "kind": kind, "action": action, "target": target,
+                 "startMs": round((started - self.origin) * 1000, 1), "ms": round(ms, 1), "error": error}
+        if len(self.slowest) < SLOWEST or ms > self.slowest[-1]["ms"]:
+            self.slowest = sorted([*self.slowest, entry], key=lambda e: -e["ms"])[:SLOWEST]
+        if self.sink is not None:
+            self.sink.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "byKindMs": {kind: round(ms, 1) for kind, ms in sorted(self.by_kind.items())},
+            "slowest": [{k: e[k] for k in ("action", "target", "startMs", "ms", "error")} for e in self.slowest],
+        }
+
+    def close(self):
+        """Stop recording and close the JSONL file."""
+        if _current_log.get() is self:
+            _current_log.set(None)
+        if self.sink is not None:
+            self.sink.close()
+            self.sink = None
+
+
+def start_action_log(test):
+    """Begin timing actions for ``test`` and return the log; the caller closes it."""
+    log = ActionLog(test, os.environ.get(ACTION_LOG_ENV))
+    _current_log.set(log)
+    return log
+
+
+async def _run(kind, action, describe, call):
+    log = _current_log.get()
+    if log is None or _in_action.get():
+        return await call()
+    token = _in_action.set(True)
+    started = time.monotonic()
+    error = None
+    try:
+        return await call()
+    except BaseException as exc:
+        error = type(exc).__name__
+        raise
+    finally:
+        _in_action.reset(token)
+        log.record(kind, action, describe(), started, time.monotonic(), error)
+
+
+def _selector(obj):
+    match = re.search(r"selector='(.*)'", repr(obj))
+    return match.group(1) if match else None
+
+
+def _describe_call(owner, name, args):
+    if isinstance(owner, async_api.Locator):
+        return _selector(owner)
+    if args and isinstance(args[0], str) and name not in ("wait_for_load_state", "wait_for_function"):
+        return args[0]
+    return getattr(owner, "url", None)
+
+
+class _Timed:
+    """Stands in for one Playwright object and times the methods ``kind_of`` names.
+
+    Anything else is passed through, with the Pages, Frames and Locators it
+    returns wrapped in turn. ``__class__`` reports the wrapped class, so
+    ``isinstance`` checks, including Playwright's when the stand-in is passed
+    back to it as an argument, see the real type.
+    """
+
+    __slots__ = ("_target", "_kind_of", "_describe")
+
+    def __init__(self, target, kind_of, describe):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_kind_of", kind_of)
+        object.__setattr__(self, "_describe", describe)
+
+    @property
+    def __class__(self):
+        return type(self._target)
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        if not callable(value):
+            return _wrap(value)
+        kind = self._kind_of(name)
+        if kind is not None:
+            action = f"{type(self._target).__name__}.{name}"
+
+            async def timed_call(*args, **kwargs):
+                return await _run(kind, action, lambda: self._describe(self._target, name, args),
+                                  lambda: value(*args, **kwargs))
+            return timed_call
+
+        def call(*args, **kwargs):
+            result = value(*args, **kwargs)
+            return _wrap_later(result) if inspect.isawaitable(result) else _wrap(result)
+        return call
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def __eq__(self, other):
+        return self._target == unwrap(other)
+
+    def __hash__(self):
+        return hash(self._target)
+
+    def __repr__(self):
+        return repr(self._target)
+
+
+def _wrap(value):
+    if isinstance(value, list):
+        return [_wrap(item) for item in value]
+    kinds = KINDS.get(type(value))
+    return value if kinds is None else _Timed(value, kinds.get, _describe_call)
+
+
+async def _wrap_later(awaitable):
+    return _wrap(await awaitable)
+
+
+def unwrap(value):
+    """The Playwright object behind a stand-in, or ``value`` itself."""
+    return object.__getattribute__(value, "_target") if type(value) is _Timed else value
+
+
+def is_timed(value):
+    """Whether ``value`` is a stand-in that times its actions."""
+    return type(value) is _Timed
+
+
+def stand_in(value):
+    """A timing stand-in for the Playwright ``value``."""
+    return _wrap(unwrap(value))
+
+
+def timed_context(context):
+    """``context`` as a stand-in whose pages, frames and locators time their actions."""
+    return _wrap(context)
+
+
+def expect(actual, message=None):
+    """Playwright's ``expect``, with every ``to_*`` / ``not_to_*`` assertion timed."""
+    subject = unwrap(actual)
+    assertions = async_api.expect(subject, message)
+    target = _selector(subject) or getattr(subject, "url", None)
+    return _Timed(assertions, lambda name: "assertion" if name.startswith(("to_", "not_to_")) else None,
+                  lambda owner, name, args: target)
+
+
+def timed(kind, describe=None):
+    """Record calls of an async helper as actions of ``kind``."""
+    def decorate(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await _run(kind, func.__name__, lambda: describe(*args, **kwargs) if describe else None,
+                              lambda: func(*args, **kwargs))
+        return wrapper
+    return decorate
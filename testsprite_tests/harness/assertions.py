@@ -0,0 +1,94 @@
+"""Bulk assertions that check many targets in one DOM round-trip.
+
+``await expect(page.locator('text=Foo').first).to_be_visible()`` once per
+desktop icon costs one protocol round-trip per label, and the first missing
+label stalls the whole test for its full timeout before the next one is even
+looked at. :func:`expect_all_visible` checks every target in a single
+``evaluate``, polls again only for the ones still missing, and reports all
+of them together when it gives up.
+"""
+
+import time
+
+from .actions import timed
+
+# Delay between polls for targets that are not visible yet
+POLL_INTERVAL_MS = 100
+
+FIND_VISIBLE_JS = """
+([labels, selectors]) => {
+  const normalize = s => s.replace(/\\s+/g, ' ').trim().toLowerCase();
+  const isVisible = el => {
+    if (!el || !el.isConnected) return false;
+    const rect = el.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0) return false;
+    return el.checkVisibility ? el.checkVisibility({ visibilityProperty: true }) :
+      getComputedStyle(el).visibility !== 'hidden';
+  };
+
+  // Labels follow Playwright's unquoted text= rules: case-insensitive,
+  // whitespace-normalized substring of an element's text
+  const pending = new Set(labels.map(normalize));
+  const found = new Set();
+  const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+  const seen = new Set();
+  while (pending.size && walker.nextNode()) {
+    const el = walker.currentNode.parentElement;
+    if (!el || seen.has(el)) continue;
+    seen.add(el);
+    const text = normalize(el.textContent || '');
+    for (const label of pending) {
+      if (text.includes(label) && isVisible(el)) {
+        pending.delete(label);
+        found.add(label);
+      }
+    }
+  }
+
+  const visibleSelectors = selectors.filter(selector => {
+    if (selector.startsWith('xpath=')) {
+      const result = document.evaluate(selector.slice(6), document, null,
+        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      for (let i = 0; i < result.snapshotLength; i++) {
+        if (isVisible(result.snapshotItem(i))) return true;
+      }
+      return false;
+    }
+    const css = selector.startsWith('css=') ? selector.slice(4) : selector;
+    return Array.from(document.querySelectorAll(css)).some(isVisible);
+  });
+
+  return { labels: labels.filter(l => found.has(normalize(l))), selectors: visibleSelectors };
+}
+"""
+
+
+async def visible_targets(page, labels=(), selectors=()):
+    """Return the subsets of ``labels`` and ``selectors`` that are visible now."""
+    found = await page.evaluate(FIND_VISIBLE_JS, [list(labels), list(selectors)])
+    return found["labels"], found["selectors"]
+
+
+@timed("assertion", lambda page, labels=(), selectors=(), *_, **__: ", ".join([*labels, *selectors]))
+async def expect_all_visible(page, labels=(), selectors=(), timeout=30000):
+    """Assert that every label and selector becomes visible within ``timeout`` ms.
+
+    ``labels`` are text snippets matched like ``text=...`` locators;
+    ``selectors`` are CSS (optionally ``css=``-prefixed) or ``xpath=``
+    selectors. Raises ``AssertionError`` naming every target still missing.
+    """
+    missing_labels = list(dict.fromkeys(labels))
+    missing_selectors = list(dict.fromkeys(selectors))
+    deadline = time.monotonic() + timeout / 1000
+    while True:
+        found_labels, found_selectors = await visible_targets(page, missing_labels, missing_selectors)
+        missing_labels = [label for label in missing_labels if label not in found_labels]
+        missing_selectors = [selector for selector in missing_selectors if selector not in found_selectors]
+        if not missing_labels and not missing_selectors:
+            return
+        if time.monotonic() >= deadline:
+            break
+        await page.wait_for_timeout(POLL_INTERVAL_MS)
+
+    missing = [f"text={label}" for label in missing_labels] + missing_selectors
+    raise AssertionError(f"{len(missing)} target(s) not visible after {timeout}ms: {', '.join(missing)}")
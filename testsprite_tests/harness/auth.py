@@ -0,0 +1,105 @@
+"""Log in once and reuse the resulting browser state in every test.
+
+The app remembers a finished boot in ``sessionStorage`` and keeps desktop
+state in ``localStorage``. Playwright's ``storage_state()`` only covers
+cookies and localStorage, so the snapshot also keeps the sessionStorage
+entries and replays them with an init script in each new context.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from .browser import new_context
+from .suite import TMP_DIR, app_url
+
+SESSION_DIR = TMP_DIR / "auth"
+
+# A snapshot older than this is recreated; the app has no real expiry, this
+# only bounds how stale the saved desktop layout can get
+SESSION_MAX_AGE_S = 3600
+
+# Boot animation plus the login form fading in
+BOOT_TIMEOUT_MS = 15000
+
+RESTORE_SESSION_JS = """
+([origin, entries]) => {
+  if (location.origin !== origin) return;
+  for (const [key, value] of Object.entries(entries)) {
+    if (sessionStorage.getItem(key) === null) sessionStorage.setItem(key, value);
+  }
+}
+"""
+
+
+def session_path(base_url=None):
+    """Snapshot file for ``base_url``; each app server gets its own."""
+    url = urlsplit(base_url or app_url())
+    return SESSION_DIR / f"session-{url.hostname}-{url.port or 80}.json"
+
+
+async def login_as_guest(context, base_url=None):
+    """Go through the boot screen and click Guest; return the desktop page."""
+    page = await context.new_page()
+    await page.goto(base_url or app_url(), timeout=10000)
+    await page.get_by_role("button", name="Guest").click(timeout=BOOT_TIMEOUT_MS)
+    await page.locator("html[data-window-state='loaded']").wait_for(state="attached", timeout=BOOT_TIMEOUT_MS)
+    return page
+
+
+async def save_session(browser, path=None, base_url=None):
+    """Log in as Guest in a throwaway context and write the snapshot to ``path``."""
+    base_url = base_url or app_url()
+    path = path or session_path(base_url)
+    context = await new_context(browser)
+    try:
+        page = await login_as_guest(context, base_url)
+        session = {
+            "baseUrl": base_url,
+            "createdAt": time.time(),
+            "storageState": await context.storage_state(),
+            "sessionStorage": await page.evaluate("() => ({ ...sessionStorage })"),
+        }
+    finally:
+        await context.close()
+
+    # Parallel workers may race to create the snapshot; never expose a partial file
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(session, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+    return session
+
+
+def load_session(path=None, base_url=None, max_age=SESSION_MAX_AGE_S):
+    """Return a saved snapshot for ``base_url`` if it is fresh enough, else None."""
+    base_url = base_url or app_url()
+    path = path or session_path(base_url)
+    try:
+        session = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if session.get("baseUrl") != base_url or time.time() - session.get("createdAt", 0) > max_age:
+        return None
+    return session
+
+
+async def ensure_session(browser, path=None, base_url=None):
+    """Load the saved snapshot, logging in again only when it is missing or stale."""
+    session = load_session(path, base_url)
+    if session is None:
+        session = await save_session(browser, path, base_url)
+    return session
+
+
+async def new_session_context(browser, session, **options):
+    """Create a test context that starts on the desktop, already logged in."""
+    context = await new_context(browser, storage_state=session["storageState"], **options)
+    url = urlsplit(session["baseUrl"])
+    origin = f"{url.scheme}://{url.netloc}"
+    entries = json.dumps([origin, session["sessionStorage"]])
+    await context.add_init_script(script=f"({RESTORE_SESSION_JS})({entries});")
+    return context
@@ -0,0 +1,250 @@
+"""Frame rate while a window is dragged by its title bar.
+
+TC003 only clicks the title bar, so dragging is never exercised. This
+benchmark holds the mouse button down on the focused window's title bar and
+sends a dense stream of mouse moves, one per display frame, along a
+configurable path. ``window.tsx`` sets its position state on every move and
+hands the final position to ``updateWindowPosition`` on release, so the cost
+of a move grows with what re-renders alongside it; each run is repeated with
+1, 5 and 15 windows open::
+
+    python -m harness.bench_drag --label before
+    # change window.tsx / window-context.tsx
+    python -m harness.bench_drag --label after --compare before
+
+For every window count it reports
+
+* frames and dropped frames from :class:`harness.perf.PerfProbe`,
+* script, layout and style time per frame from the CDP ``Performance``
+  domain,
+* input-to-paint latency: from a ``pointermove`` event's timestamp to the
+  task right after the next animation frame, p50, p95 and max.
+
+Results are written to ``tmp/bench/drag-<label>.json``.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import time
+
+from playwright import async_api
+
+from .auth import ensure_session, new_session_context
+from .browser import browser_source
+from .pages import APPS, Desktop
+from .perf import PerfProbe, percentile
+from .suite import TMP_DIR, app_url
+from .waits import settle
+
+BENCH_DIR = TMP_DIR / "bench"
+
+WINDOW_COUNTS = (1, 5, 15)
+PATHS = ("line", "circle", "zigzag")
+DEFAULT_RATE = 60
+DEFAULT_DURATION_S = 3.0
+
+# How far the path strays from where the title bar was grabbed
+AMPLITUDE_PX = 200
+
+# Time from a move to the task after the next frame, which runs once that
+# frame has been handed to the compositor
+LATENCY_INIT_JS = """
+(() => {
+  const samples = window.__harnessDragLatency = [];
+  addEventListener('pointermove', e => {
+    if (!e.buttons) return;
+    const sent = e.timeStamp;
+    requestAnimationFrame(() => setTimeout(() => samples.push(performance.now() - sent)));
+  }, { capture: true, passive: true });
+})();
+"""
+
+
+def path_points(shape, start, count, viewport, amplitude=AMPLITUDE_PX):
+    """``count`` mouse positions along ``shape``, beginning and ending at ``start``."""
+    x0, y0 = start
+    points = []
+    for i in range(1, count + 1):
+        t = i / count
+        if shape == "line":
+            # Out and back along the x axis
+            dx, dy = amplitude * (1 - abs(1 - 2 * t)), 0.0
+        elif shape == "circle":
+            angle = 2 * math.pi * t
+            dx, dy = amplitude * (1 - math.cos(angle)), amplitude * math.sin(angle)
+        elif shape == "zigzag":
+            # Four teeth out and back, each tooth half the amplitude high
+            dx = amplitude * (1 - abs(1 - 2 * t))
+            dy = amplitude / 2 * (1 - abs(1 - 2 * ((t * 4) % 1)))
+        else:
+            raise ValueError(f"unknown drag path {shape!r}; expected one of {', '.join(PATHS)}")
+        x = min(max(x0 + dx, 0), viewport["width"] - 1)
+        y = min(max(y0 + dy, 0), viewport["height"] - 1)
+        points.append((x, y))
+    return points
+
+
+async def open_windows(page, count):
+    """Open the first ``count`` apps and return the last window, which has focus."""
+    if count > len(APPS):
+        raise ValueError(f"only {len(APPS)} apps to open, asked for {count}")
+    desktop = Desktop(page)
+    window = None
+    for key in list(APPS)[:count]:
+        window = await desktop.open(key)
+        await settle(page, window.root)
+    return window
+
+
+async def drag(page, window, shape, rate, duration):
+    """Drag ``window`` along ``shape``.
+
+    Returns the moves sent, the rate actually achieved and the window's box
+    halfway along the path (the line and circle paths end where they began).
+    """
+    box = await window.title_bar.bounding_box()
+    # Grab the title bar left of centre, clear of the window buttons on the right
+    start = (box["x"] + box["width"] / 3, box["y"] + box["height"] / 2)
+    points = path_points(shape, start, max(1, round(rate * duration)), page.viewport_size)
+
+    await page.mouse.move(*start)
+    await page.mouse.down()
+    interval = 1 / rate
+    halfway = None
+    began = time.perf_counter()
+    try:
+        for i, point in enumerate(points):
+            await page.mouse.move(*point)
+            if i == len(points) // 2:
+                halfway = await window.root.bounding_box()
+            delay = began + (i + 1) * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+    finally:
+        await page.mouse.up()
+    elapsed = time.perf_counter() - began
+    return len(points), round(len(points) / elapsed, 1), halfway
+
+
+async def run_one(browser, session, count, shape, rate, duration):
+    context = await new_session_context(browser, session)
+    try:
+        page = await context.new_page()
+        await page.add_init_script(script=LATENCY_INIT_JS)
+        probe = await PerfProbe.attach(page)
+        await page.goto(app_url(), timeout=10000)
+        window = await open_windows(page, count)
+        before = await window.root.bounding_box()
+
+        await page.evaluate("() => { window.__harnessDragLatency.length = 0; }")
+        await probe.start()
+        moves, achieved, halfway = await drag(page, window, shape, rate, duration)
+        metrics = await probe.stop(f"drag with {count} windows")
+        latency = await page.evaluate("() => window.__harnessDragLatency")
+    finally:
+        await context.close()
+
+    frames = max(metrics["frames"], 1)
+    return {
+        "windows": count,
+        "path": shape,
+        "moves": moves,
+        "moveRate": achieved,
+        "moved": before != halfway,
+        "frames": metrics["frames"],
+        "droppedFrames": metrics["droppedFrames"],
+        "droppedFrameRatio": metrics["droppedFrameRatio"],
+        "p95FrameMs": metrics["p95FrameMs"],
+        "maxFrameMs": metrics["maxFrameMs"],
+        "longTasks": metrics["longTasks"],
+        "scriptMsPerFrame": round(metrics["scriptMs"] / frames, 2),
+        "layoutMsPerFrame": round(metrics["layoutMs"] / frames, 2),
+        "styleMsPerFrame": round(metrics["styleMs"] / frames, 2),
+        "latencyP50Ms": round(percentile(latency, 50), 1),
+        "latencyP95Ms": round(percentile(latency, 95), 1),
+        "latencyMaxMs": round(max(latency, default=0.0), 1),
+    }
+
+
+async def run_bench(counts=WINDOW_COUNTS, shape="line", rate=DEFAULT_RATE, duration=DEFAULT_DURATION_S):
+    pw = await async_api.async_playwright().start()
+    source = browser_source(pw)
+    try:
+        browser = await source.get()
+        try:
+            session = await ensure_session(browser)
+            return [await run_one(browser, session, count, shape, rate, duration) for count in counts]
+        finally:
+            await source.release(browser)
+    finally:
+        await source.close()
+        await pw.stop()
+
+
+def result_path(label):
+    return BENCH_DIR / f"drag-{label}.json"
+
+
+def load_results(label):
+    return json.loads(result_path(label).read_text(encoding="utf-8"))["runs"]
+
+
+COLUMNS = [
+    ("windows", "windows"),
+    ("moveRate", "moves/s"),
+    ("droppedFrames", "dropped"),
+    ("p95FrameMs", "p95 frame"),
+    ("scriptMsPerFrame", "script/frame"),
+    ("latencyP50Ms", "lat p50"),
+    ("latencyP95Ms", "lat p95"),
+    ("latencyMaxMs", "lat max"),
+]
+
+
+def format_table(runs, baseline=None):
+    """Plain-text table of ``runs``, with the change from ``baseline`` where it has the same count."""
+    previous = {run["windows"]: run for run in baseline or []}
+    lines = ["  ".join(f"{title:>12}" for _, title in COLUMNS)]
+    for run in runs:
+        cells = []
+        for key, _ in COLUMNS:
+            value = run[key]
+            old = previous.get(run["windows"], {}).get(key)
+            if key != "windows" and old is not None:
+                cells.append(f"{value:>7g} {value - old:>+4.3g}")
+            else:
+                cells.append(f"{value:>12g}")
+        lines.append("  ".join(f"{cell:>12}" for cell in cells))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="harness.bench_drag", description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--windows", type=int, nargs="+", default=list(WINDOW_COUNTS),
+                        help="window counts to benchmark (default: 1 5 15)")
+    parser.add_argument("--path", choices=PATHS, default="line", help="shape of the drag")
+    parser.add_argument("--rate", type=int, default=DEFAULT_RATE, help="mouse moves per second")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION_S, help="seconds per drag")
+    parser.add_argument("--label", default="current", help="name the results are saved under")
+    parser.add_argument("--compare", metavar="LABEL", help="show the change from an earlier run")
+    args = parser.parse_args(argv)
+
+    baseline = load_results(args.compare) if args.compare else None
+    runs = asyncio.run(run_bench(args.windows, args.path, args.rate, args.duration))
+
+    path = result_path(args.label)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report = {"label": args.label, "path": args.path, "rate": args.rate, "durationS": args.duration, "runs": runs}
+    path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    print(format_table(runs, baseline))
+    for run in runs:
+        if not run["moved"]:
+            print(f"warning: the window did not move with {run['windows']} windows open; check the drag handle")
+    print(f"results in {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Browser launch settings shared by every TC script and the suite runner."""
+
+import os
+
+from playwright import async_api
+
+from .network import install_network_stub, stub_enabled
+
+# Same flags the generated scripts used to pass to chromium.launch()
+LAUNCH_ARGS = [
+    "--window-size=1280,720",         # Set the browser window size
+    "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+    "--ipc=host",                     # Use host-level IPC for better stability
+    "--single-process",               # Run the browser in a single process mode
+]
+
+# Default timeout applied to every action in a test context
+DEFAULT_TIMEOUT_MS = 5000
+
+# Control URL of a running ``harness.browser_server``; when set, tests lease
+# that warm browser instead of launching their own
+BROWSER_SERVER_ENV = "HARNESS_BROWSER_SERVER"
+
+
+async def launch_browser(pw):
+    """Launch a headless Chromium with the suite's standard flags."""
+    return await pw.chromium.launch(headless=True, args=LAUNCH_ARGS)
+
+
+class LocalBrowser:
+    """Browser source that launches Chromium once and relaunches it if it dies."""
+
+    def __init__(self, pw):
+        self.pw = pw
+        self.browser = None
+
+    async def get(self):
+        if self.browser is None or not self.browser.is_connected():
+            self.browser = await launch_browser(self.pw)
+        return self.browser
+
+    async def release(self, browser):
+        pass
+
+    async def close(self):
+        if self.browser is not None and self.browser.is_connected():
+            await self.browser.close()
+
+
+def browser_source(pw):
+    """Pick the warm browser server if one is configured, else a local launch."""
+    url = os.environ.get(BROWSER_SERVER_ENV)
+    if url:
+        from .browser_server import RemoteBrowser
+        return RemoteBrowser(pw, url)
+    return LocalBrowser(pw)
+
+
+async def new_context(browser, **options):
+    """Create an isolated context (like an incognito window) for one test.
+
+    Off-host requests are served from fixtures unless ``HARNESS_NETWORK=live``.
+    """
+    context = await browser.new_context(**options)
+    context.set_default_timeout(DEFAULT_TIMEOUT_MS)
+    if stub_enabled():
+        await install_network_stub(context)
+    return context
+
+
+async def run_standalone(steps, authenticated=False, lean=False):
+    """Run a single script's steps with its own driver, browser and context.
+
+    This is what ``python TCxxx.py`` does; the suite runner reuses one browser
+    instead and only calls ``steps(context)``. With ``authenticated`` the
+    context starts from the saved Guest session (see :mod:`harness.auth`),
+    and ``lean`` applies :mod:`harness.lean`.
+    """
+    from .auth import ensure_session, new_session_context
+    from .lean import LEAN_CONTEXT_OPTIONS, install_lean_mode
+
+    pw = None
+    source = None
+    browser = None
+    context = None
+
+    try:
+        pw = await async_api.async_playwright().start()
+        source = browser_source(pw)
+        browser = await source.get()
+        options = LEAN_CONTEXT_OPTIONS if lean else {}
+        if authenticated:
+            context = await new_session_context(browser, await ensure_session(browser), **options)
+        else:
+            context = await new_context(browser, **options)
+        if lean:
+            await install_lean_mode(context)
+        await steps(context)
+    finally:
+        if context:
+            await context.close()
+        if browser:
+            await source.release(browser)
+        if source:
+            await source.close()
+        if pw:
+            await pw.stop()
@@ -0,0 +1,315 @@
+"""Long-lived local Chromium that test processes lease instead of launching.
+
+Start it once::
+
+    cd testsprite_tests
+    python -m harness.browser_server --port 9400
+
+and point the harness at it with ``--browser-server http://127.0.0.1:9400``
+(or ``HARNESS_BROWSER_SERVER`` for standalone scripts). Each test leases the
+browser, connects over CDP in milliseconds, works in its own context and
+releases it afterwards.
+
+The control endpoint speaks a tiny JSON-over-HTTP protocol:
+
+* ``GET /health`` - 200 with browser details when the browser is up, else 503
+* ``POST /lease`` - returns the CDP endpoint to connect to and a lease id
+* ``POST /release`` - marks the lease ``{"lease": id}`` as finished; a
+  missing or unknown id is logged and ignored
+
+The server relaunches Chromium when it crashes, and recycles it once
+``--max-contexts`` leases have been served and every lease has been
+released, so a long session does not keep accumulating memory. A lease
+whose client left before receiving it is released at once. One that is
+never released, because its client crashed, expires after ``LEASE_MAX_S``
+so it cannot block recycling forever.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+from playwright import async_api
+
+from .browser import LAUNCH_ARGS
+
+log = logging.getLogger("harness.browser_server")
+
+DEFAULT_PORT = 9400
+DEFAULT_MAX_CONTEXTS = 200
+
+# A lease not released after this long belongs to a client that died
+LEASE_MAX_S = 600
+
+# How long a client may take to send its request line and headers
+REQUEST_TIMEOUT_S = 10
+
+# The server runs Chromium multi-process so that a renderer crash only takes
+# down the page it happened in, not every test sharing the browser
+SERVER_ARGS = [arg for arg in LAUNCH_ARGS if arg != "--single-process"]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class BrowserServer:
+    """Owns one Chromium process and hands out leases on it."""
+
+    def __init__(self, max_contexts=DEFAULT_MAX_CONTEXTS):
+        self.max_contexts = max_contexts
+        self.browser = None
+        self.cdp_port = None
+        self.generation = 0
+        self.served = 0
+        self.leases = {}
+        self.restarts = 0
+        self._pw = None
+        self._changed = asyncio.Condition()
+        self._restarting = False
+        self._stopping = False
+
+    async def start(self):
+        self._pw = await async_api.async_playwright().start()
+        await self._launch()
+
+    async def stop(self):
+        # Closing fires "disconnected", which must not relaunch the browser
+        self._stopping = True
+        if self.browser and self.browser.is_connected():
+            await self.browser.close()
+        if self._pw:
+            await self._pw.stop()
+
+    async def _launch(self):
+        self.cdp_port = free_port()
+        self.browser = await self._pw.chromium.launch(
+            headless=True,
+            args=SERVER_ARGS + [f"--remote-debugging-port={self.cdp_port}"],
+        )
+        self.browser.on("disconnected", lambda _: asyncio.ensure_future(self._on_disconnected()))
+        self.generation += 1
+        self.served = 0
+        log.info("browser generation %d listening on CDP port %d", self.generation, self.cdp_port)
+
+    async def _on_disconnected(self):
+        if self._restarting or self._stopping:
+            return
+        log.warning("browser generation %d exited unexpectedly, relaunching", self.generation)
+        await self._restart()
+
+    async def _restart(self):
+        async with self._changed:
+            self._restarting = True
+            try:
+                if self.browser.is_connected():
+                    await self.browser.close()
+                await self._launch()
+                self.leases.clear()
+                self.restarts += 1
+            finally:
+                self._restarting = False
+            self._changed.notify_all()
+
+    @property
+    def healthy(self):
+        return self.browser is not None and self.browser.is_connected() and not self._restarting
+
+    @property
+    def active(self):
+        return len(self.leases)
+
+    @property
+    def endpoint(self):
+        return f"http://127.0.0.1:{self.cdp_port}"
+
+    def status(self):
+        return {
+            "status": "ok" if self.healthy else "unavailable",
+            "pid": os.getpid(),
+            "endpoint": self.endpoint,
+            "version": self.browser.version if self.browser else None,
+            "generation": self.generation,
+            "served": self.served,
+            "active": self.active,
+            "restarts": self.restarts,
+            "maxContexts": self.max_contexts,
+        }
+
+    async def lease(self):
+        """Reserve the browser for one test; waits while it is being recycled."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.healthy and self.served < self.max_contexts)
+            self.served += 1
+            lease_id = uuid.uuid4().hex
+            self.leases[lease_id] = time.monotonic()
+            return {"endpoint": self.endpoint, "generation": self.generation, "lease": lease_id}
+
+    async def release(self, lease_id):
+        """End ``lease_id``.
+
+        A missing or unknown id is only logged: guessing which lease it meant
+        could end one still in use, and a lease that is really left over
+        expires after ``LEASE_MAX_S`` anyway.
+        """
+        async with self._changed:
+            if self.leases.pop(lease_id, None) is None:
+                log.warning("release of unknown lease %r ignored", lease_id)
+            now = time.monotonic()
+            for stale in [key for key, granted in self.leases.items() if now - granted > LEASE_MAX_S]:
+                log.warning("lease %s was never released, expiring it", stale)
+                del self.leases[stale]
+            recycle = self.served >= self.max_contexts and not self.leases
+        if recycle:
+            log.info("recycling browser after %d contexts", self.served)
+            await self._restart()
+
+    async def _lease_for(self, reader):
+        """A lease for a client that is still connected to receive it."""
+        lease = asyncio.ensure_future(self.lease())
+        gone = asyncio.ensure_future(reader.read(1))
+        await asyncio.wait({lease, gone}, return_when=asyncio.FIRST_COMPLETED)
+        gone.cancel()
+        if not lease.done():
+            lease.cancel()
+            raise ConnectionError("client left while waiting for a lease")
+        if gone.done() and not gone.cancelled() and gone.result() == b"":
+            await self.release(lease.result()["lease"])
+            raise ConnectionError("client left while waiting for a lease")
+        return lease.result()
+
+    async def handle(self, reader, writer):
+        granted = None
+        try:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), REQUEST_TIMEOUT_S)
+                lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = lines[0].split(" ", 2)
+                length = next((int(line.split(":", 1)[1]) for line in lines[1:]
+                               if line.lower().startswith("content-length:")), 0)
+                body = json.loads(await reader.readexactly(length) or b"{}") if length else {}
+                if (method, path) == ("GET", "/health"):
+                    code, reply = (200 if self.healthy else 503), self.status()
+                elif (method, path) == ("POST", "/lease"):
+                    granted = await self._lease_for(reader)
+                    code, reply = 200, granted
+                elif (method, path) == ("POST", "/release"):
+                    await self.release(body.get("lease"))
+                    code, reply = 200, {"status": "ok"}
+                else:
+                    code, reply = 404, {"error": f"no route for {method} {path}"}
+            except (asyncio.IncompleteReadError, ValueError, AttributeError) as exc:
+                code, reply = 400, {"error": str(exc)}
+
+            payload = json.dumps(reply).encode()
+            reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}[code]
+            writer.write(
+                f"HTTP/1.1 {code} {reason}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload
+            )
+            await writer.drain()
+            granted = None  # delivered; the client releases it
+        except (ConnectionError, asyncio.TimeoutError) as exc:
+            log.info("control client went away: %s", exc)
+        finally:
+            if granted is not None:
+                await self.release(granted["lease"])
+            writer.close()
+
+
+async def serve(port=DEFAULT_PORT, max_contexts=DEFAULT_MAX_CONTEXTS):
+    server = BrowserServer(max_contexts)
+    await server.start()
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", port)
+    log.info("control endpoint on http://127.0.0.1:%d", port)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.stop()
+
+
+def _call(url, method, path, timeout=5, body=None):
+    data = json.dumps(body).encode() if body is not None else (b"" if method == "POST" else None)
+    request = urllib.request.Request(url.rstrip("/") + path, method=method, data=data)
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.load(response)
+
+
+def health(url):
+    """Return the server status, or None if it is not reachable or not healthy."""
+    try:
+        return _call(url, "GET", "/health")
+    except (OSError, urllib.error.URLError, ValueError):
+        return None
+
+
+def wait_healthy(url, timeout=30):
+    """Block until the server at ``url`` reports healthy; raise if it never does."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = health(url)
+        if status is not None:
+            return status
+        time.sleep(0.2)
+    raise RuntimeError(f"browser server at {url} is not healthy")
+
+
+class RemoteBrowser:
+    """Browser source that leases from a running :class:`BrowserServer`."""
+
+    def __init__(self, pw, url):
+        self.pw = pw
+        self.url = url
+        self._leases = {}
+
+    async def get(self):
+        lease = await asyncio.to_thread(_call, self.url, "POST", "/lease", 60)
+        try:
+            browser = await self.pw.chromium.connect_over_cdp(lease["endpoint"])
+        except Exception:
+            await asyncio.to_thread(_call, self.url, "POST", "/release", body={"lease": lease["lease"]})
+            raise
+        self._leases[browser] = lease["lease"]
+        return browser
+
+    async def release(self, browser):
+        lease_id = self._leases.pop(browser, None)
+        try:
+            # Closes the contexts this connection created and disconnects; the
+            # server's browser keeps running
+            await browser.close()
+        finally:
+            if lease_id is None:
+                log.warning("no lease recorded for %r; leaving it to expire on the server", browser)
+            else:
+                await asyncio.to_thread(_call, self.url, "POST", "/release", body={"lease": lease_id})
+
+    async def close(self):
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="harness.browser_server", description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="control port")
+    parser.add_argument("--max-contexts", type=int, default=DEFAULT_MAX_CONTEXTS,
+                        help="leases served before the browser is recycled")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(serve(args.port, args.max_contexts))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
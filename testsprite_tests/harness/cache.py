@@ -0,0 +1,154 @@
+"""Content-addressed cache of TC outcomes.
+
+A result is keyed by three hashes: the test script (or plan entry), the app
+files it depends on and the environment it ran in. The app files are its
+features' files from ``code_summary.json``, every app file no tested feature
+claims (layouts, global styles, shared libraries), the build config and the
+harness itself. The environment is the Playwright/browser version, the
+network mode, the base URL and the Resend stub profile. A rerun with the
+same key reuses the stored record instead of opening a browser. Only the
+record is stored; raw traces are not, since ``--trace`` bypasses the cache. Only passes are stored: a failure can come from the environment
+(the server was down, a worker died) and must run again.
+"""
+
+import hashlib
+import importlib.metadata
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import playwright
+
+from .impact import GLOBAL_PATTERNS, load_feature_files, shared_files
+from .network import network_mode
+from .suite import REPO_ROOT, TMP_DIR, load_plan
+
+CACHE_DIR = TMP_DIR / "cache"
+
+# Eviction policy: entries unused for longer than this go first...
+CACHE_MAX_AGE_S = 7 * 24 * 3600
+# ...then the least recently used until the cache fits in this many bytes
+CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_files(paths):
+    """Hash file names and contents; missing files hash as absent."""
+    digest = hashlib.sha256()
+    for path in sorted(set(paths)):
+        digest.update(path.encode())
+        full = REPO_ROOT / path
+        digest.update(_sha256(full.read_bytes()).encode() if full.is_file() else b"<missing>")
+    return digest.hexdigest()
+
+
+def browser_version():
+    """Playwright version plus the Chromium build it drives, without launching it."""
+    version = importlib.metadata.version("playwright")
+    browsers = Path(playwright.__file__).parent / "driver" / "package" / "browsers.json"
+    try:
+        builds = {b["name"]: b for b in json.loads(browsers.read_text(encoding="utf-8"))["browsers"]}
+        chromium = builds["chromium"]
+        return f"playwright-{version}/chromium-{chromium['browserVersion']}-r{chromium['revision']}"
+    except (OSError, ValueError, KeyError):
+        return f"playwright-{version}"
+
+
+def _repo_files(patterns):
+    files = []
+    for pattern in patterns:
+        files += [p.relative_to(REPO_ROOT).as_posix() for p in REPO_ROOT.glob(pattern) if p.is_file()]
+    return files
+
+
+def dependency_files(case, feature_files, shared=()):
+    """App and harness files whose change can alter ``case``'s outcome.
+
+    ``shared`` are the app files no tested feature claims, see
+    :func:`~harness.impact.shared_files`.
+    """
+    files = _repo_files(GLOBAL_PATTERNS) + list(shared)
+    if case.features:
+        for feature in case.features:
+            files += feature_files.get(feature, [])
+    else:
+        # Without a feature mapping every app source counts
+        files += _repo_files(["src/**/*", "public/**/*"])
+    return files
+
+
+class ResultCache:
+    """Stores one directory per key holding its ``result.json``."""
+
+    def __init__(self, root=CACHE_DIR, max_age=CACHE_MAX_AGE_S, max_bytes=CACHE_MAX_BYTES, environment=None):
+        """``environment`` holds run options that change outcomes, e.g. the base URL."""
+        self.root = Path(root)
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.environment = environment or {}
+        self._features = None
+        self._shared = None
+        self._browser = None
+
+    def key(self, case):
+        if self._features is None:
+            self._features = load_feature_files()
+            tested = {feature for entry in load_plan().values() for feature in entry.get("features", [])}
+            self._shared = shared_files(self._features, tested)
+            self._browser = browser_version()
+        environment = json.dumps({**self.environment, "network": network_mode()}, sort_keys=True)
+        parts = [
+            _sha256(case.source().encode()),
+            hash_files(dependency_files(case, self._features, self._shared)),
+            _sha256(f"{self._browser}/{environment}".encode()),
+        ]
+        return _sha256("/".join(parts).encode())
+
+    def get(self, key):
+        """Return the cached record for ``key`` (marked ``cached``), or None."""
+        entry = self.root / key / "result.json"
+        try:
+            result = json.loads(entry.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if result.get("testStatus") != "PASSED":
+            return None  # stored before only passes were cached
+        os.utime(entry)  # recency for eviction
+        result["cached"] = True
+        return result
+
+    def put(self, key, result):
+        """Store ``result`` under ``key``."""
+        entry = self.root / key
+        entry.mkdir(parents=True, exist_ok=True)
+        record = {k: v for k, v in result.items() if k != "cached"}
+        (entry / "result.json").write_text(json.dumps(record, indent=2), encoding="utf-8")
+
+    def evict(self):
+        """Apply the age and size limits; return the number of entries removed."""
+        if not self.root.is_dir():
+            return 0
+        entries = []
+        for entry in self.root.iterdir():
+            marker = entry / "result.json"
+            if not marker.is_file():
+                shutil.rmtree(entry, ignore_errors=True)
+                continue
+            size = sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+            entries.append((marker.stat().st_mtime, size, entry))
+
+        removed = 0
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        for used, size, entry in sorted(entries):
+            if now - used <= self.max_age and total <= self.max_bytes:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
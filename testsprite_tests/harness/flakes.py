@@ -0,0 +1,262 @@
+"""Tell intermittent failures from deterministic ones, and retry only the former.
+
+For each test, :func:`analyze` reads the recent runs in ``tmp/history.sqlite``
+for its current script, skipping cached results, and estimates the chance
+that a run fails. Then it classifies the test by how the failures are spread
+over those runs:
+
+* ``stable``: no failures,
+* ``broken``: no passes at all, or every failure comes after the last pass
+  (one switch from green to red, which is how a regression looks),
+* ``flaky``: it went back to green after failing, or it passed on a retry,
+* ``unknown``: fewer than ``MIN_RUNS`` runs so far.
+
+A failure rate alone cannot separate the two: a test that broke yesterday
+and a test that fails every other run can both fail half their runs. The
+order of the passes and failures can.
+
+Failures of the environment say nothing about the test, and would make
+every test look flaky once the environment recovered. Before counting, the
+profile drops runs in which at least ``ENVIRONMENT_SHARE`` of the tests
+failed (the app server was down, say), and results whose worker was lost or
+that could not connect to the app.
+
+:class:`RetryPolicy` uses the profiles during a run. A failed test is run
+again only if it is flaky, its error class is one it has failed with before,
+and the run's retry budget is not used up. It is retried until the chance of
+every attempt failing drops below ``TARGET_FAILURE``, up to ``MAX_RETRIES``
+times. The final record keeps ``retries`` and the earlier ``retryErrors``::
+
+    python -m harness --retry-budget 4    # at most 4 reruns in this run
+    python -m harness --no-retry
+    python -m harness.flakes              # the profiles
+"""
+
+import argparse
+import contextlib
+import math
+import re
+import sys
+from dataclasses import dataclass, field
+
+from .history import HISTORY_PATH, connect
+
+# Runs of the current script looked at per test
+WINDOW = 30
+
+# Fewer runs than this and a test is not classified
+MIN_RUNS = 3
+
+# Retry until the chance that every attempt fails is below this
+TARGET_FAILURE = 0.05
+
+MAX_RETRIES = 3
+
+# A run in which at least this share of its tests failed (and at least
+# ENVIRONMENT_MIN_TESTS did) failed because of the environment
+ENVIRONMENT_SHARE = 0.8
+ENVIRONMENT_MIN_TESTS = 3
+
+# Error classes and messages of failures that are the environment's
+ENVIRONMENT_ERRORS = {"WorkerLost", "ConnectionError", "ConnectionRefusedError", "ConnectionResetError"}
+ENVIRONMENT_MESSAGE = re.compile(r"worker exited before reporting|net::ERR_CONNECTION_(?:REFUSED|RESET|CLOSED)|ECONNREFUSED")
+
+# Default retry budget: this share of the tests run, but at least MIN_BUDGET
+BUDGET_SHARE = 0.1
+MIN_BUDGET = 2
+
+
+def wilson_interval(failures, runs, z=1.96):
+    """95% confidence interval of a failure rate seen in ``runs`` runs."""
+    if not runs:
+        return 0.0, 1.0
+    rate = failures / runs
+    centre = (rate + z * z / (2 * runs)) / (1 + z * z / runs)
+    spread = z * math.sqrt(rate * (1 - rate) / runs + z * z / (4 * runs * runs)) / (1 + z * z / runs)
+    return max(0.0, centre - spread), min(1.0, centre + spread)
+
+
+@dataclass
+class FlakeProfile:
+    test: str
+    runs: int = 0
+    failures: int = 0
+    retried_passes: int = 0
+    recoveries: int = 0
+    error_classes: dict = field(default_factory=dict)
+    skipped: int = 0
+    verdict: str = "unknown"
+
+    @property
+    def failure_rate(self):
+        """Chance that a run fails, with add-one smoothing so it is never 0 or 1."""
+        return (self.failures + 1) / (self.runs + 2)
+
+    def retries_needed(self):
+        """Reruns after a failure that bring the chance of all failing under ``TARGET_FAILURE``."""
+        rate = self.failure_rate
+        return max(1, min(MAX_RETRIES, math.ceil(math.log(TARGET_FAILURE) / math.log(rate))))
+
+    def as_dict(self):
+        low, high = wilson_interval(self.failures, self.runs)
+        return {"test": self.test, "verdict": self.verdict, "runs": self.runs, "failures": self.failures,
+                "failureRate": round(self.failure_rate, 3), "interval": [round(low, 3), round(high, 3)],
+                "recoveries": self.recoveries, "retriedPasses": self.retried_passes,
+                "errorClasses": self.error_classes, "skipped": self.skipped}
+
+
+def is_environment_failure(row):
+    """Whether the result ``row`` failed because of the environment rather than the test."""
+    if row["status"] == "PASSED":
+        return False
+    return row["error_class"] in ENVIRONMENT_ERRORS or bool(ENVIRONMENT_MESSAGE.search(row["error"] or ""))
+
+
+def environment_runs(conn, run_ids):
+    """The runs among ``run_ids`` in which most tests failed."""
+    if not run_ids:
+        return set()
+    rows = conn.execute(
+        "SELECT run_id, COUNT(*) AS n, SUM(status != 'PASSED') AS failed FROM results"
+        f" WHERE run_id IN ({','.join('?' * len(run_ids))}) GROUP BY run_id", list(run_ids),
+    ).fetchall()
+    return {row["run_id"] for row in rows
+            if row["failed"] >= ENVIRONMENT_MIN_TESTS and row["failed"] >= ENVIRONMENT_SHARE * row["n"]}
+
+
+def profile(test, rows, skip_runs=()):
+    """Classify ``test`` from its history ``rows``, oldest first.
+
+    Rows of ``skip_runs`` and environment failures are not counted.
+    """
+    kept = [row for row in rows if row["run_id"] not in skip_runs and not is_environment_failure(row)]
+    current = kept[-1]["script_hash"] if kept else None
+    skipped = sum(row["script_hash"] == current for row in rows) - sum(row["script_hash"] == current for row in kept)
+    rows = [row for row in kept if row["script_hash"] == current][-WINDOW:]
+    result = FlakeProfile(test, runs=len(rows), skipped=skipped)
+    failed_before = False
+    for row in rows:
+        passed = row["status"] == "PASSED"
+        if row["retries"] and passed:
+            # Failed at least once in this run, then passed: flaky by definition
+            result.retried_passes += 1
+        if passed and failed_before:
+            result.recoveries += 1
+        if not passed:
+            result.failures += 1
+            name = row["error_class"] or "?"
+            result.error_classes[name] = result.error_classes.get(name, 0) + 1
+        failed_before = failed_before or not passed or bool(row["retries"])
+
+    if result.retried_passes or result.recoveries:
+        result.verdict = "flaky"
+    elif result.runs < MIN_RUNS:
+        result.verdict = "unknown"
+    elif not result.failures:
+        result.verdict = "stable"
+    else:
+        result.verdict = "broken"
+    return result
+
+
+def analyze(tests=None, path=HISTORY_PATH):
+    """``{test: FlakeProfile}`` for ``tests``, or for every test in the history."""
+    if not path.exists():
+        return {}
+    with contextlib.closing(connect(path)) as conn:
+        if tests is None:
+            tests = [row["test"] for row in conn.execute("SELECT DISTINCT test FROM results ORDER BY test")]
+        profiles = {}
+        for test in tests:
+            rows = conn.execute(
+                "SELECT run_id, status, error_class, error, retries, script_hash FROM results"
+                " WHERE test = ? AND NOT cached ORDER BY run_id DESC LIMIT ?", (test, WINDOW * 3),
+            ).fetchall()
+            skip = environment_runs(conn, {row["run_id"] for row in rows if row["status"] != "PASSED"})
+            profiles[test] = profile(test, rows[::-1], skip)
+    return profiles
+
+
+class RetryPolicy:
+    """Which failed results to run again, within a budget of reruns per run."""
+
+    def __init__(self, profiles, budget):
+        self.profiles = profiles
+        self.budget = budget
+        self.used = 0
+
+    @classmethod
+    def from_history(cls, tests, budget=None, path=HISTORY_PATH):
+        if budget is None:
+            budget = max(MIN_BUDGET, math.ceil(len(tests) * BUDGET_SHARE))
+        return cls(analyze(tests, path), budget)
+
+    def reason(self, result):
+        """Why ``result`` is not retried, or ``None`` if it should be."""
+        if result["testStatus"] == "PASSED":
+            return "passed"
+        found = self.profiles.get(result["title"])
+        if found is None or found.verdict != "flaky":
+            return f"{found.verdict if found else 'unknown'} test"
+        if result.get("retries", 0) >= found.retries_needed():
+            return f"retried {result['retries']} time(s) already"
+        # A new kind of error is more likely a regression than the usual flake
+        error = result.get("errorClass")
+        if found.error_classes and error and error not in found.error_classes:
+            return f"{error} is new for this test"
+        if self.used >= self.budget:
+            return "retry budget used up"
+        return None
+
+    def take(self, result):
+        """Spend one retry on ``result`` if the policy allows it."""
+        if self.reason(result) is not None:
+            return False
+        self.used += 1
+        return True
+
+
+def retry_failures(results, cases, policy, rerun):
+    """Rerun failed results the policy allows, until none qualify; return the final records.
+
+    ``rerun(cases)`` runs the cases and returns their records, e.g. a
+    ``run_cases`` call with the run's own options.
+    """
+    by_name = {case.name: case for case in cases}
+    final = {result["title"]: result for result in results}
+    while True:
+        chosen = [result for result in final.values() if result["title"] in by_name and policy.take(result)]
+        if not chosen:
+            break
+        print(f"retrying {len(chosen)} flaky test(s), {policy.budget - policy.used} retries left: "
+              + ", ".join(result["title"] for result in chosen), flush=True)
+        for new in rerun([by_name[result["title"]] for result in chosen]):
+            old = final[new["title"]]
+            new["retries"] = old.get("retries", 0) + 1
+            new["retryErrors"] = old.get("retryErrors", []) + [old["testError"]]
+            final[new["title"]] = new
+    return [final[result["title"]] for result in results]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="harness.flakes", description=__doc__.split("\n", 1)[0])
+    parser.add_argument("tests", nargs="*", help="exact test titles (default: every test in the history)")
+    parser.add_argument("--verdict", choices=["flaky", "broken", "stable", "unknown"],
+                        help="only list tests with this verdict")
+    args = parser.parse_args(argv)
+    if not HISTORY_PATH.exists():
+        parser.error(f"no history yet at {HISTORY_PATH}; run python -m harness first")
+
+    for found in analyze(args.tests or None).values():
+        if args.verdict and found.verdict != args.verdict:
+            continue
+        low, high = wilson_interval(found.failures, found.runs)
+        classes = ", ".join(f"{name} x{n}" for name, n in found.error_classes.items())
+        print(f"{found.verdict:<8} {found.failures:>3}/{found.runs:<3} failed "
+              f"(p {found.failure_rate:.2f}, 95% {low:.2f}-{high:.2f})  {found.test}  {classes}"
+              + (f"  [{found.skipped} environment failure(s) ignored]" if found.skipped else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
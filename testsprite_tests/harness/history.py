@@ -0,0 +1,234 @@
+"""Append-only history of every run, test and step, in SQLite.
+
+``tmp/test_results.json`` only holds the latest run, and it copies each
+script's full source into every record. After each ``python -m harness``
+run, :func:`record_run` adds the results to ``tmp/history.sqlite``:
+
+* ``runs``: when, at which git revision, and with which options,
+* ``results``: one row per test with status, error class, duration, time
+  spent in condition waits, retries and whether it came from the cache,
+* ``steps``: plan steps and traced steps with their durations,
+* ``scripts``: each distinct script source once, keyed by its SHA-256.
+
+The query helpers answer trend questions::
+
+    python -m harness.history TC003               # p50/p95 over the last 50 runs
+    python -m harness.history TC003 --steps       # the same per step
+    python -m harness.history --failing           # error classes by test
+
+or from Python, e.g. ``percentile_trend("TC003", 95, last=50)``.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import re
+import sqlite3
+import subprocess
+import sys
+
+from .perf import percentile
+from .suite import REPO_ROOT, TMP_DIR, timestamp
+
+HISTORY_PATH = TMP_DIR / "history.sqlite"
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started TEXT NOT NULL,
+    finished TEXT NOT NULL,
+    git_rev TEXT,
+    options TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scripts (
+    hash TEXT PRIMARY KEY,
+    source TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error_class TEXT,
+    error TEXT,
+    duration_ms REAL,
+    waited_ms REAL,
+    retries INTEGER NOT NULL DEFAULT 0,
+    cached INTEGER NOT NULL DEFAULT 0,
+    script_hash TEXT REFERENCES scripts(hash),
+    worker INTEGER
+);
+CREATE TABLE IF NOT EXISTS steps (
+    result_id INTEGER NOT NULL REFERENCES results(id),
+    idx INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT,
+    error_class TEXT,
+    duration_ms REAL,
+    busy_ms REAL
+);
+CREATE INDEX IF NOT EXISTS results_by_test ON results(test, run_id);
+CREATE INDEX IF NOT EXISTS steps_by_result ON steps(result_id);
+"""
+
+# "TimeoutError: Locator.click: ..." -> TimeoutError
+ERROR_CLASS = re.compile(r"^([A-Za-z_][\w.]*(?:Error|Exception|Exit|Interrupt))\b")
+
+
+def error_class(error):
+    """Class name at the start of ``error``; a bare message is a failed assertion."""
+    if not error:
+        return None
+    match = ERROR_CLASS.match(error)
+    return match.group(1).rsplit(".", 1)[-1] if match else "AssertionError"
+
+
+def script_hash(source):
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def connect(path=HISTORY_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        conn.executescript(SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def _steps(result):
+    """``(name, status, error, duration ms, busy ms)`` per plan or traced step."""
+    if result.get("steps"):
+        for step in result["steps"]:
+            yield (step["description"], step["status"], step.get("error"),
+                   round(step["duration"] * 1000, 1), None)
+    elif isinstance(result.get("trace"), list):
+        for step in result["trace"]:
+            yield step["step"], None, None, step.get("durationMs"), step["busyMs"]
+
+
+def record_run(results, started, options=None, path=HISTORY_PATH):
+    """Append one run's result records; return the run id."""
+    with contextlib.closing(connect(path)) as conn, conn:
+        run_id = conn.execute(
+            "INSERT INTO runs (started, finished, git_rev, options) VALUES (?, ?, ?, ?)",
+            (started, timestamp(), git_revision(), json.dumps(options or {}, sort_keys=True)),
+        ).lastrowid
+        for result in results:
+            digest = None
+            if result.get("code"):
+                digest = script_hash(result["code"])
+                conn.execute("INSERT OR IGNORE INTO scripts (hash, source) VALUES (?, ?)", (digest, result["code"]))
+            error = result.get("testError") or None
+            result_id = conn.execute(
+                "INSERT INTO results (run_id, test, status, error_class, error, duration_ms, waited_ms,"
+                " retries, cached, script_hash, worker) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, result["title"], result["testStatus"], result.get("errorClass") or error_class(error),
+                 error, round(result["duration"] * 1000, 1) if "duration" in result else None,
+                 result.get("waits", {}).get("waitedMs"), result.get("retries", 0),
+                 int(bool(result.get("cached"))), digest, result.get("worker")),
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO steps (result_id, idx, name, status, error_class, duration_ms, busy_ms)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(result_id, idx, name, status, error_class(error), duration, busy)
+                 for idx, (name, status, error, duration, busy) in enumerate(_steps(result), 1)],
+            )
+    return run_id
+
+
+def test_runs(conn, test, last=50, include_cached=False):
+    """The test's latest ``last`` results, oldest first."""
+    rows = conn.execute(
+        "SELECT results.*, runs.started, runs.git_rev FROM results JOIN runs ON runs.id = results.run_id"
+        # A prefix match ("TC013" finds "TC013_Local_Storage_..."); LIKE would
+        # also treat the underscores in full names as wildcards
+        " WHERE substr(test, 1, length(?)) = ? AND (? OR NOT cached) ORDER BY run_id DESC LIMIT ?",
+        (test, test, include_cached, last),
+    ).fetchall()
+    return rows[::-1]
+
+
+def percentile_trend(test, p=95, last=50, path=HISTORY_PATH):
+    """The ``p``-th percentile duration of ``test`` over its last ``last`` runs, in ms."""
+    with contextlib.closing(connect(path)) as conn:
+        durations = [row["duration_ms"] for row in test_runs(conn, test, last) if row["duration_ms"] is not None]
+    return percentile(durations, p)
+
+
+def step_percentiles(test, p=95, last=50, path=HISTORY_PATH):
+    """``{step: (runs, p-th percentile ms)}`` for ``test``'s steps over its last ``last`` runs."""
+    with contextlib.closing(connect(path)) as conn:
+        ids = [row["id"] for row in test_runs(conn, test, last)]
+        rows = conn.execute(
+            f"SELECT name, duration_ms FROM steps WHERE result_id IN ({','.join('?' * len(ids))})"
+            " AND duration_ms IS NOT NULL ORDER BY result_id, idx", ids,
+        ).fetchall()
+    durations = {}
+    for row in rows:
+        durations.setdefault(row["name"], []).append(row["duration_ms"])
+    return {name: (len(values), percentile(values, p)) for name, values in durations.items()}
+
+
+def failure_classes(last=50, path=HISTORY_PATH):
+    """``{test: {error class: count}}`` over the last ``last`` runs."""
+    with contextlib.closing(connect(path)) as conn:
+        rows = conn.execute(
+            "SELECT test, error_class, COUNT(*) AS n FROM results"
+            " WHERE status != 'PASSED' AND NOT cached AND run_id > (SELECT COALESCE(MAX(id), 0) - ? FROM runs)"
+            " GROUP BY test, error_class ORDER BY test, n DESC", (last,),
+        ).fetchall()
+    classes = {}
+    for row in rows:
+        classes.setdefault(row["test"], {})[row["error_class"] or "?"] = row["n"]
+    return classes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="harness.history", description=__doc__.split("\n", 1)[0])
+    parser.add_argument("test", nargs="?", help="TC id or title prefix, e.g. TC003")
+    parser.add_argument("--last", type=int, default=50, help="how many of the latest runs to look at")
+    parser.add_argument("--p", type=float, default=95, help="percentile to report next to the median")
+    parser.add_argument("--steps", action="store_true", help="report per step instead of per test")
+    parser.add_argument("--failing", action="store_true", help="error classes of failed tests")
+    args = parser.parse_args(argv)
+    if not HISTORY_PATH.exists():
+        parser.error(f"no history yet at {HISTORY_PATH}; run python -m harness first")
+
+    if args.failing:
+        for test, classes in failure_classes(args.last).items():
+            print(f"{test}: " + ", ".join(f"{name} x{n}" for name, n in classes.items()))
+        return 0
+    if not args.test:
+        parser.error("name a test, or use --failing")
+    if args.steps:
+        for name, (runs, value) in step_percentiles(args.test, args.p, args.last).items():
+            print(f"p{args.p:g} {value:>9.1f} ms over {runs:>3} runs  {name}")
+        return 0
+
+    with contextlib.closing(connect()) as conn:
+        rows = test_runs(conn, args.test, args.last)
+    durations = [row["duration_ms"] for row in rows if row["duration_ms"] is not None]
+    failed = sum(row["status"] != "PASSED" for row in rows)
+    print(f"{args.test}: {len(rows)} runs, {failed} failed, "
+          f"p50 {percentile(durations, 50):.0f} ms, p{args.p:g} {percentile(durations, args.p):.0f} ms")
+    for row in rows:
+        print(f"  {row['started']} {row['git_rev'] or '-':<9} {row['status']:<7} "
+              f"{row['duration_ms'] or 0:>8.0f} ms  {row['error_class'] or ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Select the TC scripts affected by a set of changed files.
+
+``tmp/code_summary.json`` maps features to app source files and every entry
+in ``testsprite_frontend_test_plan.json`` lists the features it exercises,
+so a changed path resolves to features and the features to tests.
+
+Paths the mapping cannot place are handled conservatively: anything that
+can change the built app (unmapped sources, sources whose features no test
+claims, config, dependencies, the harness itself) selects the whole suite,
+while docs and other files outside the app select nothing.
+"""
+
+import fnmatch
+import json
+import subprocess
+
+from .suite import PLAN_PATH, REPO_ROOT, TMP_DIR, load_plan
+
+CODE_SUMMARY_PATH = TMP_DIR / "code_summary.json"
+
+# Changes here can affect every test
+GLOBAL_PATTERNS = [
+    "package.json",
+    "package-lock.json",
+    "next.config.js",
+    "tailwind.config.ts",
+    "postcss.config.mjs",
+    "tsconfig.json",
+    "components.json",
+    "testsprite_tests/harness/*",
+    "testsprite_tests/testsprite_frontend_test_plan.json",
+    "testsprite_tests/fixtures/network/*",
+    "testsprite_tests/perf_budgets.json",
+]
+
+# Roots of files that end up in the built app
+APP_PATTERNS = ["src/*", "public/*", "prisma/*"]
+
+
+def load_feature_files(path=CODE_SUMMARY_PATH):
+    """Return ``{feature name: [repo-relative paths]}`` from the code summary."""
+    with open(path, encoding="utf-8") as f:
+        return {feature["name"]: feature["files"] for feature in json.load(f)["features"]}
+
+
+def tracked_files(patterns=APP_PATTERNS):
+    """Repo-relative paths of the files git tracks under ``patterns``' roots."""
+    roots = sorted({pattern.split("/", 1)[0] for pattern in patterns})
+    try:
+        out = subprocess.run(["git", "ls-files", "--", *roots], cwd=REPO_ROOT, check=True,
+                             capture_output=True, text=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        # Not a checkout: every file on disk under the roots
+        return sorted(p.relative_to(REPO_ROOT).as_posix() for root in roots
+                      for p in (REPO_ROOT / root).rglob("*") if p.is_file())
+    return [line for line in out.splitlines() if line]
+
+
+def shared_files(feature_files, tested_features):
+    """App files that no feature in ``tested_features`` claims.
+
+    Entry points, global styles, layouts and libraries every component
+    imports are in no tested feature, yet a change to them can affect any
+    test.
+    """
+    claimed = {file for feature in tested_features for file in feature_files.get(feature, [])}
+    return [path for path in tracked_files() if path not in claimed]
+
+
+def changed_files(base="HEAD"):
+    """Files changed in the working tree relative to ``base``, plus untracked ones."""
+    def git(*args):
+        out = subprocess.run(["git", *args], cwd=REPO_ROOT, check=True, capture_output=True, text=True).stdout
+        return [line for line in out.splitlines() if line]
+
+    return sorted(set(git("diff", "--name-only", base)) | set(git("ls-files", "--others", "--exclude-standard")))
+
+
+def _matches(path, patterns):
+    return any(fnmatch.fnmatch(path, pattern) for pattern in patterns)
+
+
+def select(cases, paths, feature_files=None):
+    """Return ``(selected cases, {path: reason})`` for the changed ``paths``."""
+    feature_files = feature_files if feature_files is not None else load_feature_files()
+    by_file = {}
+    for feature, files in feature_files.items():
+        for file in files:
+            by_file.setdefault(file, set()).add(feature)
+    # Judged against the whole plan, not just ``cases``
+    tested = {feature for entry in load_plan().values() for feature in entry.get("features", [])}
+    # Interpreted plan entries share the plan file, which is a global pattern
+    scripts = {case.path.relative_to(REPO_ROOT).as_posix(): case for case in cases if case.path != PLAN_PATH}
+
+    selected = set()
+    reasons = {}
+    for path in paths:
+        path = path.replace("\\", "/")
+        if path in scripts:
+            selected.add(scripts[path].id)
+            reasons[path] = f"test script {scripts[path].id}"
+        elif by_file.get(path, set()) & tested:
+            features = by_file[path]
+            hits = {case.id for case in cases if features & set(case.features)}
+            selected |= hits
+            reasons[path] = f"{', '.join(sorted(features))} -> {', '.join(sorted(hits)) or 'no selected tests'}"
+        elif path in by_file and _matches(path, APP_PATTERNS):
+            # Shared code (utils.ts, config, types) sits in features no test claims
+            selected |= {case.id for case in cases}
+            reasons[path] = f"{', '.join(sorted(by_file[path]))} -> no test claims it, running everything"
+        elif _matches(path, GLOBAL_PATTERNS) or _matches(path, APP_PATTERNS):
+            selected |= {case.id for case in cases}
+            reasons[path] = "not mapped to a feature, running everything"
+        else:
+            reasons[path] = "outside the app, ignored"
+    return [case for case in cases if case.id in selected], reasons
+
+
+def describe(reasons):
+    """Human readable summary of why each changed path selected what it did."""
+    return "\n".join(f"  {path}: {reason}" for path, reason in sorted(reasons.items()))
@@ -0,0 +1,183 @@
+"""Find apps whose windows leave memory behind when they are closed.
+
+Every desktop app, plus the Notification Center panel, is opened and closed
+through the UI (``openWindow`` / ``closeWindow`` in ``window-context.tsx``)
+``--cycles`` times. One warm-up cycle goes first, so lazily loaded code and
+one-off caches do not count as leaks. After each cycle the page is
+garbage-collected (``HeapProfiler.collectGarbage``) and sampled over CDP:
+
+* JS heap in use (``Runtime.getHeapUsage``),
+* DOM nodes and event listeners (``Memory.getDOMCounters``),
+* ``setInterval`` timers still running, counted by an init script that
+  wraps ``setInterval``/``clearInterval``. ``system-info.tsx``,
+  ``media-player.tsx`` and ``notification-center.tsx`` all start one.
+
+An app is flagged when a counter rises over nearly every cycle and the
+total rise is larger than noise::
+
+    python -m harness.leaks                     # every app, 5 cycles
+    python -m harness.leaks terminal media --cycles 10
+
+The report is written to ``tmp/leaks/leaks.json``. The exit status is 1 if
+anything was flagged.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from playwright import async_api
+
+from .auth import ensure_session, new_session_context
+from .browser import browser_source
+from .pages import APPS, Desktop, NotificationCenter, app
+from .suite import TMP_DIR, app_url
+from .waits import settle
+
+LEAKS_DIR = TMP_DIR / "leaks"
+REPORT_PATH = LEAKS_DIR / "leaks.json"
+
+DEFAULT_CYCLES = 5
+
+# Not an app window, but opened and closed the same way from the top bar
+NOTIFICATIONS = "notifications"
+
+# A counter has to rise between at least this share of consecutive samples...
+RISING_SHARE = 0.8
+# ...and by more than this over the whole run to be reported
+MIN_GROWTH = {"heapBytes": 256 * 1024, "domNodes": 50, "listeners": 5, "intervals": 1}
+
+INTERVAL_COUNTER_JS = """
+(() => {
+  const active = new Set();
+  const set = window.setInterval, clear = window.clearInterval;
+  window.setInterval = function (...args) {
+    const id = set.apply(this, args);
+    active.add(id);
+    return id;
+  };
+  window.clearInterval = function (id) {
+    active.delete(id);
+    return clear.call(this, id);
+  };
+  window.__harnessIntervals = () => active.size;
+})();
+"""
+
+
+async def sample(page, cdp):
+    """Counters after a full garbage collection."""
+    await cdp.send("HeapProfiler.collectGarbage")
+    heap = await cdp.send("Runtime.getHeapUsage")
+    dom = await cdp.send("Memory.getDOMCounters")
+    return {
+        "heapBytes": heap["usedSize"],
+        "domNodes": dom["nodes"],
+        "listeners": dom["jsEventListeners"],
+        "intervals": await page.evaluate("() => window.__harnessIntervals()"),
+    }
+
+
+async def cycle(page, key):
+    """Open and close ``key`` once, waiting for each to finish."""
+    if key == NOTIFICATIONS:
+        center = NotificationCenter(page)
+        await center.toggle_button.click()
+        await settle(page, center.panel)
+        await center.toggle_button.click()
+        await center.panel.wait_for(state="hidden")
+        return
+    window = await Desktop(page).open(key)
+    await settle(page, window.root)
+    await window.close()
+    await window.root.wait_for(state="detached")
+
+
+def growth(values):
+    """``(total rise, share of steps that rose)`` across ``values``."""
+    steps = [b - a for a, b in zip(values, values[1:])]
+    rising = sum(step > 0 for step in steps)
+    return values[-1] - values[0], rising / len(steps) if steps else 0.0
+
+
+def verdict(samples):
+    """The counters that grew over nearly every cycle, with their average growth per cycle."""
+    leaks = {}
+    for counter, minimum in MIN_GROWTH.items():
+        total, rising = growth([s[counter] for s in samples])
+        if rising >= RISING_SHARE and total > minimum:
+            leaks[counter] = round(total / (len(samples) - 1), 1)
+    return leaks
+
+
+async def hunt(page, cdp, key, cycles):
+    await cycle(page, key)  # warm-up
+    samples = [await sample(page, cdp)]
+    for _ in range(cycles):
+        await cycle(page, key)
+        samples.append(await sample(page, cdp))
+    return {"app": key, "samples": samples, "leaks": verdict(samples)}
+
+
+async def run_hunt(keys, cycles=DEFAULT_CYCLES):
+    """Hunt each of ``keys`` in its own fresh context; return one report per key."""
+    pw = await async_api.async_playwright().start()
+    source = browser_source(pw)
+    try:
+        browser = await source.get()
+        try:
+            session = await ensure_session(browser)
+            reports = []
+            for key in keys:
+                context = await new_session_context(browser, session)
+                try:
+                    page = await context.new_page()
+                    await page.add_init_script(script=INTERVAL_COUNTER_JS)
+                    cdp = await context.new_cdp_session(page)
+                    await page.goto(app_url(), timeout=10000)
+                    await settle(page, Desktop(page).icon(next(iter(APPS))))
+                    try:
+                        reports.append(await hunt(page, cdp, key, cycles))
+                    except async_api.Error as exc:
+                        reports.append({"app": key, "error": str(exc).splitlines()[0]})
+                finally:
+                    await context.close()
+                print(describe(reports[-1]), flush=True)
+            return reports
+        finally:
+            await source.release(browser)
+    finally:
+        await source.close()
+        await pw.stop()
+
+
+def describe(report):
+    if "error" in report:
+        return f"ERROR   {report['app']}: {report['error']}"
+    if not report["leaks"]:
+        return f"ok      {report['app']}"
+    grew = ", ".join(f"{counter} +{per_cycle:g}/cycle" for counter, per_cycle in report["leaks"].items())
+    return f"LEAK    {report['app']}: {grew}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="harness.leaks", description=__doc__.split("\n", 1)[0])
+    parser.add_argument("apps", nargs="*", help=f"app ids or titles, or {NOTIFICATIONS!r} (default: all)")
+    parser.add_argument("--cycles", type=int, default=DEFAULT_CYCLES, help="measured open/close cycles per app")
+    args = parser.parse_args(argv)
+    if args.cycles < 2:
+        parser.error("--cycles must be at least 2 to see a trend")
+
+    keys = [key if key == NOTIFICATIONS else app(key).id for key in args.apps] or [*APPS, NOTIFICATIONS]
+    reports = asyncio.run(run_hunt(keys, args.cycles))
+
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(json.dumps({"cycles": args.cycles, "apps": reports}, indent=2) + "\n", encoding="utf-8")
+    flagged = [r["app"] for r in reports if r.get("leaks")]
+    print(f"{len(flagged)} of {len(reports)} flagged; report in {REPORT_PATH}")
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""Lean mode for functional tests: no heavy assets, no motion.
+
+Tests that only check behaviour (login, icon interactions, search, keyboard
+shortcuts) gain nothing from decoding wallpapers and gallery images, loading
+fonts and audio, or waiting for windows to animate in. A script opts in
+with ``LEAN = True``; its context then
+
+* aborts image, media and font requests,
+* emulates ``prefers-reduced-motion: reduce``, which framer-motion honours
+  through the app's ``MotionConfig reducedMotion="user"``, and
+* injects a stylesheet that cuts CSS transitions and animations to 0.01ms,
+  so the glassmorphism transitions finish within a frame.
+
+The result record gets a ``lean`` report: requests blocked by type, the
+bytes they would have transferred where the size is known locally, and the
+CSS animation time the app's stylesheets declare for the transitions and
+animations that were cut. That is declared time, not measured wall time.
+"""
+
+import re
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from playwright import async_api
+
+from .network import match_fixture
+from .suite import REPO_ROOT, app_url
+
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+# Context options that go with lean mode
+LEAN_CONTEXT_OPTIONS = {"reduced_motion": "reduce"}
+
+# Durations stay just above zero so transitionrun/animationstart still fire
+# and the skipped time can be accounted for. The time is what the app's own
+# stylesheets declare, read from their rules with Element.matches, so
+# nothing forces a style recalculation; the answer is cached per class list.
+LEAN_INIT_JS = """
+(() => {
+  const totals = { count: 0, ms: 0 };
+  window.__harnessLean = totals;
+
+  const css = `*, *::before, *::after {
+    transition-duration: 0.01ms !important;
+    transition-delay: 0s !important;
+    animation-duration: 0.01ms !important;
+    animation-delay: 0s !important;
+    animation-iteration-count: 1 !important;
+    scroll-behavior: auto !important;
+  }`;
+  const style = document.createElement('style');
+  style.textContent = css;
+  const install = () => (document.head || document.documentElement).appendChild(style);
+  document.head ? install() : document.addEventListener('DOMContentLoaded', install);
+
+  const seconds = list => list ? list.split(',').map(v => parseFloat(v) * (v.trim().endsWith('ms') ? 0.001 : 1)) : [];
+  const longest = (durations, delays, iterations) => {
+    let ms = 0;
+    durations.forEach((d, i) => {
+      const n = iterations[i % iterations.length];
+      if (!Number.isFinite(n)) return;
+      ms = Math.max(ms, (d * n + (delays[i % delays.length] || 0)) * 1000);
+    });
+    return ms;
+  };
+
+  // Rules that declare motion, in document order; rebuilt when sheets change
+  let rules = null, sheetCount = -1;
+  const collect = list => {
+    for (const rule of list) {
+      if (rule.cssRules && !rule.selectorText) collect(rule.cssRules);  // @media, @supports
+      else if (rule.style && (rule.style.transitionDuration || rule.style.animationDuration
+                              || rule.style.animationName)) rules.push(rule);
+    }
+  };
+  const motionRules = () => {
+    if (document.styleSheets.length !== sheetCount) {
+      rules = [];
+      sheetCount = document.styleSheets.length;
+      for (const sheet of document.styleSheets) {
+        if (sheet.ownerNode === style) continue;
+        try { collect(sheet.cssRules); } catch (e) { /* cross-origin sheet */ }
+      }
+      cache.clear();
+    }
+    return rules;
+  };
+
+  const cache = new Map();
+  const declared = (el, kind) => {
+    const key = kind + '|' + el.tagName + '.' + (el.getAttribute('class') || '') + '|' + (el.getAttribute('style') || '');
+    if (cache.has(key)) return cache.get(key);
+    const found = { duration: '', delay: '', iterations: '1' };
+    const take = decl => {
+      if (kind === 'transition') {
+        if (decl.transitionDuration) found.duration = decl.transitionDuration;
+        if (decl.transitionDelay) found.delay = decl.transitionDelay;
+      } else {
+        if (decl.animationDuration) found.duration = decl.animationDuration;
+        if (decl.animationDelay) found.delay = decl.animationDelay;
+        if (decl.animationIterationCount) found.iterations = decl.animationIterationCount;
+      }
+    };
+    // Later rules win, which is how utility-class stylesheets are ordered
+    for (const rule of motionRules()) {
+      try { if (el.matches(rule.selectorText)) take(rule.style); } catch (e) { /* pseudo-element selector */ }
+    }
+    take(el.style);
+    const ms = longest(seconds(found.duration), seconds(found.delay), found.iterations.split(',').map(Number));
+    cache.set(key, ms);
+    return ms;
+  };
+  const record = ms => { totals.count++; totals.ms += ms; };
+  addEventListener('transitionrun', e => e.target instanceof Element && record(declared(e.target, 'transition')), true);
+  addEventListener('animationstart', e => e.target instanceof Element && record(declared(e.target, 'animation')), true);
+  addEventListener('pagehide', () => window.__harnessLeanFlush && window.__harnessLeanFlush(totals));
+})();
+"""
+
+# Requests worth routing through Python at all: by extension, the Next.js
+# image optimiser and web font hosts. Everything else never leaves the browser.
+HEAVY_URL = re.compile(
+    r"(\.(png|jpe?g|gif|webp|avif|svg|ico|bmp|woff2?|ttf|otf|eot|mp3|mp4|m4a|webm|ogg|oga|wav|flac)([?#]|$))"
+    r"|/_next/image\?|//fonts\.(googleapis|gstatic)\.com/",
+    re.IGNORECASE,
+)
+
+
+def known_size(url, base_url=None):
+    """Bytes ``url`` would have transferred, if a local copy says so, else None."""
+    parts = urlsplit(url)
+    app = urlsplit(base_url or app_url())
+    if parts.netloc == app.netloc:
+        path = parts.path.lstrip("/")
+        if path.startswith("_next/static/"):
+            candidate = REPO_ROOT / ".next" / "static" / path[len("_next/static/"):]
+        else:
+            candidate = REPO_ROOT / "public" / path
+        return candidate.stat().st_size if candidate.is_file() else None
+    fixture = match_fixture(url)
+    return len(fixture.body) if fixture else None
+
+
+@dataclass
+class LeanReport:
+    blocked: dict = field(default_factory=dict)
+    bytes_saved: int = 0
+    unknown_sizes: int = 0
+    animations: int = 0
+    animation_ms: float = 0.0
+
+    def block(self, url, resource_type):
+        self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+        size = known_size(url)
+        if size is None:
+            self.unknown_sizes += 1
+        else:
+            self.bytes_saved += size
+
+    def add_motion(self, totals):
+        if totals:
+            self.animations += totals.get("count", 0)
+            self.animation_ms += totals.get("ms", 0)
+
+    async def collect(self, context):
+        """Fold in the motion totals of pages that are still open."""
+        for page in context.pages:
+            try:
+                self.add_motion(await page.evaluate("() => window.__harnessLean || null"))
+            except async_api.Error:
+                pass
+
+    def summary(self):
+        return {
+            "blockedRequests": sum(self.blocked.values()),
+            "blockedByType": dict(sorted(self.blocked.items())),
+            "bytesSaved": self.bytes_saved,
+            "unknownSizes": self.unknown_sizes,
+            "animationsShortened": self.animations,
+            # What the stylesheets declare, not measured wall time
+            "declaredAnimationMs": round(self.animation_ms, 1),
+        }
+
+
+def is_lean(module):
+    """Whether the script asked for lean mode."""
+    return getattr(module, "LEAN", False)
+
+
+async def install_lean_mode(context):
+    """Block heavy resources and cut animations in ``context``; return its report."""
+    report = LeanReport()
+
+    async def handle(route):
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES:
+            report.block(request.url, request.resource_type)
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    await context.expose_function("__harnessLeanFlush", lambda totals: report.add_motion(totals))
+    await context.add_init_script(script=LEAN_INIT_JS)
+    await context.route(HEAVY_URL, handle)
+    return report
+
+
+def describe(summary):
+    """One line for the console, e.g. ``lean: 12 requests, 340 KB, 4.2s of declared animation cut``."""
+    return (f"lean: {summary['blockedRequests']} requests, {summary['bytesSaved'] / 1024:.0f} KB, "
+            f"{summary['declaredAnimationMs'] / 1000:.1f}s of declared animation cut")
+
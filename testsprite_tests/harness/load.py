@@ -0,0 +1,325 @@
+"""Load generator and latency histogram for ``POST /api/contact``.
+
+TC005 and TC012 submit the contact form once each through the UI. This
+drives ``src/app/api/contact/route.ts`` directly over HTTP/1.1 keep-alive
+connections, one per concurrent client, using only asyncio streams::
+
+    python -m harness.load --concurrency 8 --rate 40 --duration 20
+    python -m harness.load --ramp 1 2 4 8 16 32 64 --duration 10
+
+Payloads are a configurable mix of valid and invalid submissions. Whether
+each one should pass is decided against the ``contactFormSchema`` rules,
+which are read from ``src/lib/schemas.ts``. A valid payload is expected to
+get 200 and an invalid one 400; any other answer, or no answer, counts as an
+error.
+
+With ``--rate`` the load is open-loop. Requests are scheduled at a fixed
+rate, and latency runs from the scheduled time, so a backed-up server is
+not hidden by clients that simply wait for it (coordinated omission).
+Without ``--rate``, each client sends its next request as soon as the last
+one is answered. ``--ramp`` steps through closed-loop concurrency levels
+and reports the level after which throughput stops growing.
+
+Each level reports p50/p90/p99/max latency, a histogram, throughput and
+error rate, written to ``tmp/load/contact-<label>.json``. Without
+``RESEND_API_KEY`` the route sleeps 500ms per valid message, so that is
+the floor for valid payloads. ``--serve --resend-stub PROFILE`` sends them
+through :mod:`harness.resend_stub` instead.
+
+The ``sendMessage`` server action in ``src/actions/send-message.ts`` is
+not covered. No component references it, so the build has no action id to
+post to.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from urllib.parse import urlsplit
+
+from .perf import percentile
+from .suite import REPO_ROOT, TMP_DIR, app_url
+
+LOAD_DIR = TMP_DIR / "load"
+SCHEMA_PATH = REPO_ROOT / "src" / "lib" / "schemas.ts"
+ROUTE = "/api/contact"
+
+REQUEST_TIMEOUT_S = 30
+
+# Upper bounds of the latency histogram buckets, in ms
+HISTOGRAM_BOUNDS_MS = [5, 10, 25, 50, 100, 250, 500, 750, 1000, 2500, 5000, 10000]
+
+# A ramp level saturates the route when it adds less than this much throughput
+SATURATION_GAIN = 1.1
+
+# zod's email check (v3), case-insensitive
+EMAIL_RE = re.compile(r"^(?!\.)(?!.*\.\.)([A-Z0-9_'+\-\.]*)[A-Z0-9_+-]@([A-Z0-9][A-Z0-9\-]*\.)+[A-Z]{2,}$", re.I)
+
+SCHEMA_FIELD = re.compile(r"(\w+):\s*z\.string\(\)((?:\.\w+\([^)]*\{[^}]*\}\))*)")
+
+
+def load_schema(path=SCHEMA_PATH):
+    """``{field: {"min": n, "email": bool}}`` from ``contactFormSchema``."""
+    source = path.read_text(encoding="utf-8")
+    start = source.index("contactFormSchema")
+    end = source.index("});", start)
+    rules = {}
+    for name, chain in SCHEMA_FIELD.findall(source[start:end]):
+        minimum = re.search(r"\.min\((\d+)", chain)
+        rules[name] = {"min": int(minimum.group(1)) if minimum else 0, "email": ".email(" in chain}
+    return rules
+
+
+def is_valid(payload, rules):
+    for name, rule in rules.items():
+        value = payload.get(name)
+        if not isinstance(value, str) or len(value) < rule["min"]:
+            return False
+        if rule["email"] and not EMAIL_RE.match(value):
+            return False
+    return True
+
+
+def valid_payload(rng, rules):
+    payload = {
+        "name": f"Load Tester {rng.randrange(10000)}",
+        "email": f"load.{rng.randrange(10000)}@example.com",
+        "message": "Sent by the contact route load generator. " * rng.randint(1, 5),
+    }
+    # Pad anything a stricter schema would reject
+    for name, rule in rules.items():
+        payload[name] = payload.get(name, "x").ljust(rule["min"], "x")
+    return payload
+
+
+# Ways to break a valid payload
+INVALID = {
+    "short name": lambda p: {**p, "name": "A"},
+    "bad email": lambda p: {**p, "email": "not-an-email"},
+    "short message": lambda p: {**p, "message": "Hi"},
+    "missing field": lambda p: {k: v for k, v in p.items() if k != "email"},
+}
+
+
+def make_payload(rng, rules, invalid_share):
+    """``(kind, payload, expected status)``; the schema has the final word on validity."""
+    payload = valid_payload(rng, rules)
+    kind = "valid"
+    if rng.random() < invalid_share:
+        kind = rng.choice(sorted(INVALID))
+        payload = INVALID[kind](payload)
+    return kind, payload, 200 if is_valid(payload, rules) else 400
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection to the app."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def post_json(self, path, payload):
+        """Send ``payload`` and return the response status; the body is read and dropped."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode()
+        self.writer.write(
+            f"POST {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while size := int((await self.reader.readline()).split(b";")[0], 16):
+                await self.reader.readexactly(size + 2)
+            await self.reader.readline()
+        else:
+            await self.reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+
+async def _send(conn, samples, kind, payload, expected, scheduled):
+    try:
+        status = await asyncio.wait_for(conn.post_json(ROUTE, payload), REQUEST_TIMEOUT_S)
+    except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError, IndexError) as exc:
+        await conn.close()
+        status, error = None, type(exc).__name__
+    else:
+        error = None if status == expected else f"HTTP {status}, expected {expected}"
+    samples.append({"kind": kind, "status": status, "ms": (time.perf_counter() - scheduled) * 1000, "error": error})
+
+
+async def run_level(base_url, concurrency, duration, rate=None, invalid_share=0.2, seed=0, rules=None):
+    """Load the route for ``duration`` seconds; return a sample per request and the seconds taken."""
+    rules = rules or load_schema()
+    rng = random.Random(seed)
+    url = urlsplit(base_url)
+    conns = [Connection(url.hostname, url.port or 80) for _ in range(concurrency)]
+    samples = []
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async def closed_loop(conn):
+        while time.perf_counter() < deadline:
+            kind, payload, expected = make_payload(rng, rules, invalid_share)
+            await _send(conn, samples, kind, payload, expected, time.perf_counter())
+
+    async def open_loop(conn, queue):
+        while (item := await queue.get()) is not None:
+            await _send(conn, samples, *item)
+
+    try:
+        if rate:
+            queue = asyncio.Queue()
+            workers = [asyncio.create_task(open_loop(conn, queue)) for conn in conns]
+            for i in range(int(rate * duration)):
+                scheduled = started + i / rate
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+                kind, payload, expected = make_payload(rng, rules, invalid_share)
+                queue.put_nowait((kind, payload, expected, scheduled))
+            for _ in conns:
+                queue.put_nowait(None)
+            await asyncio.gather(*workers)
+        else:
+            await asyncio.gather(*(closed_loop(conn) for conn in conns))
+    finally:
+        for conn in conns:
+            await conn.close()
+    return samples, time.perf_counter() - started
+
+
+def histogram(latencies, bounds=HISTOGRAM_BOUNDS_MS):
+    counts = {f"<={bound}ms": 0 for bound in bounds}
+    counts[f">{bounds[-1]}ms"] = 0
+    for ms in latencies:
+        for bound in bounds:
+            if ms <= bound:
+                counts[f"<={bound}ms"] += 1
+                break
+        else:
+            counts[f">{bounds[-1]}ms"] += 1
+    return counts
+
+
+def summarise(samples, elapsed, concurrency, rate=None):
+    answered = [s["ms"] for s in samples if s["status"] is not None]
+    errors = [s for s in samples if s["error"]]
+    by_kind = {}
+    for s in samples:
+        by_kind[s["kind"]] = by_kind.get(s["kind"], 0) + 1
+    error_kinds = {}
+    for s in errors:
+        error_kinds[s["error"]] = error_kinds.get(s["error"], 0) + 1
+    return {
+        "concurrency": concurrency,
+        "rate": rate,
+        "requests": len(samples),
+        "payloads": by_kind,
+        "seconds": round(elapsed, 2),
+        "throughput": round(len(answered) / elapsed, 1) if elapsed else 0.0,
+        "errorRate": round(len(errors) / len(samples), 4) if samples else 0.0,
+        "errors": error_kinds,
+        "p50Ms": round(percentile(answered, 50), 1),
+        "p90Ms": round(percentile(answered, 90), 1),
+        "p99Ms": round(percentile(answered, 99), 1),
+        "maxMs": round(max(answered, default=0.0), 1),
+        "histogram": histogram(answered),
+    }
+
+
+def saturation(levels):
+    """The last ramp level that still added throughput over the one before."""
+    best = levels[0] if levels else None
+    for previous, level in zip(levels, levels[1:]):
+        if level["throughput"] < previous["throughput"] * SATURATION_GAIN or level["errorRate"] > previous["errorRate"]:
+            break
+        best = level
+    return {"concurrency": best["concurrency"], "throughput": best["throughput"]} if best else None
+
+
+def describe(level):
+    return (f"c={level['concurrency']:<4} {level['throughput']:>7.1f} req/s  p50 {level['p50Ms']:>7.1f}  "
+            f"p90 {level['p90Ms']:>7.1f}  p99 {level['p99Ms']:>7.1f}  max {level['maxMs']:>7.1f} ms  "
+            f"errors {level['errorRate']:.1%}")
+
+
+async def run_load(base_url, levels, duration, rate, invalid_share, seed):
+    rules = load_schema()
+    results = []
+    for concurrency in levels:
+        samples, elapsed = await run_level(base_url, concurrency, duration, rate, invalid_share, seed, rules)
+        results.append(summarise(samples, elapsed, concurrency, rate))
+        print(describe(results[-1]), flush=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="harness.load", description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--base-url", default=app_url(), help="app to load (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=8, help="simultaneous connections")
+    parser.add_argument("--ramp", type=int, nargs="+", metavar="N",
+                        help="closed-loop concurrency levels to step through instead of --concurrency")
+    parser.add_argument("--rate", type=float, help="requests per second, scheduled open-loop")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per level")
+    parser.add_argument("--invalid", type=float, default=0.2, help="share of invalid payloads (0-1)")
+    parser.add_argument("--seed", type=int, default=0, help="payload mix seed")
+    parser.add_argument("--label", default="current", help="name the results are saved under")
+    parser.add_argument("--serve", action="store_true", help="build and start the app for the run")
+    parser.add_argument("--resend-stub", metavar="PROFILE",
+                        help="with --serve, send mail to a local Resend stand-in with these faults")
+    args = parser.parse_args(argv)
+    if args.ramp and args.rate:
+        parser.error("--ramp measures closed-loop capacity; it cannot be combined with --rate")
+    if args.resend_stub is not None and not args.serve:
+        parser.error("--resend-stub needs --serve, so that the app starts pointed at the stub")
+
+    server = stub = None
+    if args.serve:
+        from .resend_stub import BackgroundStub, FaultProfile
+        from .server import AppServer
+        env = {}
+        if args.resend_stub is not None:
+            stub = BackgroundStub(FaultProfile.parse(args.resend_stub)).start()
+            env = stub.app_env()
+        server = AppServer(urlsplit(args.base_url).port or 80, env=env).start()
+    try:
+        levels = asyncio.run(run_load(args.base_url, args.ramp or [args.concurrency], args.duration,
+                                      args.rate, args.invalid, args.seed))
+    finally:
+        if server:
+            server.stop()
+        if stub:
+            stub.stop()
+
+    report = {"label": args.label, "baseUrl": args.base_url, "route": ROUTE, "invalidShare": args.invalid,
+              "resendStub": args.resend_stub, "levels": levels}
+    if args.ramp:
+        report["saturation"] = saturation(levels)
+        print(f"throughput stops growing after concurrency {report['saturation']['concurrency']} "
+              f"({report['saturation']['throughput']} req/s)")
+    path = LOAD_DIR / f"contact-{args.label}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"results in {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Serve off-host requests from local fixtures instead of the network.
+
+The app pulls images from via.placeholder.com, unsplash.com and
+wallpaperaccess.com, and the Projects window fetches repos from
+api.github.com. On a build machine without network access each of those
+waits for a DNS or TCP timeout (``net::ERR_EMPTY_RESPONSE`` in the raw
+report), and where there is network the responses vary from run to run.
+
+Every test context routes requests that leave the app's origin through
+:func:`install_network_stub`. URLs listed in ``fixtures/network/routes.json``
+are fulfilled from the files next to it; anything else off-host is aborted
+straight away. Requests to the app itself are not intercepted at all.
+
+``HARNESS_NETWORK=live`` turns the stub off, and
+``HARNESS_NETWORK_LATENCY_MS`` delays every fixture response, to see how the
+app behaves on a slow link.
+"""
+
+import asyncio
+import contextvars
+import fnmatch
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from .suite import SUITE_DIR, app_url
+
+FIXTURES_DIR = SUITE_DIR / "fixtures" / "network"
+
+NETWORK_ENV = "HARNESS_NETWORK"
+LATENCY_ENV = "HARNESS_NETWORK_LATENCY_MS"
+
+
+@dataclass
+class Fixture:
+    url: str
+    body: bytes
+    content_type: str
+    status: int = 200
+    headers: dict = field(default_factory=dict)
+
+
+def load_fixtures(root=FIXTURES_DIR):
+    """Read the routes manifest and the bodies it points at."""
+    with open(root / "routes.json", encoding="utf-8") as f:
+        routes = json.load(f)["routes"]
+    return [
+        Fixture(
+            url=route["url"],
+            body=(root / route["file"]).read_bytes(),
+            content_type=route["contentType"],
+            status=route.get("status", 200),
+            headers=route.get("headers", {}),
+        )
+        for route in routes
+    ]
+
+
+_fixtures = None
+
+
+def fixtures():
+    global _fixtures
+    if _fixtures is None:
+        _fixtures = load_fixtures()
+    return _fixtures
+
+
+def match_fixture(url, candidates=None):
+    for fixture in candidates if candidates is not None else fixtures():
+        if fnmatch.fnmatchcase(url, fixture.url):
+            return fixture
+    return None
+
+
+def off_host(base_url=None):
+    """Pattern for http(s) URLs outside ``base_url``'s origin.
+
+    A regex, unlike a callable, is matched by the browser driver, so
+    same-origin requests never make the round trip to Python.
+    """
+    url = urlsplit(base_url or app_url())
+    origin = re.escape(f"{url.scheme}://{url.netloc}")
+    return re.compile(rf"^(?!{origin}(?:[/?#]|$))https?://")
+
+
+@dataclass
+class NetworkLog:
+    """Off-host requests a test made and what the stub did with them."""
+
+    fulfilled: dict = field(default_factory=dict)
+    blocked: dict = field(default_factory=dict)
+
+    def record(self, url, served):
+        host = urlsplit(url).netloc
+        bucket = self.fulfilled if served else self.blocked
+        bucket[host] = bucket.get(host, 0) + 1
+
+    def summary(self):
+        return {
+            "fulfilled": sum(self.fulfilled.values()),
+            "blocked": sum(self.blocked.values()),
+            "blockedHosts": sorted(self.blocked),
+        }
+
+
+_current_log = contextvars.ContextVar("network_log", default=None)
+
+
+def start_network_log():
+    """Begin recording stubbed requests for the current test and return the log."""
+    log = NetworkLog()
+    _current_log.set(log)
+    return log
+
+
+def stub_enabled():
+    return os.environ.get(NETWORK_ENV, "stub") != "live"
+
+
+def latency_ms():
+    return float(os.environ.get(LATENCY_ENV, "0") or 0)
+
+
+def network_mode():
+    """Short description of the network setup, e.g. ``stub``, ``stub+200ms`` or ``live``."""
+    if not stub_enabled():
+        return "live"
+    latency = latency_ms()
+    return f"stub+{latency:g}ms" if latency else "stub"
+
+
+async def install_network_stub(context, base_url=None, latency=None):
+    """Route ``context``'s off-host requests to fixtures or abort them."""
+    latency = latency_ms() if latency is None else latency
+    log = _current_log.get() or NetworkLog()
+
+    async def handle(route):
+        url = route.request.url
+        fixture = match_fixture(url)
+        log.record(url, fixture is not None)
+        if fixture is None:
+            await route.abort("internetdisconnected")
+            return
+        if latency:
+            await asyncio.sleep(latency / 1000)
+        await route.fulfill(
+            status=fixture.status,
+            headers={"access-control-allow-origin": "*", **fixture.headers},
+            content_type=fixture.content_type,
+            body=fixture.body,
+        )
+
+    await context.route(off_host(base_url), handle)
@@ -0,0 +1,420 @@
+"""Page objects for the PortfolioOS desktop built on semantic locators.
+
+Scripts generated by TestSprite address elements with absolute XPaths such as
+``html/body/main/div/div/button[19]``, which break on any layout change and
+then time out after the full action timeout. The objects here use roles,
+accessible names and ``data-testid`` attributes instead, and the app list
+comes straight from ``initialAppsData`` in ``window-context.tsx``, so new
+apps are picked up without touching the harness.
+
+Locators are created once per page and reused. Before acting, the page
+objects' methods (``Desktop.open``, ``Window.close``, ``ContactWindow.submit``
+and so on) pass their target through :meth:`Locators.require`. It checks
+that the target exists, but only when nodes were added or removed since the
+last check. It fails after a short timeout with the semantic name of what
+was missing, instead of stalling for the whole action timeout. The DOM
+version is read once per page-object method, so ``ContactWindow.submit``
+costs one round trip for its four targets rather than four.
+"""
+
+import contextvars
+import functools
+import re
+import weakref
+from dataclasses import dataclass
+
+from .actions import is_timed, stand_in, unwrap
+from .suite import REPO_ROOT
+from .trace import trace_step
+
+WINDOW_CONTEXT_PATH = REPO_ROOT / "src" / "contexts" / "window-context.tsx"
+
+# How long require() waits for a missing target before giving up
+FAST_TIMEOUT_MS = 1000
+
+APP_ENTRY = re.compile(r"\{\s*id:\s*'([^']+)',\s*title:\s*'([^']+)'")
+
+# Bumped when nodes are added or removed; style and attribute writes (framer-motion
+# animates every frame) cannot detach a target, so they do not invalidate checks
+DOM_VERSION_JS = """
+() => {
+  if (window.__harnessDomVersion === undefined) {
+    window.__harnessDomVersion = 1;
+    new MutationObserver(() => { window.__harnessDomVersion++; })
+      .observe(document, { subtree: true, childList: true });
+  }
+  return location.href + '#' + window.__harnessDomVersion;
+}
+"""
+
+
+# DOM versions read during the current page-object action, per registry
+_action_versions = contextvars.ContextVar("harness_action_versions", default=None)
+
+
+def action(method):
+    """Mark a page-object method as one action whose lookups share a DOM version read.
+
+    Nested actions (``SystemSearch.open`` calling ``search``) join the
+    outer one.
+    """
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        if _action_versions.get() is not None:
+            return await method(*args, **kwargs)
+        token = _action_versions.set({})
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            _action_versions.reset(token)
+    return wrapper
+
+
+@dataclass(frozen=True)
+class App:
+    id: str
+    title: str
+
+
+def load_apps(path=WINDOW_CONTEXT_PATH):
+    """Parse the desktop apps, in declaration order, from ``window-context.tsx``."""
+    source = path.read_text(encoding="utf-8")
+    start = source.index("initialAppsData")
+    end = source.index("];", start)
+    return [App(id, title) for id, title in APP_ENTRY.findall(source[start:end])]
+
+
+APPS = {app.id: app for app in load_apps()}
+
+
+def app(key):
+    """Look an app up by id (``'contact'``) or title (``'Contact Me'``)."""
+    if key in APPS:
+        return APPS[key]
+    for candidate in APPS.values():
+        if candidate.title == key:
+            return candidate
+    raise KeyError(f"unknown app {key!r}; known apps: {', '.join(APPS)}")
+
+
+class Locators:
+    """Per-page registry of named locators with DOM-version aware checks."""
+
+    def __init__(self, page):
+        # Weak, so the registry does not keep its own key in _registries alive
+        self._page = weakref.ref(unwrap(page))
+        self._timed = is_timed(page)
+        self._locators = {}
+        self._names = {}
+        self._confirmed = {}
+
+    @property
+    def page(self):
+        page = self._page()
+        return stand_in(page) if self._timed else page
+
+    def get(self, name, build):
+        """Return the locator registered as ``name``, building it on first use."""
+        locator = self._locators.get(name)
+        if locator is None:
+            locator = self._locators[name] = build(self.page)
+            self._names[id(locator)] = name
+        return locator
+
+    async def require(self, locator, timeout=FAST_TIMEOUT_MS):
+        """Return ``locator``, one from :meth:`get`, after making sure it matches something.
+
+        The check is skipped while the DOM is unchanged since the last
+        successful one; otherwise a missing target fails after ``timeout``.
+        Within an :func:`action` the DOM version is only read the first time.
+        """
+        name = self._names[id(locator)]
+        versions = _action_versions.get()
+        version = versions.get(self) if versions is not None else None
+        if version is None:
+            version = await self.page.evaluate(DOM_VERSION_JS)
+            if versions is not None:
+                versions[self] = version
+        if self._confirmed.get(name) != version:
+            try:
+                await locator.first.wait_for(state="attached", timeout=timeout)
+            except Exception as exc:
+                raise LookupError(f"{name} not found on {self.page.url}") from exc
+            self._confirmed[name] = version
+        return locator
+
+
+_registries = weakref.WeakKeyDictionary()
+
+
+def locators(page):
+    """The registry for ``page``; created on first use, dropped with the page.
+
+    Keyed on the Playwright page itself: each ``context.pages[-1]`` on the
+    runner's timed context is a new stand-in for the same page.
+    """
+    key = unwrap(page)
+    registry = _registries.get(key)
+    if registry is None:
+        registry = _registries[key] = Locators(page)
+    return registry
+
+
+class PageObject:
+    def __init__(self, page):
+        self.page = page
+        self.locators = locators(page)
+
+    def _get(self, name, build):
+        return self.locators.get(name, build)
+
+    async def _require(self, locator):
+        return await self.locators.require(locator)
+
+
+class LoginScreen(PageObject):
+    """The boot screen's password prompt."""
+
+    @property
+    def password_input(self):
+        return self._get("password input", lambda page: page.get_by_label("Password input"))
+
+    @property
+    def login_button(self):
+        return self._get("login button", lambda page: page.get_by_role("button", name="Login", exact=True))
+
+    @property
+    def guest_button(self):
+        return self._get("guest button", lambda page: page.get_by_role("button", name="Guest", exact=True))
+
+    @action
+    async def login(self, password):
+        await (await self._require(self.password_input)).fill(password)
+        await (await self._require(self.login_button)).click()
+
+    @action
+    async def enter_as_guest(self):
+        await (await self._require(self.guest_button)).click()
+
+
+class Desktop(PageObject):
+    """Desktop icons and the icon-layout controls."""
+
+    def icon(self, key):
+        target = app(key)
+        return self._get(f"desktop icon {target.id}",
+                         lambda page: page.get_by_test_id(f"desktop-icon-{target.id}"))
+
+    @property
+    def reset_icons(self):
+        return self._get("reset icon positions",
+                         lambda page: page.get_by_role("button", name="Reset icon positions"))
+
+    @action
+    async def open(self, key):
+        """Open an app by clicking its desktop icon and return its window."""
+        target = app(key)
+        await trace_step(f"open {target.id}")
+        await (await self._require(self.icon(target.id))).click()
+        return window_for(self.page, target.id)
+
+
+class Taskbar(PageObject):
+
+    @property
+    def root(self):
+        return self._get("taskbar", lambda page: page.get_by_role("toolbar", name="Taskbar"))
+
+    @property
+    def start_button(self):
+        return self._get("start button", lambda page: page.get_by_role("button", name="Start menu"))
+
+    @property
+    def search_button(self):
+        return self._get("search button", lambda page: page.get_by_role("button", name="Search", exact=True))
+
+    @property
+    def show_desktop_button(self):
+        return self._get("show desktop button", lambda page: page.get_by_role("button", name="Show desktop"))
+
+    @property
+    def user_profile_button(self):
+        return self._get("user profile button",
+                         lambda page: page.get_by_role("toolbar", name="Taskbar").get_by_role("button", name="User profile"))
+
+    def window_button(self, key):
+        target = app(key)
+        name = re.compile(rf"^(Show {re.escape(target.title)}|{re.escape(target.title)} window)$")
+        return self._get(f"taskbar button {target.id}",
+                         lambda page: page.get_by_role("group", name="Open windows").get_by_role("button", name=name))
+
+    @action
+    async def open_start_menu(self):
+        await (await self._require(self.start_button)).click()
+        return StartMenu(self.page)
+
+
+class StartMenu(PageObject):
+
+    @property
+    def root(self):
+        return self._get("start menu", lambda page: page.get_by_role("dialog", name="Start Menu"))
+
+    def category(self, label):
+        return self._get(f"start menu category {label}",
+                         lambda page: page.get_by_role("dialog", name="Start Menu").get_by_role("button", name=label, exact=True))
+
+    def item(self, key):
+        target = app(key)
+        return self._get(f"start menu item {target.id}",
+                         lambda page: page.get_by_role("dialog", name="Start Menu").get_by_role("button", name=target.title, exact=True))
+
+    @action
+    async def launch(self, key):
+        await trace_step(f"open {app(key).id}")
+        await (await self._require(self.item(key))).click()
+        return window_for(self.page, key)
+
+
+class Window(PageObject):
+    """Chrome shared by every app window: title bar controls and content."""
+
+    def __init__(self, page, key):
+        super().__init__(page)
+        self.app = app(key)
+
+    def _part(self, part, build):
+        return self._get(f"window {self.app.id} {part}", build)
+
+    @property
+    def root(self):
+        return self._part("root", lambda page: page.get_by_test_id(f"window-{self.app.id}"))
+
+    @property
+    def title_bar(self):
+        return self._part("title bar", lambda page: self.root.get_by_role("banner"))
+
+    @property
+    def minimize_button(self):
+        return self._part("minimize", lambda page: self.root.get_by_role("button", name="Minimize window"))
+
+    @property
+    def maximize_button(self):
+        # Same button toggles between Maximize and Restore
+        return self._part("maximize", lambda page: self.root.get_by_role("button", name=re.compile(r"^(Maximize|Restore) window$")))
+
+    @property
+    def close_button(self):
+        return self._part("close", lambda page: self.root.get_by_role("button", name="Close window"))
+
+    @property
+    def content(self):
+        return self._part("content", lambda page: self.root.get_by_role("main"))
+
+    @action
+    async def minimize(self):
+        await (await self._require(self.minimize_button)).click()
+
+    @action
+    async def toggle_maximize(self):
+        await (await self._require(self.maximize_button)).click()
+
+    @action
+    async def close(self):
+        await (await self._require(self.close_button)).click()
+
+
+class SettingsWindow(Window):
+
+    def __init__(self, page, key="settings"):
+        super().__init__(page, key)
+
+    def tab(self, label):
+        return self._part(f"tab {label}",
+                          lambda page: self.content.get_by_role("navigation").get_by_role("button", name=label, exact=True))
+
+    def option(self, label):
+        """A theme, wallpaper or other choice button inside the current tab."""
+        # Outside the sidebar, which has a "System" tab next to the "System" theme
+        return self._part(f"option {label}",
+                          lambda page: self.content.get_by_role("button", name=label, exact=True)
+                          .and_(self.content.locator("button:not(nav *)")))
+
+
+class ContactWindow(Window):
+
+    def __init__(self, page, key="contact"):
+        super().__init__(page, key)
+
+    @property
+    def name_field(self):
+        return self._part("name", lambda page: self.content.get_by_label("Name"))
+
+    @property
+    def email_field(self):
+        return self._part("email", lambda page: self.content.get_by_label("Email"))
+
+    @property
+    def message_field(self):
+        return self._part("message", lambda page: self.content.get_by_label("Message"))
+
+    @property
+    def submit_button(self):
+        return self._part("submit", lambda page: self.content.get_by_role("button", name=re.compile(r"^(Send Message|Sending\.\.\.)$")))
+
+    @action
+    async def submit(self, name, email, message):
+        await (await self._require(self.name_field)).fill(name)
+        await (await self._require(self.email_field)).fill(email)
+        await (await self._require(self.message_field)).fill(message)
+        await (await self._require(self.submit_button)).click()
+
+
+class SystemSearch(PageObject):
+    """The search overlay opened from the taskbar or with Ctrl+K."""
+
+    @property
+    def input(self):
+        return self._get("search input", lambda page: page.get_by_placeholder("Search apps, files, and more..."))
+
+    def result(self, key):
+        """The search-result entry that opens ``key``'s app."""
+        target = app(key)
+        return self._get(f"search result {target.id}",
+                         lambda page: page.get_by_role("button")
+                         .filter(has=page.get_by_text(target.title, exact=True))
+                         .filter(has=page.get_by_text("Applications", exact=True)))
+
+    @action
+    async def search(self, query):
+        await (await self._require(self.input)).fill(query)
+
+    @action
+    async def open(self, key, query=None):
+        """Search for ``query`` (default: ``key``'s title) and open the app from its result."""
+        target = app(key)
+        await self.search(query or target.title)
+        await trace_step(f"open {target.id}")
+        await (await self._require(self.result(target.id))).click()
+        return window_for(self.page, target.id)
+
+
+class NotificationCenter(PageObject):
+
+    @property
+    def toggle_button(self):
+        return self._get("notifications toggle",
+                         lambda page: page.get_by_role("button", name=re.compile(r"^(Open|Close) notifications$")))
+
+    @property
+    def panel(self):
+        return self._get("notifications panel", lambda page: page.get_by_role("dialog", name="Notifications center"))
+
+
+WINDOW_CLASSES = {"settings": SettingsWindow, "contact": ContactWindow}
+
+
+def window_for(page, key):
+    """The page object for ``key``'s window, specialised where one exists."""
+    target = app(key)
+    return WINDOW_CLASSES.get(target.id, Window)(page, target.id)
@@ -0,0 +1,177 @@
+"""Sharded execution: a pool of worker processes, one browser per worker."""
+
+import asyncio
+import multiprocessing
+import os
+import queue
+
+from playwright import async_api
+
+from .browser import browser_source
+from .browser_server import free_port
+from .runner import run_test_case
+from .server import AppServer, stop_process_group, write_report
+from .suite import BASE_URL_ENV, app_url, format_error, make_result, timestamp
+from .waits import WaitLog
+
+# Rough resident size of one headless Chromium running the app, used to cap
+# the worker count on machines with many cores but little memory
+BROWSER_MEMORY_MB = 600
+
+
+def available_memory_mb():
+    """Memory the OS can hand out without swapping, or None if unknown."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def default_workers(num_cases):
+    """Pick a worker count from CPU count, free memory and suite size."""
+    workers = os.cpu_count() or 1
+    memory = available_memory_mb()
+    if memory is not None:
+        workers = min(workers, max(1, memory // BROWSER_MEMORY_MB))
+    return max(1, min(workers, num_cases))
+
+
+async def _work(tasks, results):
+    async with async_api.async_playwright() as pw:
+        source = browser_source(pw)
+        try:
+            while True:
+                case = tasks.get()
+                if case is None:
+                    break
+                result = await run_test_case(source, case)
+                result["worker"] = os.getpid()
+                result["baseUrl"] = app_url()
+                results.put(result)
+        finally:
+            await source.close()
+
+
+def _worker_main(tasks, results, servers, reports, own_server, build_seconds=None):
+    """Process entry point: own one browser and pull tests until told to stop.
+
+    With ``own_server`` the worker also starts its own app server on a free
+    port and points every test it runs at it. The parent has already built
+    the app, so the worker only serves it. The server's process group goes
+    on ``servers``, with this worker's pid, so that the parent can stop it
+    if this worker dies first, and its warm-up timings go on ``reports``.
+    """
+    if not own_server:
+        asyncio.run(_work(tasks, results))
+        return
+    with AppServer(free_port()) as server:
+        server.start(built=build_seconds, on_spawn=lambda pgid: servers.put((os.getpid(), pgid)))
+        reports.put(server.report())
+        os.environ[BASE_URL_ENV] = server.base_url
+        asyncio.run(_work(tasks, results))
+
+
+def run_parallel(cases, workers=None, on_result=None, server_per_worker=False, build_seconds=None):
+    """Run ``cases`` across ``workers`` processes and return the merged records.
+
+    Tests are pulled from a shared queue, so a worker that finishes early
+    picks up the next test instead of idling behind a fixed shard. If a worker
+    dies, the tests it never reported are recorded as failures.
+
+    With ``server_per_worker`` each worker runs its own ``next start`` on a
+    free port. Build first and pass the seconds it took as ``build_seconds``;
+    without them every worker checks the build itself. Different ports are
+    different origins, so workers never see each other's localStorage,
+    sessionStorage or saved Guest session, even on a shared warm browser.
+    The app keeps no state on the server, so that is all the isolation it
+    needs. Servers whose worker died are stopped here at the end, and the
+    servers' TTFB timings are written together to ``tmp/server/ttfb.json``.
+    """
+    cases = list(cases)
+    # More workers than tests would only start browsers and servers that idle
+    workers = min(workers or default_workers(len(cases)), len(cases))
+    ctx = multiprocessing.get_context("spawn")
+    tasks = ctx.Queue()
+    results = ctx.Queue()
+    servers = ctx.Queue()
+    reports = ctx.Queue()
+    for case in cases:
+        tasks.put(case)
+    for _ in range(workers):
+        tasks.put(None)
+
+    procs = [ctx.Process(target=_worker_main, daemon=True,
+                         args=(tasks, results, servers, reports, server_per_worker, build_seconds))
+             for _ in range(workers)]
+    collected = {}
+
+    def record(result):
+        collected[result["title"]] = result
+        if on_result:
+            on_result(result)
+
+    try:
+        for proc in procs:
+            proc.start()
+
+        while len(collected) < len(cases):
+            try:
+                result = results.get(timeout=1)
+            except queue.Empty:
+                if not any(proc.is_alive() for proc in procs):
+                    break
+                continue
+            record(result)
+
+        for proc in procs:
+            proc.join(timeout=10)
+        # A worker can put its last result and exit between the get() timing
+        # out and the liveness check above; pick those up now that all are done
+        while len(collected) < len(cases):
+            try:
+                record(results.get(timeout=1))
+            except queue.Empty:
+                break
+    finally:
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()
+                proc.join(timeout=10)
+        # A worker that died never stopped its server; its group outlives it.
+        # Workers that exited cleanly stopped theirs, and the group id may
+        # since have been reused, so those are left alone.
+        died = {proc.pid for proc in procs if proc.exitcode != 0}
+        while True:
+            try:
+                worker, pgid = servers.get_nowait()
+            except queue.Empty:
+                break
+            if worker in died:
+                stop_process_group(pgid)
+
+    if server_per_worker:
+        timings = []
+        while True:
+            try:
+                timings.append(reports.get_nowait())
+            except queue.Empty:
+                break
+        if timings:
+            write_report(sorted(timings, key=lambda report: report["baseUrl"]))
+
+    for case in cases:
+        if case.name not in collected:
+            now = timestamp()
+            error = format_error(RuntimeError("worker exited before reporting a result"))
+            collected[case.name] = make_result(case, "FAILED", error, now, now)
+            collected[case.name]["errorClass"] = "WorkerLost"
+            collected[case.name]["duration"] = 0.0
+            collected[case.name]["waits"] = WaitLog().summary()
+    return [collected[case.name] for case in cases]
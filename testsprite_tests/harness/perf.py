@@ -0,0 +1,227 @@
+"""Rendering-performance probe and the budgets tests are checked against.
+
+A probe is attached to a page before it navigates, so its observers see the
+whole page life. ``start()`` and ``stop()`` bracket the interaction being
+measured::
+
+    probe = await PerfProbe.attach(page)
+    await page.goto(app_url())
+    await probe.start()
+    ...  # open windows, drag, switch themes
+    metrics = await probe.stop("open apps")
+    check_budget("TC010", metrics)
+
+Between the two calls it collects
+
+* long tasks (PerformanceObserver ``longtask``) and the total blocking time
+  they add up to,
+* frame intervals from a requestAnimationFrame loop, and the frames that
+  overran the frame budget,
+* script, layout and style-recalc time from the CDP ``Performance`` domain,
+
+plus Largest Contentful Paint and Cumulative Layout Shift for the page so
+far. A probe measures one interval: ``stop()`` also detaches its CDP
+session. Budgets live in ``testsprite_tests/perf_budgets.json``, so tightening
+one is a reviewed change like any other.
+"""
+
+import contextvars
+import json
+import math
+
+from .suite import SUITE_DIR
+
+BUDGETS_PATH = SUITE_DIR / "perf_budgets.json"
+
+# 60Hz frame interval; a frame longer than FRAME_MS * DROPPED_FACTOR
+# means at least one frame was dropped
+FRAME_MS = 1000 / 60
+DROPPED_FACTOR = 1.5
+
+# Main-thread time beyond this per long task counts as blocking
+BLOCKING_THRESHOLD_MS = 50
+
+PERF_INIT_JS = """
+(() => {
+  const perf = window.__harnessPerf = {
+    longTasks: [], lcp: null, shifts: [], frames: null,
+  };
+  const observe = (type, callback) => {
+    try {
+      new PerformanceObserver(list => list.getEntries().forEach(callback))
+        .observe({ type, buffered: true });
+    } catch (e) { /* entry type not supported */ }
+  };
+  observe('longtask', e => perf.longTasks.push({ start: e.startTime, duration: e.duration }));
+  observe('largest-contentful-paint', e => { perf.lcp = e.startTime; });
+  observe('layout-shift', e => {
+    if (!e.hadRecentInput) perf.shifts.push({ start: e.startTime, value: e.value });
+  });
+
+  perf.startFrames = () => {
+    const frames = perf.frames = { start: performance.now(), times: [], running: true };
+    const tick = now => {
+      frames.times.push(now);
+      if (frames.running) requestAnimationFrame(tick);
+    };
+    requestAnimationFrame(tick);
+    return frames.start;
+  };
+  perf.stopFrames = () => {
+    const frames = perf.frames;
+    frames.running = false;
+    return { start: frames.start, end: performance.now(), times: frames.times };
+  };
+})();
+"""
+
+# CDP Performance.getMetrics counters reported as durations, in seconds
+CDP_DURATIONS = {
+    "ScriptDuration": "scriptMs",
+    "LayoutDuration": "layoutMs",
+    "RecalcStyleDuration": "styleMs",
+    "TaskDuration": "taskMs",
+}
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of ``values`` (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def cumulative_layout_shift(shifts):
+    """CLS as Chrome reports it: the worst session window of layout shifts.
+
+    A window closes after a 1s gap between shifts or once it spans 5s.
+    """
+    worst = current = 0.0
+    window_start = last = None
+    for shift in sorted(shifts, key=lambda s: s["start"]):
+        start = shift["start"]
+        if last is None or start - last > 1000 or start - window_start > 5000:
+            window_start, current = start, 0.0
+        current += shift["value"]
+        last = start
+        worst = max(worst, current)
+    return worst
+
+
+def frame_stats(times):
+    intervals = [b - a for a, b in zip(times, times[1:])]
+    dropped = sum(max(0, round(i / FRAME_MS) - 1) for i in intervals if i > FRAME_MS * DROPPED_FACTOR)
+    return {
+        "frames": len(intervals),
+        "droppedFrames": dropped,
+        "droppedFrameRatio": round(dropped / (len(intervals) + dropped), 3) if intervals else 0.0,
+        "p95FrameMs": round(percentile(intervals, 95), 1),
+        "maxFrameMs": round(max(intervals, default=0.0), 1),
+    }
+
+
+class PerfProbe:
+    """Performance counters for one page; see the module docstring."""
+
+    def __init__(self, page, cdp):
+        self.page = page
+        self.cdp = cdp
+        self._baseline = None
+
+    @classmethod
+    async def attach(cls, page):
+        """Install the observers on ``page``, ideally before it navigates.
+
+        On a page that is already loaded they are installed in place too;
+        buffered LCP and layout-shift entries are still picked up, earlier
+        long tasks are not.
+        """
+        await page.add_init_script(script=PERF_INIT_JS)
+        if page.url != "about:blank":
+            await page.evaluate(f"() => {{ if (!window.__harnessPerf) {PERF_INIT_JS} }}")
+        cdp = await page.context.new_cdp_session(page)
+        await cdp.send("Performance.enable")
+        return cls(page, cdp)
+
+    async def _cdp_metrics(self):
+        metrics = (await self.cdp.send("Performance.getMetrics"))["metrics"]
+        return {m["name"]: m["value"] for m in metrics}
+
+    async def start(self):
+        self._baseline = await self._cdp_metrics()
+        await self.page.evaluate("() => window.__harnessPerf.startFrames()")
+
+    async def stop(self, label=""):
+        """End the measured interval and return its metrics (also logged for the run)."""
+        try:
+            frames = await self.page.evaluate("() => window.__harnessPerf.stopFrames()")
+            counters = await self._cdp_metrics()
+            observed = await self.page.evaluate(
+                "() => ({ longTasks: window.__harnessPerf.longTasks, lcp: window.__harnessPerf.lcp,"
+                " shifts: window.__harnessPerf.shifts })")
+        finally:
+            await self.close()
+
+        start, end = frames["start"], frames["end"]
+        long_tasks = [t for t in observed["longTasks"] if start <= t["start"] < end]
+        metrics = {
+            "label": label,
+            "durationMs": round(end - start, 1),
+            "longTasks": len(long_tasks),
+            "longestTaskMs": round(max((t["duration"] for t in long_tasks), default=0.0), 1),
+            "totalBlockingTimeMs": round(sum(max(0.0, t["duration"] - BLOCKING_THRESHOLD_MS) for t in long_tasks), 1),
+            **frame_stats(frames["times"]),
+            "lcpMs": round(observed["lcp"], 1) if observed["lcp"] is not None else None,
+            "cls": round(cumulative_layout_shift(observed["shifts"]), 4),
+        }
+        for name, key in CDP_DURATIONS.items():
+            metrics[key] = round((counters.get(name, 0) - self._baseline.get(name, 0)) * 1000, 1)
+
+        log = _current_log.get()
+        if log is not None:
+            log.append(metrics)
+        return metrics
+
+    async def close(self):
+        """Detach the CDP session, which otherwise lives as long as the page."""
+        if self.cdp is not None:
+            cdp, self.cdp = self.cdp, None
+            await cdp.detach()
+
+
+_current_log = contextvars.ContextVar("perf_log", default=None)
+
+
+def start_perf_log():
+    """Begin collecting probe measurements for the current test and return the list."""
+    log = []
+    _current_log.set(log)
+    return log
+
+
+def load_budgets(path=BUDGETS_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def budget_violations(metrics, budget):
+    """``metric: value > limit`` for every metric over its budget."""
+    violations = []
+    for key, limit in budget.items():
+        value = metrics.get(key)
+        if value is not None and value > limit:
+            violations.append(f"{key} {value} > {limit}")
+    return violations
+
+
+def check_budget(name, metrics, budgets=None):
+    """Raise ``AssertionError`` if ``metrics`` exceed the budget stored for ``name``."""
+    budgets = budgets if budgets is not None else load_budgets()
+    if name not in budgets:
+        raise KeyError(f"no performance budget named {name!r} in {BUDGETS_PATH.name}")
+    violations = budget_violations(metrics, budgets[name])
+    if violations:
+        label = f" ({metrics['label']})" if metrics.get("label") else ""
+        raise AssertionError(f"performance budget {name}{label} exceeded: {'; '.join(violations)}")
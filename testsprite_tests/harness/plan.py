@@ -0,0 +1,135 @@
+"""Run ``testsprite_frontend_test_plan.json`` entries without generated scripts.
+
+Every plan step is resolved against the shared action library in
+:mod:`harness.steps` and executed as soon as it is resolved, so a plan
+streams one step at a time instead of being compiled into a TC script
+first. The first failed assertion, handler error or step with no library
+action ends the test; the remaining steps are reported as skipped.
+
+Plan entries run through the same runner as the scripts::
+
+    python -m harness --plan TC004
+"""
+
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from .steps import StepContext, library
+from .suite import PLAN_PATH, app_url, format_error, load_plan
+from .trace import trace_step
+
+# First-step wording of plans that start on the boot screen rather than the desktop
+UNAUTHENTICATED_HINTS = ("boot screen", "login")
+
+
+@dataclass
+class StepResult:
+    index: int
+    type: str
+    description: str
+    action: str = None
+    status: str = "PASSED"
+    error: str = ""
+    duration: float = 0.0
+
+
+async def execute(entry, context, steps=library, base_url=None):
+    """Run ``entry``'s steps in ``context``, yielding a :class:`StepResult` each.
+
+    Stops after the first step that does not pass.
+    """
+    ctx = StepContext(context, base_url=base_url or app_url())
+    for index, step in enumerate(entry["steps"], 1):
+        result = StepResult(index, step.get("type", "action"), step.get("description", ""))
+        resolved = steps.resolve(step)
+        if resolved is None:
+            result.status = "FAILED"
+            result.error = f"no library action matches {result.type} {result.description!r}"
+            yield result
+            return
+        handler, args = resolved
+        result.action = handler.name
+        await trace_step(f"{index}. {result.description}")
+        started = time.monotonic()
+        try:
+            await handler.handler(ctx, **args)
+        except Exception as exc:
+            result.status = "FAILED"
+            result.error = format_error(exc)
+        result.duration = round(time.monotonic() - started, 3)
+        yield result
+        if result.status != "PASSED":
+            return
+
+
+class PlanProgram:
+    """Stands in for a loaded TC module: exposes ``run_steps``, ``AUTHENTICATED`` and ``LEAN``."""
+
+    def __init__(self, entry, on_step=None):
+        self.entry = entry
+        self.on_step = on_step
+        self.step_results = []
+        self.AUTHENTICATED = not needs_login(entry)
+        self.LEAN = entry.get("lean", False)
+
+    async def run_steps(self, context):
+        failed = None
+        async for result in execute(self.entry, context):
+            self.step_results.append(asdict(result))
+            if self.on_step:
+                self.on_step(self.entry["id"], result)
+            if result.status != "PASSED":
+                failed = result
+        for step in self.entry["steps"][len(self.step_results):]:
+            skipped = StepResult(len(self.step_results) + 1, step.get("type", "action"),
+                                 step.get("description", ""), status="SKIPPED")
+            self.step_results.append(asdict(skipped))
+        if failed:
+            raise AssertionError(f"step {failed.index} ({failed.description}): {failed.error}")
+
+
+def needs_login(entry):
+    """Whether the plan walks through the boot screen itself."""
+    if "authenticated" in entry:
+        return not entry["authenticated"]
+    first = entry["steps"][0]["description"].lower() if entry.get("steps") else ""
+    return any(hint in first for hint in UNAUTHENTICATED_HINTS)
+
+
+@dataclass
+class PlanCase:
+    """A test plan entry run through the interpreter instead of its script."""
+
+    id: str
+    title: str
+    description: str
+    entry: dict
+    path: Path = PLAN_PATH
+    features: list = field(default_factory=list)
+
+    @property
+    def name(self):
+        return f"{self.id}-{self.title}"
+
+    def source(self):
+        return json.dumps(self.entry, indent=2)
+
+    def load(self):
+        return PlanProgram(self.entry)
+
+    @staticmethod
+    def needs_session(program):
+        return program.AUTHENTICATED
+
+
+def discover_plan(ids=None):
+    """Plan entries as :class:`PlanCase` objects, optionally filtered by id."""
+    wanted = {i.upper() for i in ids} if ids else None
+    return [
+        PlanCase(id=tc_id, title=entry["title"], description=entry.get("description", ""),
+                 entry=entry, features=entry.get("features", []))
+        for tc_id, entry in sorted(load_plan().items())
+        if wanted is None or tc_id in wanted
+    ]
@@ -0,0 +1,286 @@
+"""Local stand-in for the Resend email API, with injected latency and faults.
+
+``route.ts`` only calls ``resend.emails.send`` when ``RESEND_API_KEY`` is
+set. Otherwise it sleeps for 500ms and reports a simulated success, so the
+suite never sees a real send succeed slowly or fail. The Resend SDK reads
+``RESEND_BASE_URL`` when it loads. An app started with::
+
+    RESEND_API_KEY=re_harness_stub RESEND_BASE_URL=http://127.0.0.1:9500
+
+talks to this server instead. It answers ``POST /emails`` the way Resend
+does, after a delay drawn from a latency distribution, and with a
+configurable chance of
+
+* ``errors``: a 500 ``internal_server_error``,
+* ``rate-limit``: a 429 ``rate_limit_exceeded`` with ``retry-after``, or
+* ``hang``: no answer at all until the client gives up.
+
+A profile is a comma-separated spec::
+
+    python -m harness.resend_stub --profile "latency=lognormal:300:0.6,errors=0.1,rate-limit=0.05"
+
+Latency is a fixed ``MS``, a uniform range ``LO-HI``, ``lognormal:MEDIAN:SIGMA``
+or ``exp:MEAN``. ``--resend-stub PROFILE`` on ``python -m harness --serve``
+and on ``python -m harness.load --serve`` starts the stub and points the
+managed app server at it. :func:`set_profile` (``PUT /_stub/profile``)
+changes settings while the app is running, and ``GET /_stub/stats`` counts
+the outcomes.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import threading
+import urllib.request
+import uuid
+from dataclasses import asdict, dataclass
+
+log = logging.getLogger("harness.resend_stub")
+
+DEFAULT_PORT = 9500
+
+API_KEY = "re_harness_stub"
+
+# A hung request is dropped after this long even if the client is still waiting
+HANG_MAX_S = 300
+
+ERRORS = {
+    401: {"name": "missing_api_key", "message": "Missing API key in the authorization header."},
+    404: {"name": "not_found", "message": "The requested endpoint does not exist."},
+    429: {"name": "rate_limit_exceeded", "message": "Too many requests. You can only make 2 requests per second."},
+    500: {"name": "internal_server_error", "message": "An unexpected error occurred."},
+}
+REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+           429: "Too Many Requests", 500: "Internal Server Error"}
+
+# Spec keys and the FaultProfile fields they set
+SPEC_KEYS = {"latency": "latency", "errors": "error_rate", "rate-limit": "rate_limit_rate",
+             "hang": "hang_rate", "seed": "seed"}
+
+
+def latency_sampler(spec):
+    """A function of a ``random.Random`` returning a delay in ms, for ``spec``."""
+    kind, _, params = spec.partition(":")
+    try:
+        if kind == "lognormal":
+            median, sigma = (float(v) for v in params.split(":"))
+            return lambda rng: rng.lognormvariate(math.log(median), sigma)
+        if kind == "exp":
+            mean = float(params)
+            return lambda rng: rng.expovariate(1 / mean)
+        if "-" in spec:
+            low, high = (float(v) for v in spec.split("-"))
+            return lambda rng: rng.uniform(low, high)
+        fixed = float(spec)
+        return lambda rng: fixed
+    except ValueError:
+        raise ValueError(f"bad latency {spec!r}; use MS, LO-HI, lognormal:MEDIAN:SIGMA or exp:MEAN") from None
+
+
+@dataclass
+class FaultProfile:
+    latency: str = "0"
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    hang_rate: float = 0.0
+    seed: int = None
+
+    def __post_init__(self):
+        latency_sampler(self.latency)
+        for name in ("error_rate", "rate_limit_rate", "hang_rate"):
+            if not 0 <= getattr(self, name) <= 1:
+                raise ValueError(f"{name} must be between 0 and 1")
+
+    @classmethod
+    def parse(cls, spec):
+        """Build a profile from ``key=value,...``; see the module docstring."""
+        values = {}
+        for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+            key, _, value = item.partition("=")
+            if key not in SPEC_KEYS:
+                raise ValueError(f"unknown resend stub setting {key!r}; expected one of {', '.join(SPEC_KEYS)}")
+            name = SPEC_KEYS[key]
+            values[name] = value if name == "latency" else (int(value) if name == "seed" else float(value))
+        return cls(**values)
+
+    def outcome(self, rng):
+        """``"hang"``, ``429``, ``500`` or ``200`` for one request."""
+        draw = rng.random()
+        for outcome, share in (("hang", self.hang_rate), (429, self.rate_limit_rate), (500, self.error_rate)):
+            if draw < share:
+                return outcome
+            draw -= share
+        return 200
+
+
+class ResendStub:
+    def __init__(self, profile=None):
+        self.set_profile(profile or FaultProfile())
+        self.stats = {}
+        self.sent = []
+
+    def set_profile(self, profile):
+        self.profile = profile
+        self._rng = random.Random(profile.seed)
+        self._latency = latency_sampler(profile.latency)
+
+    def _count(self, outcome):
+        self.stats[str(outcome)] = self.stats.get(str(outcome), 0) + 1
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                response = await self._respond(method, path, headers, body, reader)
+                if response is None:  # hung until the client went away
+                    break
+                code, payload, extra = response
+                data = json.dumps(payload).encode()
+                head = "".join(f"{name}: {value}\r\n" for name, value in extra.items())
+                writer.write(
+                    f"HTTP/1.1 {code} {REASONS[code]}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n{head}\r\n".encode() + data)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        method, path, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+        return method, path, headers, body
+
+    async def _respond(self, method, path, headers, body, reader):
+        if (method, path) == ("GET", "/health"):
+            return 200, {"status": "ok", "profile": asdict(self.profile)}, {}
+        if (method, path) == ("GET", "/_stub/stats"):
+            return 200, {"outcomes": self.stats, "sent": len(self.sent)}, {}
+        if method in ("PUT", "POST") and path == "/_stub/profile":
+            try:
+                self.set_profile(FaultProfile(**{**asdict(self.profile), **json.loads(body or b"{}")}))
+            except (TypeError, ValueError) as exc:
+                return 400, {"error": str(exc)}, {}
+            log.info("profile now %s", self.profile)
+            return 200, asdict(self.profile), {}
+        if (method, path) != ("POST", "/emails"):
+            return 404, {"statusCode": 404, **ERRORS[404]}, {}
+        if not headers.get("authorization", "").startswith("Bearer "):
+            return 401, {"statusCode": 401, **ERRORS[401]}, {}
+
+        outcome = self.profile.outcome(self._rng)
+        self._count(outcome)
+        if outcome == "hang":
+            try:
+                await asyncio.wait_for(reader.read(), HANG_MAX_S)
+            except asyncio.TimeoutError:
+                pass
+            return None
+        await asyncio.sleep(self._latency(self._rng) / 1000)
+        if outcome == 429:
+            return 429, {"statusCode": 429, **ERRORS[429]}, {
+                "retry-after": "1", "ratelimit-limit": "2", "ratelimit-remaining": "0", "ratelimit-reset": "1"}
+        if outcome == 500:
+            return 500, {"statusCode": 500, **ERRORS[500]}, {}
+        message = json.loads(body or b"{}")
+        self.sent.append({"to": message.get("to"), "subject": message.get("subject")})
+        return 200, {"id": str(uuid.uuid4())}, {}
+
+
+async def serve(port=DEFAULT_PORT, profile=None, started=None):
+    stub = ResendStub(profile)
+    listener = await asyncio.start_server(stub.handle, "127.0.0.1", port)
+    port = listener.sockets[0].getsockname()[1]
+    log.info("resend stub on http://127.0.0.1:%d with %s", port, stub.profile)
+    if started is not None:
+        started(port)
+    async with listener:
+        await listener.serve_forever()
+
+
+class BackgroundStub:
+    """The stub on its own event loop in a daemon thread, for synchronous callers."""
+
+    def __init__(self, profile=None, port=0):
+        self.profile = profile
+        self.port = port
+        self._loop = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def app_env(self):
+        """Environment that points the app's Resend SDK at this stub."""
+        return {"RESEND_API_KEY": API_KEY, "RESEND_BASE_URL": self.url}
+
+    def start(self):
+        def run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(serve(self.port, self.profile, self._started))
+            except asyncio.CancelledError:
+                pass
+
+        threading.Thread(target=run, name="resend-stub", daemon=True).start()
+        if not self._ready.wait(10):
+            raise RuntimeError("resend stub did not start")
+        return self
+
+    def _started(self, port):
+        self.port = port
+        self._ready.set()
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(lambda: [task.cancel() for task in asyncio.all_tasks(self._loop)])
+
+
+def get_profile(url):
+    """Settings of the running stub at ``url``."""
+    with urllib.request.urlopen(url.rstrip("/") + "/health", timeout=5) as response:
+        return json.load(response)["profile"]
+
+
+def set_profile(url, **settings):
+    """Change settings of the running stub at ``url``; the others keep their values."""
+    request = urllib.request.Request(url.rstrip("/") + "/_stub/profile", method="PUT",
+                                     data=json.dumps(settings).encode())
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.load(response)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="harness.resend_stub", description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--profile", default="", help="faults to inject, e.g. 'latency=100-900,errors=0.1'")
+    args = parser.parse_args(argv)
+    profile = FaultProfile.parse(args.profile)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    print(f"start the app with RESEND_API_KEY={API_KEY} RESEND_BASE_URL=http://127.0.0.1:{args.port}", flush=True)
+    try:
+        asyncio.run(serve(args.port, profile))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Run many TC scripts in one event loop against one shared browser."""
+
+import time
+
+from playwright import async_api
+
+from .actions import start_action_log, timed_context
+from .auth import ensure_session, new_session_context
+from .browser import browser_source, new_context
+from .lean import LEAN_CONTEXT_OPTIONS, install_lean_mode, is_lean
+from .network import start_network_log
+from .perf import start_perf_log
+from .suite import format_error, make_result, timestamp
+from .trace import raw_trace_path, start_trace
+from .waits import start_wait_log
+
+
+async def run_case(browser, case):
+    """Run one test in a fresh context of ``browser`` and return its record."""
+    created = timestamp()
+    status, error, error_class = "PASSED", "", None
+    context = module = lean = lean_error = tracer = None
+    waits = start_wait_log()
+    actions = start_action_log(case.name)
+    network = start_network_log()
+    perf = start_perf_log()
+    try:
+        module = case.load()
+        options = LEAN_CONTEXT_OPTIONS if is_lean(module) else {}
+        if case.needs_session(module):
+            context = await new_session_context(browser, await ensure_session(browser), **options)
+        else:
+            context = await new_context(browser, **options)
+        if is_lean(module):
+            lean = await install_lean_mode(context)
+        tracer = await start_trace(browser)
+        await module.run_steps(timed_context(context))
+    except Exception as exc:
+        status, error, error_class = "FAILED", format_error(exc), type(exc).__name__
+    finally:
+        if tracer:
+            try:
+                trace = await tracer.stop(raw_trace_path(case.name))
+            except Exception as exc:
+                trace = {"error": format_error(exc)}
+        if context:
+            if lean:
+                try:
+                    await lean.collect(context)
+                except Exception as exc:
+                    lean_error = format_error(exc)
+            try:
+                await context.close()
+            except async_api.Error:
+                pass
+        actions.close()
+    result = make_result(case, status, error, created, timestamp())
+    if error_class:
+        result["errorClass"] = error_class
+    result["waits"] = waits.summary()
+    result["network"] = network.summary()
+    result["actions"] = actions.summary()
+    if lean:
+        result["lean"] = lean.summary()
+        if lean_error:
+            result["lean"]["error"] = lean_error
+    if perf:
+        result["perf"] = perf
+    if tracer:
+        result["trace"] = trace
+    steps = getattr(module, "step_results", None)
+    if steps is not None:
+        result["steps"] = steps
+    return result
+
+
+async def run_test_case(source, case):
+    """Take a browser from ``source``, run ``case`` on it and time the run."""
+    started = time.monotonic()
+    browser = await source.get()
+    try:
+        result = await run_case(browser, case)
+    finally:
+        await source.release(browser)
+    result["duration"] = round(time.monotonic() - started, 3)
+    return result
+
+
+async def run_suite(cases, on_result=None):
+    """Run ``cases`` one after another with a single driver and browser.
+
+    A browser that died during a test is relaunched before the next one so
+    that one crash does not fail the rest of the run.
+    """
+    results = []
+    async with async_api.async_playwright() as pw:
+        source = browser_source(pw)
+        try:
+            for case in cases:
+                result = await run_test_case(source, case)
+                results.append(result)
+                if on_result:
+                    on_result(result)
+        finally:
+            await source.close()
+    return results
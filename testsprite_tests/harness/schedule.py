@@ -0,0 +1,180 @@
+"""Order tests longest-expected-first so no worker ends the run alone.
+
+Workers pull tests from a shared queue. If the longest test is queued last,
+one worker can still be running it after the others have gone idle.
+:func:`plan_schedule` puts the tests in order of expected duration, longest
+first (LPT). Each idle worker then takes the longest test left, which is
+the LPT rule carried out live, so a test that overruns its estimate only
+delays whichever worker has it.
+
+A test's expected duration is the median of its last ``ESTIMATE_RUNS``
+uncached passing runs in ``tmp/history.sqlite``. Failed runs are left out,
+since a failure stops the test early, and so are the 0s records of tests
+whose worker was lost. Runs of its current script count first, and other
+runs are used only when there are none. A test with no
+history is estimated from the number of steps in its test plan entry,
+times the seconds per step that the tests with a history take.
+
+The schedule predicts a makespan: the wall time of the run if every
+estimate is right. :func:`compare` sets that against the actual run, and
+``python -m harness`` saves both to ``tmp/schedule.json``. The actual
+makespan covers the scheduled first attempts, which is what the prediction
+is for. Retries of flaky tests run after them, so the wall time including
+the retries is saved separately. To see the
+schedule without running anything::
+
+    python -m harness.schedule -j 4
+"""
+
+import argparse
+import contextlib
+import heapq
+import json
+import statistics
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+
+from .history import HISTORY_PATH, connect, script_hash, test_runs
+from .suite import TMP_DIR, discover, load_plan
+
+SCHEDULE_PATH = TMP_DIR / "schedule.json"
+
+# Recent runs whose median is a test's estimate
+ESTIMATE_RUNS = 10
+
+# Seconds per plan step when no test has a history to calibrate against
+DEFAULT_STEP_S = 5.0
+
+
+@dataclass
+class Estimate:
+    seconds: float
+    source: str  # "history" or "steps"
+    runs: int = 0
+
+
+def plan_steps(case):
+    """Number of steps in ``case``'s test plan entry."""
+    entry = getattr(case, "entry", None) or load_plan().get(case.id, {})
+    return max(1, len(entry.get("steps", [])))
+
+
+def estimate_durations(cases, path=HISTORY_PATH):
+    """``{test: Estimate}`` for ``cases`` from their history, or from their step count."""
+    estimates = {}
+    if path.exists():
+        with contextlib.closing(connect(path)) as conn:
+            for case in cases:
+                rows = [row for row in test_runs(conn, case.name, ESTIMATE_RUNS * 3)
+                        if row["status"] == "PASSED" and row["duration_ms"]]
+                current = [row for row in rows if row["script_hash"] == script_hash(case.source())]
+                rows = (current or rows)[-ESTIMATE_RUNS:]
+                if rows:
+                    median = statistics.median(row["duration_ms"] for row in rows) / 1000
+                    estimates[case.name] = Estimate(round(median, 2), "history", len(rows))
+
+    steps = {case.name: plan_steps(case) for case in cases}
+    known = [name for name in estimates if name in steps]
+    per_step = (sum(estimates[name].seconds for name in known) / sum(steps[name] for name in known)
+                if known else DEFAULT_STEP_S)
+    for case in cases:
+        if case.name not in estimates:
+            estimates[case.name] = Estimate(round(steps[case.name] * per_step, 2), "steps")
+    return estimates
+
+
+def lpt(cases, estimates, workers):
+    """Longest-first list schedule: ``(ordered cases, per-worker test names, predicted makespan)``."""
+    ordered = sorted(cases, key=lambda case: (-estimates[case.name].seconds, case.name))
+    loads = [(0.0, index) for index in range(max(1, workers))]
+    assigned = [[] for _ in loads]
+    for case in ordered:
+        load, index = heapq.heappop(loads)
+        assigned[index].append(case.name)
+        heapq.heappush(loads, (load + estimates[case.name].seconds, index))
+    return ordered, assigned, max(load for load, _ in loads)
+
+
+def plan_schedule(cases, workers, path=HISTORY_PATH):
+    """Order ``cases`` for ``workers`` and describe the prediction."""
+    estimates = estimate_durations(cases, path)
+    ordered, assigned, makespan = lpt(cases, estimates, workers)
+    total = sum(estimate.seconds for estimate in estimates.values())
+    return ordered, {
+        "workers": len(assigned),
+        "predictedMakespanS": round(makespan, 2),
+        # No schedule can beat the longest test or an even split of the work
+        "lowerBoundS": round(max(total / len(assigned), max((e.seconds for e in estimates.values()), default=0)), 2),
+        "order": [{"test": case.name, "estimateS": estimates[case.name].seconds,
+                   "source": estimates[case.name].source, "runs": estimates[case.name].runs} for case in ordered],
+        "assignment": assigned,
+    }
+
+
+def _ran(result):
+    # A WorkerLost record is stamped when the pool gives up on the test, not
+    # when it ran, so its times and zero duration say nothing about the run
+    return result.get("errorClass") != "WorkerLost"
+
+
+def actual_makespan(results):
+    """Seconds from the first test starting to the last one finishing."""
+    times = [(datetime.fromisoformat(r["created"].replace("Z", "+00:00")),
+              datetime.fromisoformat(r["modified"].replace("Z", "+00:00"))) for r in results if _ran(r)]
+    return (max(end for _, end in times) - min(start for start, _ in times)).total_seconds() if times else 0.0
+
+
+def compare(schedule, results, final=None):
+    """Add the actual makespan and per-test durations of ``results`` to ``schedule``.
+
+    ``results`` are the first attempts. ``final`` are the records after any
+    retries; if some were retried, the makespan including them is added too.
+    """
+    actual = {result["title"]: result.get("duration") for result in results if _ran(result)}
+    for item in schedule["order"]:
+        item["actualS"] = actual.get(item["test"])
+    schedule["actualMakespanS"] = round(actual_makespan(results), 2)
+    retried = [result for result in final or () if result.get("retries")]
+    if retried:
+        schedule["retried"] = len(retried)
+        schedule["withRetriesS"] = round(actual_makespan(results + retried), 2)
+    return schedule
+
+
+def write_schedule(schedule, path=SCHEDULE_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(schedule, indent=2) + "\n", encoding="utf-8")
+
+
+def describe(schedule):
+    line = (f"schedule: {schedule['workers']} worker(s), predicted makespan {schedule['predictedMakespanS']:.1f}s "
+            f"(lower bound {schedule['lowerBoundS']:.1f}s)")
+    if "actualMakespanS" in schedule:
+        line += f", actual {schedule['actualMakespanS']:.1f}s"
+    if "withRetriesS" in schedule:
+        line += f" ({schedule['withRetriesS']:.1f}s with {schedule['retried']} retried)"
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="harness.schedule", description=__doc__.split("\n", 1)[0])
+    parser.add_argument("ids", nargs="*", help="TC ids to schedule (default: all)")
+    parser.add_argument("-j", "--workers", type=int, default=1)
+    args = parser.parse_args(argv)
+    cases = discover(args.ids)
+    if not cases:
+        parser.error("no matching TC scripts found")
+
+    _, schedule = plan_schedule(cases, args.workers)
+    for item in schedule["order"]:
+        origin = f"median of {item['runs']} runs" if item["source"] == "history" else "from plan steps"
+        print(f"{item['estimateS']:>8.1f}s  {item['test']}  ({origin})")
+    for index, names in enumerate(schedule["assignment"]):
+        print(f"worker {index}: {', '.join(name.split('-', 1)[0] for name in names)}")
+    print(describe(schedule))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
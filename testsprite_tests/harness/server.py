@@ -0,0 +1,275 @@
+"""Build, start and tear down the Next.js app the tests run against.
+
+With ``python -m harness --serve`` the suite owns the app server instead of
+assuming something already listens on ``localhost:3000``:
+
+1. ``npm run build`` runs only when ``.next/BUILD_ID`` is missing or older
+   than the app sources and config,
+2. ``next start`` serves the production build on the requested port,
+3. the server is polled until it answers, and ``/`` and ``/api/contact``
+   are requested before the first test so route loading happens here and
+   not inside a test's timeouts,
+4. the whole process group is stopped when the run ends.
+
+Time to first byte is measured for the first (cold) and second (warm)
+request to each route and written to ``tmp/server/ttfb.json``.
+
+A dev server compiles every route on first request (4s for ``/`` in
+``dev-server-output.log``), so the managed server always uses a production
+build.
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from .suite import REPO_ROOT, TMP_DIR
+
+log = logging.getLogger("harness.server")
+
+SERVER_DIR = TMP_DIR / "server"
+TTFB_PATH = SERVER_DIR / "ttfb.json"
+
+DEFAULT_PORT = 3000
+READY_TIMEOUT_S = 60
+STOP_TIMEOUT_S = 10
+
+# Anything newer than the last build under these paths triggers a rebuild
+BUILD_INPUTS = [
+    "src",
+    "public",
+    "package.json",
+    "package-lock.json",
+    "next.config.js",
+    "tailwind.config.ts",
+    "postcss.config.mjs",
+    "tsconfig.json",
+]
+
+# Requests made before the first test; an invalid contact payload loads the
+# route and its validation without sending anything
+PREWARM = [
+    ("GET", "/", None),
+    ("POST", "/api/contact", b"{}"),
+]
+
+NPM = "npm.cmd" if sys.platform == "win32" else "npm"
+NPX = "npx.cmd" if sys.platform == "win32" else "npx"
+
+
+def _newest_mtime(path):
+    if path.is_file():
+        return path.stat().st_mtime
+    newest = 0.0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            newest = max(newest, os.stat(os.path.join(root, name)).st_mtime)
+    return newest
+
+
+def build_is_stale(root=REPO_ROOT):
+    """Whether ``.next`` is missing or older than any build input."""
+    build_id = root / ".next" / "BUILD_ID"
+    if not build_id.is_file():
+        return True
+    built = build_id.stat().st_mtime
+    return any(_newest_mtime(root / name) > built for name in BUILD_INPUTS if (root / name).exists())
+
+
+def build(root=REPO_ROOT, force=False):
+    """Run ``npm run build`` if needed; return the seconds it took (0 if skipped)."""
+    if not force and not build_is_stale(root):
+        log.info("production build is up to date")
+        return 0.0
+    SERVER_DIR.mkdir(parents=True, exist_ok=True)
+    started = time.monotonic()
+    log.info("building the app (log in %s)", SERVER_DIR / "build.log")
+    with open(SERVER_DIR / "build.log", "w", encoding="utf-8") as out:
+        result = subprocess.run([NPM, "run", "build"], cwd=root, stdout=out, stderr=subprocess.STDOUT)
+    if result.returncode != 0:
+        raise RuntimeError(f"npm run build failed with exit code {result.returncode}; see {SERVER_DIR / 'build.log'}")
+    return time.monotonic() - started
+
+
+def time_to_first_byte(base_url, method="GET", path="/", body=None, timeout=30):
+    """Return ``(status, ms until the response headers arrived)`` for one request."""
+    url = urlsplit(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=timeout)
+    try:
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        started = time.perf_counter()
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        ttfb = (time.perf_counter() - started) * 1000
+        response.read()
+        return response.status, round(ttfb, 1)
+    finally:
+        conn.close()
+
+
+def port_in_use(port, host="127.0.0.1"):
+    try:
+        time_to_first_byte(f"http://{host}:{port}", timeout=1)
+        return True
+    except http.client.HTTPException:
+        # Something answered, just not with HTTP
+        return True
+    except OSError:
+        return False
+
+
+class AppServer:
+    """One ``next start`` process serving the production build."""
+
+    def __init__(self, port=DEFAULT_PORT, root=REPO_ROOT, env=None):
+        self.port = port
+        self.root = root
+        self.env = env or {}
+        self.process = None
+        self._log = None
+        self.build_seconds = 0.0
+        self.ttfb = {}
+
+    @property
+    def base_url(self):
+        return f"http://localhost:{self.port}"
+
+    def start(self, rebuild=False, built=None, on_spawn=None):
+        """Build if needed and serve; ``built`` is the seconds a build already run elsewhere took.
+
+        ``on_spawn(pid)`` is called as soon as ``next start`` exists, before
+        it is ready, with the id of its process group.
+        """
+        if port_in_use(self.port):
+            raise RuntimeError(f"port {self.port} is already serving something; stop it or pick another port")
+        self.build_seconds = build(self.root, force=rebuild) if built is None else built
+        SERVER_DIR.mkdir(parents=True, exist_ok=True)
+        self._log = open(SERVER_DIR / f"next-{self.port}.log", "w", encoding="utf-8")
+        # Own process group, so stopping it also stops the node child npx spawns
+        kwargs = ({"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP} if sys.platform == "win32"
+                  else {"start_new_session": True})
+        self.process = subprocess.Popen(
+            [NPX, "next", "start", "-p", str(self.port)],
+            cwd=self.root,
+            env={**os.environ, **self.env, "PORT": str(self.port)},
+            stdout=self._log,
+            stderr=subprocess.STDOUT,
+            **kwargs,
+        )
+        if on_spawn:
+            on_spawn(self.process.pid)
+        try:
+            self.wait_ready()
+            self.prewarm()
+        except BaseException:
+            self.stop()
+            raise
+        return self
+
+    def wait_ready(self, timeout=READY_TIMEOUT_S):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"next start exited with code {self.process.returncode}; "
+                                   f"see {SERVER_DIR / f'next-{self.port}.log'}")
+            try:
+                status, _ = time_to_first_byte(self.base_url, "HEAD", "/_next/static/not-found", timeout=2)
+                if status < 500:
+                    return
+            except (OSError, http.client.HTTPException):
+                # Not listening yet, or closed the connection mid-startup
+                pass
+            time.sleep(0.2)
+        raise RuntimeError(f"app server on port {self.port} not ready after {timeout}s")
+
+    def prewarm(self):
+        """Request each warm-up route twice, recording cold and warm TTFB."""
+        for method, path, body in PREWARM:
+            status, cold = time_to_first_byte(self.base_url, method, path, body)
+            _, warm = time_to_first_byte(self.base_url, method, path, body)
+            self.ttfb[f"{method} {path}"] = {"status": status, "coldMs": cold, "warmMs": warm}
+            log.info("%s %s: %d, cold %.0fms, warm %.0fms", method, path, status, cold, warm)
+
+    def report(self):
+        return {"baseUrl": self.base_url, "buildSeconds": round(self.build_seconds, 1), "ttfb": self.ttfb}
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self._terminate()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _terminate(self):
+        if sys.platform == "win32":
+            self.process.send_signal(signal.CTRL_BREAK_EVENT)
+        else:
+            os.killpg(self.process.pid, signal.SIGTERM)
+        try:
+            self.process.wait(timeout=STOP_TIMEOUT_S)
+        except subprocess.TimeoutExpired:
+            if sys.platform == "win32":
+                self.process.kill()
+            else:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def stop_process_group(pid, timeout=STOP_TIMEOUT_S):
+    """Stop the server group ``pid`` from outside the process that started it.
+
+    For a server whose owner died before it could stop it; a group that
+    has already exited is left alone.
+    """
+    if sys.platform == "win32":
+        subprocess.run(["taskkill", "/PID", str(pid), "/T", "/F"], capture_output=True)
+        return
+    try:
+        os.killpg(pid, signal.SIGTERM)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.1)
+            os.killpg(pid, 0)
+        log.warning("server group %d ignored SIGTERM, killing it", pid)
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def write_report(reports, path=TTFB_PATH):
+    """Write :meth:`AppServer.report` results, one per server, as one JSON list."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(list(reports), indent=2) + "\n", encoding="utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="harness.server", description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--rebuild", action="store_true", help="build even if .next looks up to date")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    with AppServer(args.port) as server:
+        server.start(rebuild=args.rebuild)
+        write_report([server.report()])
+        print(f"serving {server.base_url}; Ctrl+C to stop", flush=True)
+        try:
+            server.process.wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,722 @@
+"""Shared action library that the plan interpreter resolves steps against.
+
+Each handler is registered with the step descriptions it implements, as a
+regular expression searched case-insensitively in the plan's
+``description``. Named groups become keyword arguments, so::
+
+    @library.step(r"open (?P<app>.+?) application$")
+    async def open_app(ctx, app): ...
+
+handles "Open Settings application". A plan step can also name a handler
+outright with ``"action": "open_app", "args": {"app": "contact"}``, which
+wins over description matching.
+
+Handlers share one :class:`StepContext` per test, which carries the page and
+whatever earlier steps measured for later assertions to check. Assertions
+raise ``AssertionError``; anything else a handler raises is an error.
+"""
+
+import asyncio
+import os
+import re
+from dataclasses import dataclass, field
+
+from .actions import expect
+from .assertions import expect_all_visible
+from .bench_drag import drag as drag_continuously
+from .pages import APPS, ContactWindow, Desktop, LoginScreen, NotificationCenter, SettingsWindow, Taskbar, app, window_for
+from .perf import PerfProbe, check_budget
+from .resend_stub import get_profile, set_profile
+from .suite import app_url
+from .waits import settle
+
+VIEWPORTS = {
+    "desktop": {"width": 1280, "height": 720},
+    "tablet": {"width": 768, "height": 1024},
+    "mobile": {"width": 390, "height": 844},
+}
+
+# How far drag steps move an icon or window, and how much resize steps grow one
+DRAG_OFFSET = (120, 80)
+RESIZE_OFFSET = (80, 60)
+
+# Box comparisons allow for sub-pixel rounding and framer-motion settling
+POSITION_TOLERANCE_PX = 4
+
+VALID_CONTACT = {
+    "name": "Plan Runner",
+    "email": "plan.runner@example.com",
+    "message": "Sent by the test plan interpreter.",
+}
+
+BOOT_TIMEOUT_MS = 15000
+
+
+@dataclass
+class StepContext:
+    """State shared by the steps of one plan entry."""
+
+    context: object
+    page: object = None
+    base_url: str = field(default_factory=app_url)
+    vars: dict = field(default_factory=dict)
+    errors: list = field(default_factory=list)
+
+    async def ensure_page(self):
+        """The test's page, opened on the desktop if no step has navigated yet."""
+        if self.page is None:
+            self.page = await self.context.new_page()
+            self.page.on("pageerror", lambda exc: self.errors.append(str(exc)))
+        if self.page.url == "about:blank":
+            await self.page.goto(self.base_url, timeout=10000)
+            await self.page.wait_for_load_state("domcontentloaded")
+            await settle(self.page)
+        return self.page
+
+
+@dataclass
+class Step:
+    name: str
+    kind: str
+    patterns: list
+    handler: object
+
+
+class StepLibrary:
+    """Registry of step handlers keyed by name and description patterns."""
+
+    def __init__(self):
+        self._steps = {}
+
+    def _register(self, kind, patterns):
+        def decorator(handler):
+            compiled = [re.compile(p, re.IGNORECASE) for p in patterns]
+            self._steps[handler.__name__] = Step(handler.__name__, kind, compiled, handler)
+            return handler
+        return decorator
+
+    def step(self, *patterns):
+        """Register an action handler for descriptions matching ``patterns``."""
+        return self._register("action", patterns)
+
+    def check(self, *patterns):
+        """Register an assertion handler for descriptions matching ``patterns``."""
+        return self._register("assertion", patterns)
+
+    def names(self):
+        return sorted(self._steps)
+
+    def resolve(self, entry):
+        """Return ``(Step, kwargs)`` for a plan step, or None if nothing matches."""
+        if "action" in entry:
+            step = self._steps.get(entry["action"])
+            return (step, dict(entry.get("args", {}))) if step else None
+        description = entry.get("description", "").strip().rstrip(".")
+        kind = entry.get("type")
+        for step in self._steps.values():
+            if kind and step.kind != kind:
+                continue
+            for pattern in step.patterns:
+                match = pattern.search(description)
+                if match:
+                    args = {k: v for k, v in match.groupdict().items() if v is not None}
+                    return step, args
+        return None
+
+
+library = StepLibrary()
+
+
+def find_app(name):
+    """Resolve a plan's loose app name ("Settings", "Contact") to an app."""
+    name = name.strip().strip('"').lower()
+    for candidate in APPS.values():
+        if name in (candidate.id.lower(), candidate.title.lower()):
+            return candidate
+    for candidate in APPS.values():
+        if candidate.title.lower().startswith(name):
+            return candidate
+    return app(name)
+
+
+def _close(a, b):
+    return abs(a - b) <= POSITION_TOLERANCE_PX
+
+
+async def _box(locator):
+    box = await locator.bounding_box()
+    if box is None:
+        raise AssertionError("element has no bounding box (hidden or detached)")
+    return box
+
+
+async def _drag(page, locator, dx, dy, anchor=None):
+    """Drag ``locator`` by ``(dx, dy)`` from its centre or from ``anchor``."""
+    box = await _box(locator)
+    x, y = anchor(box) if anchor else (box["x"] + box["width"] / 2, box["y"] + box["height"] / 2)
+    await page.mouse.move(x, y)
+    await page.mouse.down()
+    await page.mouse.move(x + dx, y + dy, steps=10)
+    await page.mouse.up()
+    await settle(page)
+
+
+async def _open(ctx, key):
+    page = await ctx.ensure_page()
+    target = find_app(key)
+    window = window_for(page, target.id)
+    if not await window.root.is_visible():
+        await settle(page, Desktop(page).icon(target.id))
+        await Desktop(page).icon(target.id).dblclick()
+    await settle(page, window.root)
+    await expect(window.root).to_be_visible()
+    ctx.vars["window"] = window
+    ctx.vars.setdefault("opened", []).append(target.id)
+    return window
+
+
+def _window(ctx):
+    window = ctx.vars.get("window")
+    if window is None:
+        raise RuntimeError("no application window has been opened by an earlier step")
+    return window
+
+
+# Boot and login
+
+@library.step(r"navigate to .*boot screen")
+async def open_boot_screen(ctx):
+    page = await ctx.ensure_page()
+    await expect(LoginScreen(page).password_input).to_be_visible(timeout=BOOT_TIMEOUT_MS)
+
+
+@library.step(r"enter .*login input")
+async def enter_login(ctx, password="guest"):
+    page = await ctx.ensure_page()
+    await LoginScreen(page).password_input.fill(password)
+
+
+async def _wait_for_desktop(page):
+    await page.locator("html[data-window-state='loaded']").wait_for(state="attached", timeout=BOOT_TIMEOUT_MS)
+
+
+@library.step(r"submit (?:the )?login form")
+async def submit_login(ctx):
+    page = await ctx.ensure_page()
+    await LoginScreen(page).login_button.click()
+    await _wait_for_desktop(page)
+
+
+@library.step(r"^select guest access|click (?:the )?guest button")
+async def login_as_guest(ctx):
+    page = await ctx.ensure_page()
+    await LoginScreen(page).guest_button.click()
+    await _wait_for_desktop(page)
+
+
+@library.check(r"desktop environment is loaded|full os interface")
+async def check_desktop(ctx):
+    page = await ctx.ensure_page()
+    await expect(Taskbar(page).root).to_be_visible()
+    await expect_all_visible(page, selectors=[f"[data-testid='desktop-icon-{key}']" for key in APPS])
+
+
+# Viewports
+
+@library.step(r"open portfolioos on (?P<viewport>desktop|tablet|mobile) viewport",
+              r"resize viewport to (?P<viewport>desktop|tablet|mobile)")
+async def set_viewport(ctx, viewport):
+    page = await ctx.ensure_page()
+    await page.set_viewport_size(VIEWPORTS[viewport.lower()])
+    await settle(page)
+
+
+# Desktop icons
+
+@library.step(r"locate a desktop icon")
+async def locate_icon(ctx, app=None):
+    page = await ctx.ensure_page()
+    target = find_app(app) if app else next(iter(APPS.values()))
+    icon = Desktop(page).icon(target.id)
+    await settle(page, icon)
+    await expect(icon).to_be_visible()
+    ctx.vars["icon"] = target.id
+
+
+@library.step(r"drag the icon to a new position")
+async def drag_icon(ctx):
+    page = await ctx.ensure_page()
+    icon = Desktop(page).icon(ctx.vars["icon"])
+    before = await _box(icon)
+    await _drag(page, icon, *DRAG_OFFSET)
+    ctx.vars["icon_boxes"] = {ctx.vars["icon"]: (before, await _box(icon))}
+
+
+@library.step(r"rearrange multiple desktop icons")
+async def rearrange_icons(ctx, count=3):
+    page = await ctx.ensure_page()
+    boxes = {}
+    for key in list(APPS)[:int(count)]:
+        icon = Desktop(page).icon(key)
+        await settle(page, icon)
+        before = await _box(icon)
+        await _drag(page, icon, *DRAG_OFFSET)
+        boxes[key] = (before, await _box(icon))
+    ctx.vars["icon_boxes"] = boxes
+
+
+async def _saved_icons(page):
+    saved = await page.evaluate("() => JSON.parse(localStorage.getItem('retrofolio-icons-v2') || '[]')")
+    return {icon["id"]: icon for icon in saved}
+
+
+@library.check(r"icon position is updated and persisted")
+async def check_icon_moved(ctx):
+    page = await ctx.ensure_page()
+    saved = await _saved_icons(page)
+    for key, (before, after) in ctx.vars["icon_boxes"].items():
+        assert not (_close(before["x"], after["x"]) and _close(before["y"], after["y"])), f"icon {key} did not move"
+        assert key in saved, f"icon {key} position was not saved to localStorage"
+
+
+@library.check(r"desktop icons are shown in the rearranged positions")
+async def check_icons_restored(ctx):
+    page = await ctx.ensure_page()
+    for key, (_, after) in ctx.vars["icon_boxes"].items():
+        icon = Desktop(page).icon(key)
+        await settle(page, icon)
+        box = await _box(icon)
+        assert _close(box["x"], after["x"]) and _close(box["y"], after["y"]), \
+            f"icon {key} at ({box['x']:.0f}, {box['y']:.0f}), expected ({after['x']:.0f}, {after['y']:.0f})"
+
+
+@library.step(r"double-click the icon")
+async def open_icon(ctx):
+    await _open(ctx, ctx.vars["icon"])
+
+
+# Windows
+
+@library.step(r"open (?:any|an) application window(?P<focus> and bring it into focus)?")
+async def open_any_window(ctx, app=None, focus=None):
+    window = await _open(ctx, app or next(iter(APPS)))
+    if focus:
+        await window.title_bar.click()
+
+
+@library.step(r"open multiple applications")
+async def open_many(ctx, count=3):
+    for key in list(APPS)[:int(count)]:
+        await _open(ctx, key)
+
+
+@library.step(r"open (?P<app>[\w ]+?) application$")
+async def open_app(ctx, app):
+    await _open(ctx, app)
+
+
+@library.check(r"(?:correct )?application window opens and gains focus",
+               r"corresponding app .*window opens")
+async def check_window_focused(ctx):
+    window = _window(ctx)
+    await expect(window.root).to_be_visible()
+    await expect(window.root).to_have_class(re.compile(r"\bborder-blue-500\b"))
+
+
+@library.step(r"drag window to new location")
+async def drag_window(ctx):
+    page = await ctx.ensure_page()
+    window = _window(ctx)
+    before = await _box(window.root)
+    await _drag(page, window.title_bar, *DRAG_OFFSET)
+    ctx.vars["window_box"] = (before, await _box(window.root))
+
+
+@library.step(r"drag (?:the )?window continuously(?: for (?P<seconds>[\d.]+) ?s)?")
+async def drag_window_continuously(ctx, seconds="1", path="line"):
+    # One mouse move per frame, the way a person drags, rather than _drag's ten jumps
+    page = await ctx.ensure_page()
+    moves, _, _ = await drag_continuously(page, _window(ctx), path, rate=60, duration=float(seconds))
+    ctx.vars["drag_moves"] = moves
+
+
+@library.check(r"window position is updated")
+async def check_window_moved(ctx):
+    before, after = ctx.vars["window_box"]
+    moved = (after["x"] - before["x"], after["y"] - before["y"])
+    assert _close(moved[0], DRAG_OFFSET[0]) and _close(moved[1], DRAG_OFFSET[1]), \
+        f"window moved by ({moved[0]:.0f}, {moved[1]:.0f}), expected {DRAG_OFFSET}"
+
+
+@library.step(r"resize window .*dragging edges")
+async def resize_window(ctx):
+    page = await ctx.ensure_page()
+    window = _window(ctx)
+    before = await _box(window.root)
+    corner = lambda box: (box["x"] + box["width"] - 3, box["y"] + box["height"] - 3)
+    await _drag(page, window.root, *RESIZE_OFFSET, anchor=corner)
+    ctx.vars["window_box"] = (before, await _box(window.root))
+
+
+@library.check(r"window resizes")
+async def check_window_resized(ctx):
+    before, after = ctx.vars["window_box"]
+    assert after["width"] > before["width"] and after["height"] > before["height"], \
+        f"window is {after['width']:.0f}x{after['height']:.0f}, was {before['width']:.0f}x{before['height']:.0f}"
+
+
+@library.step(r"move and resize an open application window")
+async def move_and_resize(ctx):
+    if "window" not in ctx.vars:
+        await _open(ctx, next(iter(APPS)))
+    await drag_window(ctx)
+    await resize_window(ctx)
+
+
+@library.check(r"window sizes and positions are restored")
+async def check_window_restored(ctx):
+    page = await ctx.ensure_page()
+    window = _window(ctx)
+    await settle(page, window.root)
+    box = await _box(window.root)
+    _, expected = ctx.vars["window_box"]
+    for dim in ("x", "y", "width", "height"):
+        assert _close(box[dim], expected[dim]), f"window {dim} is {box[dim]:.0f}, expected {expected[dim]:.0f}"
+
+
+@library.step(r"click minimize button")
+async def minimize_window(ctx):
+    await _window(ctx).minimize()
+
+
+@library.check(r"window minimizes to taskbar")
+async def check_minimized(ctx):
+    page = await ctx.ensure_page()
+    window = _window(ctx)
+    await expect(window.root).to_be_hidden()
+    await expect(Taskbar(page).window_button(window.app.id)).to_be_visible()
+
+
+@library.step(r"click maximize button")
+async def maximize_window(ctx):
+    page = await ctx.ensure_page()
+    window = _window(ctx)
+    if not await window.root.is_visible():
+        await Taskbar(page).window_button(window.app.id).click()
+        await settle(page, window.root)
+    await window.toggle_maximize()
+    await settle(page, window.root)
+
+
+@library.check(r"window maximizes")
+async def check_maximized(ctx):
+    page = await ctx.ensure_page()
+    box = await _box(_window(ctx).root)
+    width = page.viewport_size["width"]
+    assert box["width"] >= width - POSITION_TOLERANCE_PX, f"window is {box['width']:.0f}px wide on a {width}px viewport"
+
+
+@library.step(r"drag window to (?:the )?edge")
+async def snap_window(ctx):
+    page = await ctx.ensure_page()
+    window = _window(ctx)
+    box = await _box(window.root)
+    if box["width"] >= page.viewport_size["width"] - POSITION_TOLERANCE_PX:
+        await window.toggle_maximize()
+        await settle(page, window.root)
+        box = await _box(window.root)
+    # window.tsx snaps a window released within 20px of an edge onto it
+    await _drag(page, window.title_bar, 10 - box["x"], 0)
+    ctx.vars["snapped_box"] = await _box(window.root)
+
+
+@library.check(r"window snaps")
+async def check_snapped(ctx):
+    box = ctx.vars["snapped_box"]
+    assert _close(box["x"], 0), f"window left edge at {box['x']:.0f}px after dropping it near the edge"
+
+
+@library.step(r"use keyboard shortcuts (?:to|for) minimize")
+async def window_shortcuts(ctx):
+    # The app binds Ctrl+Alt+T (Terminal), Ctrl+Alt+C (Contact) and Escape
+    # (close the focused window); there are no minimize/maximize/snap keys
+    page = await ctx.ensure_page()
+    outcomes = {}
+    for keys, target in (("Control+Alt+t", "terminal"), ("Control+Alt+c", "contact")):
+        await page.keyboard.press(keys)
+        window = window_for(page, target)
+        await settle(page, window.root)
+        outcomes[keys] = await window.root.is_visible()
+        await page.keyboard.press("Escape")
+        await settle(page)
+        outcomes[f"{keys} then Escape"] = not await window.root.is_visible()
+    ctx.vars["shortcuts"] = outcomes
+
+
+@library.check(r"shortcut.* (?:perform|triggers) (?:the )?(?:expected|correct)")
+async def check_shortcuts(ctx):
+    failed = [keys for keys, ok in ctx.vars["shortcuts"].items() if not ok]
+    assert not failed, f"shortcuts without the expected effect: {', '.join(failed)}"
+
+
+@library.check(r"remains? (?:stable|operational)", r"no unexpected side effects")
+async def check_stable(ctx):
+    page = await ctx.ensure_page()
+    assert not ctx.errors, f"uncaught page errors: {'; '.join(ctx.errors)}"
+    assert await page.evaluate("() => 1 + 1") == 2
+    await expect(Taskbar(page).root).to_be_visible()
+
+
+@library.step(r"perform window drag, resize, theme switch")
+async def measure_interactions(ctx):
+    page = await ctx.ensure_page()
+    probe = await PerfProbe.attach(page)
+    await probe.start()
+    await _open(ctx, "about")
+    await drag_window(ctx)
+    await resize_window(ctx)
+    await switch_themes(ctx, themes=("Dark", "Light"))
+    ctx.vars["perf"] = await probe.stop("drag, resize, theme switch and open")
+
+
+@library.check(r"animations are smooth")
+async def check_smooth(ctx, budget="TC010"):
+    check_budget(budget, ctx.vars["perf"])
+
+
+@library.check(r"lazy loading triggers")
+async def check_lazy_loaded(ctx):
+    page = await ctx.ensure_page()
+    for key in ctx.vars.get("opened", []):
+        window = window_for(page, key)
+        await expect(window.content.get_by_text("Loading...")).to_have_count(0, timeout=10000)
+    assert not ctx.errors, f"uncaught page errors: {'; '.join(ctx.errors)}"
+
+
+# Persistence
+
+@library.step(r"reload the (?:browser|application)")
+async def reload(ctx):
+    page = await ctx.ensure_page()
+    await page.reload()
+    await page.locator("html[data-window-state='loaded']").wait_for(state="attached", timeout=BOOT_TIMEOUT_MS)
+    await settle(page)
+
+
+# Settings
+
+async def _settings(ctx):
+    window = ctx.vars.get("window")
+    if not isinstance(window, SettingsWindow):
+        window = await _open(ctx, "settings")
+    return window
+
+
+@library.step(r"change theme to|switch between light, dark,? and system theme")
+async def switch_themes(ctx, themes=("Dark", "Light", "System")):
+    page = await ctx.ensure_page()
+    settings = await _settings(ctx)
+    await settings.tab("Appearance").click()
+    classes = {}
+    for theme in themes:
+        await settings.option(theme).click()
+        await settle(page)
+        classes[theme] = await page.evaluate("() => document.documentElement.className")
+    ctx.vars["themes"] = classes
+
+
+@library.check(r"theme updates accordingly")
+async def check_themes(ctx):
+    classes = ctx.vars["themes"]
+    if "Dark" in classes:
+        assert "dark" in classes["Dark"].split(), "html has no 'dark' class in dark mode"
+    if "Light" in classes:
+        assert "dark" not in classes["Light"].split(), "html keeps the 'dark' class in light mode"
+
+
+@library.step(r"select different wallpaper")
+async def switch_wallpapers(ctx, wallpapers=("Mountains", "City")):
+    page = await ctx.ensure_page()
+    settings = await _settings(ctx)
+    await settings.tab("Personalization").click()
+    for wallpaper in wallpapers:
+        await settings.option(wallpaper).click()
+    ctx.vars["wallpaper"] = await page.evaluate("() => localStorage.getItem('portfolio-wallpaper')")
+
+
+async def _check_wallpaper(page, expected):
+    assert expected, "no wallpaper was selected"
+    desktop = page.get_by_role("main", name="Desktop")
+    await expect(desktop).to_have_attribute("style", re.compile(re.escape(expected)))
+
+
+@library.check(r"wallpaper updates immediately")
+async def check_wallpaper(ctx):
+    await _check_wallpaper(await ctx.ensure_page(), ctx.vars.get("wallpaper"))
+
+
+@library.check(r"theme and wallpaper persist")
+async def check_customization_persisted(ctx):
+    page = await ctx.ensure_page()
+    await _check_wallpaper(page, ctx.vars.get("wallpaper"))
+    themes = list(ctx.vars.get("themes", {}))
+    if themes:
+        saved = await page.evaluate("() => localStorage.getItem('theme')")
+        assert saved == themes[-1].lower(), f"saved theme is {saved!r}, expected {themes[-1].lower()!r}"
+
+
+# Contact form
+
+async def _contact(ctx):
+    window = ctx.vars.get("window")
+    if not isinstance(window, ContactWindow):
+        window = await _open(ctx, "contact")
+    return window
+
+
+async def _submit_contact(ctx, name, email, message):
+    page = await ctx.ensure_page()
+    window = await _contact(ctx)
+    try:
+        async with page.expect_response("**/api/contact") as response:
+            await window.submit(name, email, message)
+        ctx.vars["contact_status"] = (await response.value).status
+    finally:
+        # A failure injected into the shared Resend stub lasts for one send only
+        restore = ctx.vars.pop("resend_restore", None)
+        if restore:
+            url, profile = restore
+            await asyncio.to_thread(set_profile, url, **profile)
+
+
+@library.step(r"submit empty form")
+async def submit_empty_contact(ctx):
+    window = await _contact(ctx)
+    await window.submit_button.click()
+
+
+@library.check(r"validation errors shown for required fields")
+async def check_required_errors(ctx):
+    messages = (await _contact(ctx)).content.locator("[id$='-form-item-message']")
+    await expect(messages.first).to_be_visible()
+
+
+@library.step(r"fill inputs with invalid email")
+async def submit_invalid_email(ctx):
+    window = await _contact(ctx)
+    await window.submit(VALID_CONTACT["name"], "not-an-email", VALID_CONTACT["message"])
+
+
+@library.check(r"validation error for invalid email")
+async def check_email_error(ctx):
+    await expect((await _contact(ctx)).content.get_by_text("Please enter a valid email.")).to_be_visible()
+
+
+@library.step(r"fill valid data and submit|submit form with valid inputs")
+async def submit_valid_contact(ctx):
+    await _submit_contact(ctx, **VALID_CONTACT)
+
+
+@library.step(r"simulate server error response")
+async def submit_with_server_error(ctx):
+    page = await ctx.ensure_page()
+    await page.route("**/api/contact", lambda route: route.fulfill(
+        status=500, json={"message": "Simulated server error"}))
+    await _submit_contact(ctx, **VALID_CONTACT)
+
+
+# What route.ts answers when resend.emails.send reports an error
+RESEND_FAILURE = {"success": False, "message": "Failed to send message. Please try again."}
+
+
+@library.step(r"simulate resend api failure")
+async def simulate_resend_failure(ctx):
+    stub = os.environ.get("RESEND_BASE_URL")
+    if stub:
+        # The app sends through the Resend stub (--resend-stub): make the next send fail for real
+        ctx.vars["resend_restore"] = (stub, await asyncio.to_thread(get_profile, stub))
+        await asyncio.to_thread(set_profile, stub, error_rate=1.0, rate_limit_rate=0.0, hang_rate=0.0)
+        ctx.vars["resend_failure"] = "stub"
+        return
+    # Otherwise the route never calls Resend; answer the way it does when Resend fails
+    page = await ctx.ensure_page()
+    await page.route("**/api/contact", lambda route: route.fulfill(status=500, json=RESEND_FAILURE), times=1)
+    ctx.vars["resend_failure"] = "route"
+
+
+@library.check(r"form submits successfully")
+async def check_contact_sent(ctx):
+    status = ctx.vars.get("contact_status")
+    assert status == 200, f"/api/contact answered {status}"
+
+
+@library.check(r"fallback simulation triggers")
+async def check_resend_fallback(ctx):
+    page = await ctx.ensure_page()
+    assert ctx.vars.get("resend_failure"), "no earlier step simulated a Resend failure"
+    status = ctx.vars.get("contact_status")
+    assert status == 500, f"/api/contact answered {status}, expected the 500 of a failed Resend send"
+    await expect(page.get_by_text(RESEND_FAILURE["message"]).first).to_be_visible()
+    # The form survives the failure and can be sent again
+    await expect((await _contact(ctx)).submit_button).to_be_enabled()
+
+
+@library.check(r"success (?:toast )?notification is (?:displayed|shown)")
+async def check_success_toast(ctx):
+    page = await ctx.ensure_page()
+    await expect(page.get_by_text("Success!", exact=True)).to_be_visible()
+
+
+@library.check(r"error toast notification")
+async def check_error_toast(ctx):
+    page = await ctx.ensure_page()
+    await expect(page.get_by_text("Error", exact=True)).to_be_visible()
+
+
+# Search and notifications
+
+@library.step(r"focus on the system search input")
+async def focus_search(ctx):
+    page = await ctx.ensure_page()
+    await page.keyboard.press("Control+k")
+    search = page.get_by_placeholder("Search apps, files, and more...")
+    await expect(search).to_be_focused()
+    ctx.vars["search"] = search
+
+
+@library.step(r"type partial application names")
+async def type_search(ctx, query="Calc"):
+    await ctx.vars["search"].fill(query)
+    ctx.vars["query"] = query
+
+
+@library.check(r"relevant search results appear")
+async def check_search_results(ctx):
+    page = await ctx.ensure_page()
+    query = ctx.vars["query"].lower()
+    expected = [a for a in APPS.values() if a.title.lower().startswith(query)]
+    assert expected, f"no app title starts with {query!r}"
+    await expect(page.get_by_role("button", name=re.compile(re.escape(expected[0].title))).first).to_be_visible()
+    ctx.vars["search_hit"] = expected[0].id
+
+
+@library.step(r"select a result")
+async def pick_search_result(ctx):
+    page = await ctx.ensure_page()
+    target = app(ctx.vars["search_hit"])
+    await page.get_by_role("button", name=re.compile(re.escape(target.title))).first.click()
+    ctx.vars["window"] = window_for(page, target.id)
+    await settle(page, ctx.vars["window"].root)
+
+
+@library.step(r"use keyboard to open notification center")
+async def open_notifications(ctx):
+    page = await ctx.ensure_page()
+    await NotificationCenter(page).toggle_button.focus()
+    await page.keyboard.press("Enter")
+
+
+@library.check(r"notification center opens")
+async def check_notifications_open(ctx):
+    page = await ctx.ensure_page()
+    await expect(NotificationCenter(page).panel).to_be_visible()
@@ -0,0 +1,187 @@
+"""Count what the app reads from and writes to Web Storage, per key.
+
+``saveWindowsState`` and ``saveIconsState`` in ``window-context.tsx``
+serialise the whole window or icon list on every change, and the settings,
+notification center and user profile persist on change too. The init
+script here wraps ``Storage.prototype.setItem``, ``getItem`` and
+``removeItem`` and, for each ``local:`` or ``session:`` key, records
+
+* calls, and how many writes stored the value that was already there,
+* bytes written and read (UTF-16, which is how Chromium counts quota),
+* time spent in the storage call itself, and
+* time spent in the ``JSON.stringify`` that produced the value written.
+
+``python -m harness.storage`` runs a scripted session through the plan step
+library: focus a window, drag it with a realistic stream of mouse moves,
+resize it, switch themes and rearrange icons. It reports per key for each
+step and for the whole session, in ``tmp/storage/storage.json``::
+
+    python -m harness.storage
+"""
+
+import asyncio
+import json
+
+from playwright import async_api
+
+from .auth import ensure_session, new_session_context
+from .browser import browser_source
+from .plan import execute
+from .suite import TMP_DIR
+
+STORAGE_DIR = TMP_DIR / "storage"
+REPORT_PATH = STORAGE_DIR / "storage.json"
+
+STORAGE_INIT_JS = """
+(() => {
+  let stats = {};
+  let lastJson = null;
+  const now = () => performance.now();
+  const entry = (storage, key) => {
+    const name = (storage === window.sessionStorage ? 'session:' : 'local:') + key;
+    return stats[name] || (stats[name] = {
+      sets: 0, unchanged: 0, bytesWritten: 0, setMs: 0, stringifyMs: 0,
+      gets: 0, bytesRead: 0, getMs: 0, removes: 0,
+    });
+  };
+
+  const stringify = JSON.stringify;
+  JSON.stringify = function (...args) {
+    const started = now();
+    const out = stringify.apply(this, args);
+    lastJson = { out, ms: now() - started };
+    return out;
+  };
+
+  const proto = Storage.prototype;
+  const setItem = proto.setItem, getItem = proto.getItem, removeItem = proto.removeItem;
+  proto.setItem = function (key, value) {
+    value = String(value);
+    const e = entry(this, key);
+    if (getItem.call(this, key) === value) e.unchanged++;
+    if (lastJson && lastJson.out === value) e.stringifyMs += lastJson.ms;
+    lastJson = null;
+    const started = now();
+    try {
+      return setItem.call(this, key, value);
+    } finally {
+      e.setMs += now() - started;
+      e.sets++;
+      e.bytesWritten += value.length * 2;
+    }
+  };
+  proto.getItem = function (key) {
+    const started = now();
+    const value = getItem.call(this, key);
+    const e = entry(this, key);
+    e.getMs += now() - started;
+    e.gets++;
+    e.bytesRead += value === null ? 0 : value.length * 2;
+    return value;
+  };
+  proto.removeItem = function (key) {
+    entry(this, key).removes++;
+    return removeItem.call(this, key);
+  };
+
+  // Counters since the last take(), then start over
+  window.__harnessStorage = { take: () => { const taken = stats; stats = {}; return taken; } };
+})();
+"""
+
+# Drag, resize and theme switch as a user would do them, one window open
+SESSION = {
+    "id": "storage",
+    "title": "Web Storage traffic of a desktop session",
+    "steps": [
+        {"type": "action", "description": "Open an application window and bring it into focus"},
+        {"type": "action", "description": "Drag the window continuously for 2s"},
+        {"type": "action", "description": "Drag window to new location"},
+        {"type": "action", "description": "Resize window by dragging edges"},
+        {"type": "action", "description": "Switch between light, dark and system theme"},
+        {"type": "action", "description": "Rearrange multiple desktop icons"},
+    ],
+}
+
+TIMES = ("setMs", "stringifyMs", "getMs")
+
+
+async def install_storage_profiler(context):
+    """Instrument Web Storage in every page of ``context``."""
+    await context.add_init_script(script=STORAGE_INIT_JS)
+
+
+async def take(page):
+    """Per-key counters since the previous call, rounded for the report."""
+    stats = await page.evaluate("() => window.__harnessStorage.take()")
+    for counters in stats.values():
+        for key in TIMES:
+            counters[key] = round(counters[key], 2)
+    return stats
+
+
+def merge(into, stats):
+    for key, counters in stats.items():
+        total = into.setdefault(key, dict.fromkeys(counters, 0))
+        for name, value in counters.items():
+            total[name] = round(total[name] + value, 2)
+    return into
+
+
+def by_writes(stats):
+    return dict(sorted(stats.items(), key=lambda item: (-item[1]["bytesWritten"], item[0])))
+
+
+async def profile_session(context, session=SESSION):
+    """Run ``session``'s steps in ``context``; return per-step and total storage traffic."""
+    await install_storage_profiler(context)
+    steps, totals, pages = [], {}, []
+    context.on("page", pages.append)
+    async for result in execute(session, context):
+        stats = await take(pages[-1]) if pages else {}
+        merge(totals, stats)
+        steps.append({"step": result.description, "status": result.status, "error": result.error,
+                      "keys": by_writes(stats)})
+    return {"steps": steps, "total": by_writes(totals)}
+
+
+async def run_profile(session=SESSION):
+    pw = await async_api.async_playwright().start()
+    source = browser_source(pw)
+    try:
+        browser = await source.get()
+        try:
+            context = await new_session_context(browser, await ensure_session(browser))
+            try:
+                return await profile_session(context, session)
+            finally:
+                await context.close()
+        finally:
+            await source.release(browser)
+    finally:
+        await source.close()
+        await pw.stop()
+
+
+def format_report(report):
+    lines = [f"{'key':<32} {'writes':>7} {'same':>5} {'KB out':>8} {'set ms':>7} {'json ms':>8} {'reads':>6}"]
+    for key, c in report["total"].items():
+        lines.append(f"{key:<32} {c['sets']:>7} {c['unchanged']:>5} {c['bytesWritten'] / 1024:>8.1f} "
+                     f"{c['setMs']:>7.1f} {c['stringifyMs']:>8.1f} {c['gets']:>6}")
+    for step in report["steps"]:
+        writes = sum(c["sets"] for c in step["keys"].values())
+        status = "" if step["status"] == "PASSED" else f" [{step['status']}: {step['error']}]"
+        lines.append(f"  {writes:>5} writes during: {step['step']}{status}")
+    return "\n".join(lines)
+
+
+def main():
+    report = asyncio.run(run_profile())
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(format_report(report))
+    print(f"report in {REPORT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
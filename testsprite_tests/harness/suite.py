@@ -0,0 +1,121 @@
+"""Discovery of TC scripts and the test_results.json record format."""
+
+import importlib.util
+import json
+import os
+import traceback
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT = SUITE_DIR.parent
+TMP_DIR = SUITE_DIR / "tmp"
+PLAN_PATH = SUITE_DIR / "testsprite_frontend_test_plan.json"
+RESULTS_PATH = TMP_DIR / "test_results.json"
+
+# Where the app under test is served, unless HARNESS_BASE_URL says otherwise
+BASE_URL = "http://localhost:3000"
+BASE_URL_ENV = "HARNESS_BASE_URL"
+
+
+def app_url(path=""):
+    """URL of ``path`` on the app under test, e.g. ``app_url("/login")``.
+
+    Read on every call, so a worker that starts its own server only has to
+    set ``HARNESS_BASE_URL`` before running tests.
+    """
+    return os.environ.get(BASE_URL_ENV, BASE_URL).rstrip("/") + path
+
+
+@dataclass
+class TestCase:
+    """One TCxxx script together with its entry in the test plan."""
+
+    id: str
+    title: str
+    description: str
+    path: Path
+    features: list = field(default_factory=list)
+
+    @property
+    def name(self):
+        return f"{self.id}-{self.title}"
+
+    def source(self):
+        return self.path.read_text(encoding="utf-8")
+
+    def load(self):
+        """Import the script without running it and return its module."""
+        spec = importlib.util.spec_from_file_location(self.path.stem, self.path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    @staticmethod
+    def needs_session(module):
+        """Whether the script expects to start logged in on the desktop."""
+        return getattr(module, "AUTHENTICATED", False)
+
+
+def load_plan():
+    """Return the test plan entries keyed by TC id."""
+    with open(PLAN_PATH, encoding="utf-8") as f:
+        return {entry["id"]: entry for entry in json.load(f)}
+
+
+def discover(ids=None):
+    """Find the TC scripts in the suite directory, optionally filtered by id."""
+    plan = load_plan()
+    wanted = {i.upper() for i in ids} if ids else None
+    cases = []
+    for path in sorted(SUITE_DIR.glob("TC[0-9][0-9][0-9]_*.py")):
+        tc_id = path.name.split("_", 1)[0]
+        if wanted is not None and tc_id not in wanted:
+            continue
+        entry = plan.get(tc_id, {})
+        cases.append(TestCase(
+            id=tc_id,
+            title=entry.get("title", path.stem.split("_", 1)[1].replace("_", " ")),
+            description=entry.get("description", ""),
+            path=path,
+            features=entry.get("features", []),
+        ))
+    return cases
+
+
+def timestamp():
+    """UTC timestamp in the same format TestSprite writes."""
+    now = datetime.now(timezone.utc)
+    return now.strftime("%Y-%m-%dT%H:%M:%S.") + f"{now.microsecond // 1000:03d}Z"
+
+
+def format_error(exc):
+    """Render a test failure the way it should appear in ``testError``."""
+    if isinstance(exc, AssertionError) and str(exc):
+        return str(exc)
+    return "".join(traceback.format_exception_only(type(exc), exc)).strip()
+
+
+def make_result(case, status, error, created, modified):
+    """Build one record in the shape of tmp/test_results.json."""
+    return {
+        "title": case.name,
+        "description": case.description,
+        "code": case.source(),
+        "testStatus": status,
+        "testError": error,
+        "testType": "FRONTEND",
+        "createFrom": "local",
+        "created": created,
+        "modified": modified,
+    }
+
+
+def write_results(results, path=RESULTS_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    results = sorted(results, key=lambda r: r["title"])
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
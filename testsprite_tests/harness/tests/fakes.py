@@ -0,0 +1,97 @@
+"""Minimal stand-ins for Playwright's browser, context, page and locator.
+
+They record what was done to them and time nothing themselves; register
+them with :func:`register` so that :mod:`harness.actions` wraps them the
+way it wraps the real classes.
+"""
+
+from playwright import async_api
+
+from harness import actions
+
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    def __repr__(self):
+        return f"<Locator frame=<Frame> selector='{self.selector}'>"
+
+    @property
+    def first(self):
+        return self
+
+    def get_by_role(self, role, name=None, exact=None):
+        return FakeLocator(self.page, f"{self.selector} >> internal:role={role}[name={name!r}]")
+
+    def get_by_label(self, text):
+        return FakeLocator(self.page, f"{self.selector} >> internal:label={text!r}")
+
+    async def wait_for(self, state="visible", timeout=None):
+        if self.selector not in self.page.present:
+            raise async_api.Error(f"{self.selector} not attached")
+
+    async def click(self, timeout=None):
+        self.page.clicked.append(self.selector)
+
+    async def fill(self, value, timeout=None):
+        self.page.filled[self.selector] = value
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = "http://localhost:3000/"
+        self.present = set()
+        self.clicked = []
+        self.filled = {}
+        self.evaluations = 0
+        self.dom_version = 1
+
+    def get_by_test_id(self, test_id):
+        return FakeLocator(self, f"internal:testid=[data-testid={test_id!r}s]")
+
+    def get_by_role(self, role, name=None, exact=None):
+        return FakeLocator(self, f"internal:role={role}[name={name!r}]")
+
+    async def evaluate(self, expression, arg=None):
+        self.evaluations += 1
+        return f"{self.url}#{self.dom_version}"
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.closed = False
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    async def new_context(self, **options):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+
+def register(monkeypatch):
+    """Have :mod:`harness.actions` wrap the fakes like their Playwright counterparts."""
+    monkeypatch.setitem(actions.KINDS, FakeContext, actions.KINDS[async_api.BrowserContext])
+    monkeypatch.setitem(actions.KINDS, FakePage, actions.KINDS[async_api.Page])
+    monkeypatch.setitem(actions.KINDS, FakeLocator, actions.KINDS[async_api.Locator])
@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+from harness import actions, runner, suite
+from harness.actions import is_timed, start_action_log, timed_context, unwrap
+from harness.pages import ContactWindow, Desktop, locators
+from harness.tests.fakes import FakeBrowser, FakeContext, register
+
+
+def test_stand_ins_time_actions_and_pass_isinstance(monkeypatch, tmp_path):
+    register(monkeypatch)
+    monkeypatch.setenv(actions.ACTION_LOG_ENV, str(tmp_path / "actions.jsonl"))
+
+    async def scenario():
+        log = start_action_log("TC000-Example")
+        context = timed_context(FakeContext())
+        page = await context.new_page()
+        await page.goto("http://localhost:3000/login")
+        page.present.add("#ok")
+        await page.get_by_role("button", name="Go").click()
+        log.close()
+        return context, page, log
+
+    context, page, log = asyncio.run(scenario())
+    assert is_timed(context) and is_timed(page) and is_timed(context.pages[-1])
+    assert isinstance(page, type(unwrap(page)))
+    assert context.pages[-1] == page
+    assert log.summary()["count"] == 2
+    lines = [json.loads(line) for line in (tmp_path / "actions.jsonl").read_text().splitlines()]
+    assert [line["action"] for line in lines] == ["FakePage.goto", "FakeLocator.click"]
+    assert lines[0]["target"] == "http://localhost:3000/login"
+
+
+def test_page_objects_share_one_registry_through_timed_context(monkeypatch):
+    register(monkeypatch)
+
+    async def scenario():
+        context = timed_context(FakeContext())
+        await context.new_page()
+        first, second = Desktop(context.pages[-1]), Desktop(context.pages[-1])
+        assert first.locators is second.locators is locators(unwrap(context.pages[-1]))
+        assert first.icon("about") is second.icon("about")
+        page = unwrap(context.pages[-1])
+        page.present.add(first.icon("about").selector)
+        await first.open("about")
+        return page
+
+    page = asyncio.run(scenario())
+    assert page.clicked == ["internal:testid=[data-testid='desktop-icon-about's]"]
+
+
+def test_page_object_action_reads_the_dom_version_once(monkeypatch):
+    register(monkeypatch)
+
+    async def scenario():
+        context = timed_context(FakeContext())
+        await context.new_page()
+        contact = ContactWindow(context.pages[-1])
+        page = unwrap(context.pages[-1])
+        for field in (contact.name_field, contact.email_field, contact.message_field, contact.submit_button):
+            page.present.add(field.selector)
+        page.present.add(contact.close_button.selector)
+        await contact.submit("Ada", "ada@example.com", "Hello")
+        after_submit = page.evaluations
+        await contact.close()
+        return page, after_submit
+
+    page, after_submit = asyncio.run(scenario())
+    # One read for the four targets of submit(), another for the separate close()
+    assert (after_submit, page.evaluations) == (1, 2)
+    assert list(page.filled.values()) == ["Ada", "ada@example.com", "Hello"]
+    assert len(page.clicked) == 2
+
+
+def test_run_case_hands_scripts_a_timed_context(monkeypatch, tmp_path):
+    register(monkeypatch)
+    monkeypatch.setenv("HARNESS_NETWORK", "live")
+    monkeypatch.delenv(actions.ACTION_LOG_ENV, raising=False)
+    script = tmp_path / "TC000_Example.py"
+    script.write_text(
+        "from harness import Desktop\n"
+        "\n"
+        "async def run_steps(context):\n"
+        "    page = await context.new_page()\n"
+        "    page.present.add(\"internal:testid=[data-testid='desktop-icon-about's]\")\n"
+        "    await page.goto('http://localhost:3000/')\n"
+        "    window = await Desktop(context.pages[-1]).open('about')\n"
+        "    assert window.app.id == 'about'\n",
+        encoding="utf-8",
+    )
+    browser = FakeBrowser()
+    result = asyncio.run(runner.run_case(browser, suite.TestCase("TC000", "Example", "", script)))
+    assert result["testStatus"] == "PASSED", result["testError"]
+    # goto, the icon's attached check in require, click
+    assert result["actions"]["count"] == 3
+    assert browser.contexts[0].closed
+
+
+def test_run_case_closes_the_context_when_lean_collect_fails(monkeypatch, tmp_path):
+    register(monkeypatch)
+    monkeypatch.setenv("HARNESS_NETWORK", "live")
+    monkeypatch.delenv(actions.ACTION_LOG_ENV, raising=False)
+
+    class BrokenLean:
+        async def collect(self, context):
+            raise RuntimeError("page crashed")
+
+        def summary(self):
+            return {}
+
+    async def install(context):
+        return BrokenLean()
+
+    monkeypatch.setattr(runner, "install_lean_mode", install)
+    script = tmp_path / "TC000_Example.py"
+    script.write_text(
+        "LEAN = True\n"
+        "\n"
+        "async def run_steps(context):\n"
+        "    raise AssertionError('step failed')\n",
+        encoding="utf-8",
+    )
+    browser = FakeBrowser()
+    result = asyncio.run(runner.run_case(browser, suite.TestCase("TC000", "Example", "", script)))
+    assert browser.contexts[0].closed
+    assert result["errorClass"] == "AssertionError"
+    assert "page crashed" in result["lean"]["error"]
@@ -0,0 +1,20 @@
+import asyncio
+import time
+
+from harness.browser_server import BrowserServer
+
+
+def test_release_ignores_missing_and_unknown_lease_ids():
+    async def scenario():
+        server = BrowserServer()
+        now = time.monotonic()
+        server.leases = {"older": now - 1, "newer": now}
+        await server.release(None)
+        await server.release("not-a-lease")
+        after_bad = set(server.leases)
+        await server.release("newer")
+        return after_bad, set(server.leases)
+
+    after_bad, remaining = asyncio.run(scenario())
+    assert after_bad == {"older", "newer"}
+    assert remaining == {"older"}
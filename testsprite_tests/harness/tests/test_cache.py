@@ -0,0 +1,67 @@
+import pytest
+
+from harness import cache, suite
+from harness.cache import ResultCache, dependency_files
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "REPO_ROOT", tmp_path)
+    (tmp_path / "src" / "lib").mkdir(parents=True)
+    (tmp_path / "src" / "lib" / "utils.ts").write_text("export const a = 1;\n")
+    (tmp_path / "src" / "icons.tsx").write_text("export default null;\n")
+    (tmp_path / "package.json").write_text("{}\n")
+    script = tmp_path / "TC001_Example.py"
+    script.write_text("async def run_steps(context):\n    pass\n")
+    return tmp_path
+
+
+def make_case(repo, features=("Desktop Icons",)):
+    return suite.TestCase("TC001", "Example", "", repo / "TC001_Example.py", list(features))
+
+
+def make_cache(repo, **environment):
+    result_cache = ResultCache(repo / "cache", environment=environment)
+    result_cache._features = {"Desktop Icons": ["src/icons.tsx"]}
+    result_cache._shared = ["src/lib/utils.ts"]
+    result_cache._browser = "chromium-test"
+    return result_cache
+
+
+def test_dependency_files_include_features_shared_and_global_files(repo):
+    files = dependency_files(make_case(repo), {"Desktop Icons": ["src/icons.tsx"]}, ["src/lib/utils.ts"])
+    assert {"src/icons.tsx", "src/lib/utils.ts", "package.json"} <= set(files)
+
+
+def test_dependency_files_without_features_cover_every_source(repo):
+    files = dependency_files(make_case(repo, features=()), {})
+    assert {"src/icons.tsx", "src/lib/utils.ts"} <= set(files)
+
+
+def test_key_is_stable(repo):
+    assert make_cache(repo).key(make_case(repo)) == make_cache(repo).key(make_case(repo))
+
+
+def test_key_changes_with_a_shared_file(repo):
+    before = make_cache(repo).key(make_case(repo))
+    (repo / "src" / "lib" / "utils.ts").write_text("export const a = 2;\n")
+    assert make_cache(repo).key(make_case(repo)) != before
+
+
+def test_key_changes_with_the_environment(repo):
+    case = make_case(repo)
+    keys = {
+        make_cache(repo, baseUrl="http://localhost:3000").key(case),
+        make_cache(repo, baseUrl="http://localhost:4000").key(case),
+        make_cache(repo, baseUrl="http://localhost:3000", resendStub="errors=1").key(case),
+    }
+    assert len(keys) == 3
+
+
+def test_only_passes_are_served(repo):
+    result_cache = make_cache(repo)
+    result_cache.put("passed", {"title": "TC001-Example", "testStatus": "PASSED"})
+    result_cache.put("failed", {"title": "TC001-Example", "testStatus": "FAILED"})
+    assert result_cache.get("passed")["cached"] is True
+    assert result_cache.get("failed") is None
+    assert result_cache.get("missing") is None
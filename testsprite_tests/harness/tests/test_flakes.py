@@ -0,0 +1,74 @@
+import pytest
+
+from harness.flakes import FlakeProfile, profile, wilson_interval
+
+
+def row(status, run_id, error_class=None, error=None, retries=0, script_hash="h1"):
+    return {"run_id": run_id, "status": status, "error_class": error_class, "error": error,
+            "retries": retries, "script_hash": script_hash}
+
+
+def history(statuses, **kwargs):
+    return [row(status, run_id, error_class=None if status == "PASSED" else "TimeoutError", **kwargs)
+            for run_id, status in enumerate(statuses, 1)]
+
+
+def test_wilson_interval_without_runs_is_uninformative():
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_wilson_interval_brackets_the_rate():
+    low, high = wilson_interval(5, 10)
+    assert low < 0.5 < high
+    assert low == pytest.approx(1 - high)
+    assert wilson_interval(0, 10)[0] == 0.0
+    assert wilson_interval(10, 10)[1] == 1.0
+    assert wilson_interval(0, 100)[1] < wilson_interval(0, 10)[1]
+
+
+@pytest.mark.parametrize("statuses, verdict", [
+    (["PASSED"] * 5, "stable"),
+    (["PASSED", "FAILED", "PASSED", "PASSED"], "flaky"),
+    (["PASSED", "PASSED", "FAILED", "FAILED"], "broken"),
+    (["FAILED"] * 4, "broken"),
+    (["PASSED", "PASSED"], "unknown"),
+])
+def test_verdict_follows_the_order_of_failures(statuses, verdict):
+    assert profile("T", history(statuses)).verdict == verdict
+
+
+def test_a_pass_on_retry_is_flaky():
+    rows = history(["PASSED"] * 3) + [row("PASSED", 4, retries=1)]
+    found = profile("T", rows)
+    assert (found.verdict, found.retried_passes) == ("flaky", 1)
+
+
+def test_only_the_current_script_counts():
+    rows = history(["FAILED", "PASSED"], script_hash="old") + [
+        row("PASSED", run_id, script_hash="new") for run_id in (3, 4, 5)]
+    found = profile("T", rows)
+    assert (found.verdict, found.runs) == ("stable", 3)
+
+
+def test_runs_that_failed_everywhere_are_ignored():
+    rows = history(["PASSED", "FAILED", "PASSED", "PASSED"])
+    found = profile("T", rows, skip_runs={2})
+    assert (found.verdict, found.runs, found.skipped) == ("stable", 3, 1)
+
+
+def test_lost_workers_and_connection_failures_are_ignored():
+    rows = [
+        row("PASSED", 1),
+        row("FAILED", 2, "WorkerLost", "RuntimeError: worker exited before reporting a result"),
+        row("PASSED", 3),
+        row("FAILED", 4, "Error", "Error: Page.goto: net::ERR_CONNECTION_REFUSED at http://localhost:3000/"),
+        row("PASSED", 5),
+    ]
+    found = profile("T", rows)
+    assert (found.verdict, found.failures, found.skipped) == ("stable", 0, 2)
+
+
+def test_retries_needed_grows_with_the_failure_rate():
+    rare = FlakeProfile("T", runs=30, failures=1)
+    often = FlakeProfile("T", runs=10, failures=5)
+    assert 1 <= rare.retries_needed() <= often.retries_needed() <= 3
@@ -0,0 +1,14 @@
+import contextlib
+
+from harness import history
+
+
+def test_runs_match_names_literally_by_prefix(tmp_path):
+    path = tmp_path / "history.sqlite"
+    results = [{"title": title, "testStatus": "PASSED", "duration": 1.0}
+               for title in ("TC001_Boot", "TC001XBoot", "TC0015_Theme")]
+    history.record_run(results, "2026-01-01T00:00:00", path=path)
+    with contextlib.closing(history.connect(path)) as conn:
+        # "_" is an ordinary character, not LIKE's single-character wildcard
+        assert [row["test"] for row in history.test_runs(conn, "TC001_Boot")] == ["TC001_Boot"]
+        assert sorted(row["test"] for row in history.test_runs(conn, "TC001")) == ["TC0015_Theme", "TC001XBoot", "TC001_Boot"]
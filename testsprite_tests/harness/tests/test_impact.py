@@ -0,0 +1,40 @@
+from harness.impact import select
+from harness.suite import REPO_ROOT, discover
+
+FEATURE_FILES = {
+    "Desktop Icons": ["src/components/desktop-icons.tsx"],
+    "Untested Feature": ["src/lib/utils.ts"],
+}
+
+
+def test_a_changed_script_selects_its_test():
+    cases = discover()
+    selected, _ = select(cases, [cases[0].path.relative_to(REPO_ROOT).as_posix()], FEATURE_FILES)
+    assert [case.id for case in selected] == [cases[0].id]
+
+
+def test_a_feature_file_selects_the_tests_of_that_feature():
+    cases = discover()
+    selected, _ = select(cases, ["src/components/desktop-icons.tsx"], FEATURE_FILES)
+    assert selected
+    assert {case.id for case in selected} == {case.id for case in cases if "Desktop Icons" in case.features}
+
+
+def test_a_file_no_test_claims_runs_everything():
+    cases = discover()
+    selected, reasons = select(cases, ["src/lib/utils.ts"], FEATURE_FILES)
+    assert selected == cases
+    assert "no test claims it" in reasons["src/lib/utils.ts"]
+
+
+def test_an_unmapped_app_file_runs_everything():
+    cases = discover()
+    selected, reasons = select(cases, ["src/app/layout.tsx"], FEATURE_FILES)
+    assert selected == cases
+    assert "not mapped" in reasons["src/app/layout.tsx"]
+
+
+def test_files_outside_the_app_select_nothing():
+    selected, reasons = select(discover(), ["README.md"], FEATURE_FILES)
+    assert selected == []
+    assert reasons == {"README.md": "outside the app, ignored"}
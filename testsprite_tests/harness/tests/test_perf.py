@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from harness.perf import PerfProbe, cumulative_layout_shift, frame_stats, percentile
+
+
+def shifts(*pairs):
+    return [{"start": start, "value": value} for start, value in pairs]
+
+
+def test_no_shifts_is_zero():
+    assert cumulative_layout_shift([]) == 0.0
+
+
+def test_shifts_close_together_share_a_window():
+    assert cumulative_layout_shift(shifts((0, 0.1), (500, 0.2), (1200, 0.05))) == pytest.approx(0.35)
+
+
+def test_a_one_second_gap_starts_a_new_window():
+    assert cumulative_layout_shift(shifts((0, 0.1), (1500, 0.05), (1600, 0.02))) == pytest.approx(0.1)
+
+
+def test_a_window_ends_after_five_seconds():
+    steady = shifts(*((t, 0.01) for t in range(0, 8000, 500)))
+    assert cumulative_layout_shift(steady) == pytest.approx(0.11)
+
+
+def test_the_worst_window_wins_whatever_the_order():
+    assert cumulative_layout_shift(shifts((5000, 0.3), (0, 0.1), (5100, 0.1))) == pytest.approx(0.4)
+
+
+def test_percentile_is_nearest_rank():
+    assert percentile([], 95) == 0.0
+    assert percentile([5, 1, 3, 2, 4], 50) == 3
+    assert percentile(list(range(1, 101)), 95) == 95
+
+
+def test_frame_stats_count_dropped_frames():
+    frame = 1000 / 60
+    stats = frame_stats([0, frame, 2 * frame, 5 * frame])
+    assert stats["frames"] == 3
+    assert stats["droppedFrames"] == 2
+
+
+class FakeCDP:
+    def __init__(self):
+        self.detached = False
+
+    async def send(self, method):
+        return {"metrics": [{"name": "ScriptDuration", "value": 0.5}]}
+
+    async def detach(self):
+        self.detached = True
+
+
+class FakePerfPage:
+    async def evaluate(self, expression):
+        if "stopFrames" in expression:
+            return {"start": 0.0, "end": 100.0, "times": [0.0, 50.0, 100.0]}
+        if "longTasks" in expression:
+            return {"longTasks": [], "lcp": None, "shifts": []}
+
+
+def test_stop_detaches_the_cdp_session():
+    cdp = FakeCDP()
+    probe = PerfProbe(FakePerfPage(), cdp)
+    probe._baseline = {}
+
+    metrics = asyncio.run(probe.stop("interval"))
+    assert metrics["scriptMs"] == 500.0
+    assert cdp.detached and probe.cdp is None
@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+from harness.resend_stub import FaultProfile, latency_sampler
+
+
+def test_empty_spec_is_the_default_profile():
+    assert FaultProfile.parse("") == FaultProfile()
+    assert FaultProfile.parse(None) == FaultProfile()
+
+
+def test_parse_reads_every_setting():
+    profile = FaultProfile.parse("latency=lognormal:200:0.5, errors=0.1,rate-limit=0.05,hang=0.01,seed=7")
+    assert profile == FaultProfile(latency="lognormal:200:0.5", error_rate=0.1, rate_limit_rate=0.05,
+                                   hang_rate=0.01, seed=7)
+
+
+@pytest.mark.parametrize("spec", ["retries=3", "errors=1.5", "hang=-0.1", "latency=slow", "errors=often"])
+def test_parse_rejects_bad_specs(spec):
+    with pytest.raises(ValueError):
+        FaultProfile.parse(spec)
+
+
+@pytest.mark.parametrize("spec, low, high", [("250", 250, 250), ("100-200", 100, 200), ("exp:50", 0, float("inf"))])
+def test_latency_samples_stay_in_range(spec, low, high):
+    sample = latency_sampler(spec)
+    rng = random.Random(1)
+    assert all(low <= sample(rng) <= high for _ in range(100))
+
+
+def test_outcomes_follow_the_rates():
+    assert FaultProfile().outcome(random.Random(1)) == 200
+    assert FaultProfile(error_rate=1.0).outcome(random.Random(1)) == 500
+    assert FaultProfile(rate_limit_rate=1.0).outcome(random.Random(1)) == 429
+    assert FaultProfile(hang_rate=1.0).outcome(random.Random(1)) == "hang"
@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+from harness.history import record_run
+from harness.schedule import Estimate, actual_makespan, estimate_durations, lpt
+
+
+def cases(*names):
+    return [SimpleNamespace(name=name) for name in names]
+
+
+def test_lpt_places_the_longest_tests_first():
+    estimates = {name: Estimate(seconds, "history") for name, seconds in
+                 {"a": 3.0, "b": 5.0, "c": 3.0, "d": 4.0, "e": 3.0}.items()}
+    ordered, assigned, makespan = lpt(cases("a", "b", "c", "d", "e"), estimates, 2)
+    assert [case.name for case in ordered] == ["b", "d", "a", "c", "e"]
+    assert assigned == [["b", "c"], ["d", "a", "e"]]
+    assert makespan == 10.0
+
+
+def test_lpt_with_no_workers_uses_one():
+    estimates = {"a": Estimate(1.0, "steps"), "b": Estimate(2.0, "steps")}
+    _, assigned, makespan = lpt(cases("a", "b"), estimates, 0)
+    assert assigned == [["b", "a"]]
+    assert makespan == 3.0
+
+
+def test_estimates_use_passing_runs_only(tmp_path):
+    path = tmp_path / "history.sqlite"
+    case = SimpleNamespace(name="TC001-Example", id="TC001", entry={"steps": [{}, {}]}, source=lambda: "code")
+    run = [
+        {"title": case.name, "code": "code", "testStatus": "PASSED", "duration": 10.0},
+        {"title": case.name, "code": "code", "testStatus": "PASSED", "duration": 12.0},
+        {"title": case.name, "code": "code", "testStatus": "FAILED", "testError": "TimeoutError: x", "duration": 1.0},
+        {"title": case.name, "code": "code", "testStatus": "FAILED", "errorClass": "WorkerLost", "duration": 0.0},
+    ]
+    for result in run:
+        record_run([result], "2026-01-01T00:00:00Z", path=path)
+    estimate = estimate_durations([case], path)[case.name]
+    assert (estimate.seconds, estimate.source, estimate.runs) == (11.0, "history", 2)
+
+
+def test_actual_makespan_ignores_lost_workers():
+    ran = {"created": "2026-01-01T00:00:00Z", "modified": "2026-01-01T00:00:04Z"}
+    lost = {"created": "2026-01-01T00:10:00Z", "modified": "2026-01-01T00:10:00Z", "errorClass": "WorkerLost"}
+    assert actual_makespan([ran, lost]) == 4.0
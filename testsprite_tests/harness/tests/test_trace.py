@@ -0,0 +1,76 @@
+from harness.trace import STEP_MARKER, TraceSummary
+
+MAIN = {"pid": 1, "tid": 1}
+
+
+def summarize(events, names=None):
+    summary = TraceSummary()
+    summary.add({**MAIN, "ph": "M", "name": "thread_name", "args": {"name": "CrRendererMain"}})
+    for event in events:
+        summary.add(event)
+    return summary.steps(names or {})
+
+
+def marker(step_id, ts):
+    return {**MAIN, "ph": "X", "name": "clock_sync", "ts": ts, "args": {"sync_id": STEP_MARKER + step_id}}
+
+
+def complete(name, ts, dur):
+    return {**MAIN, "ph": "X", "name": name, "ts": ts, "dur": dur}
+
+
+def test_nested_events_count_self_time():
+    [step] = summarize([
+        marker("s1", 0),
+        complete("RunTask", 1000, 10_000),
+        complete("FunctionCall", 1000, 8000),
+        complete("MinorGC", 2000, 3000),
+    ], {"s1": "open the app"})
+    assert step["step"] == "open the app"
+    assert step["busyMs"] == 10.0
+    assert step["scriptingMs"] == 5.0
+    assert step["gcMs"] == 3.0
+    assert step["gcPauses"] == 1
+    assert step["longestGcMs"] == 3.0
+
+
+def test_nested_run_task_is_not_counted_twice():
+    [step] = summarize([
+        marker("s1", 0),
+        complete("RunTask", 1000, 10_000),
+        complete("RunTask", 4000, 2000),
+        complete("RunTask", 20_000, 1000),
+    ])
+    assert step["busyMs"] == 11.0
+
+
+def test_siblings_after_a_parent_ends_are_not_subtracted():
+    [step] = summarize([
+        marker("s1", 0),
+        complete("FunctionCall", 1000, 2000),
+        complete("Layout", 3000, 1000),
+        complete("Paint", 3500, 1000),
+    ])
+    assert step["scriptingMs"] == 2.0
+    assert step["styleLayoutMs"] == 1.0
+    assert step["paintMs"] == 1.0
+
+
+def test_events_go_to_the_step_they_start_in():
+    first, second = summarize([
+        marker("a", 0),
+        complete("FunctionCall", 1000, 2000),
+        marker("b", 100_000),
+        complete("FunctionCall", 101_000, 4000),
+    ])
+    assert (first["scriptingMs"], second["scriptingMs"]) == (2.0, 4.0)
+    assert first["durationMs"] == 100.0
+    assert "durationMs" not in second
+
+
+def test_other_threads_are_ignored():
+    [step] = summarize([
+        marker("s1", 0),
+        {"pid": 1, "tid": 2, "ph": "X", "name": "FunctionCall", "ts": 1000, "dur": 5000},
+    ])
+    assert step["scriptingMs"] == 0.0
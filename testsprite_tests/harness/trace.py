@@ -0,0 +1,373 @@
+"""Record a Chrome performance trace per test and summarise it per step.
+
+With ``python -m harness --trace`` every test runs under CDP ``Tracing`` on
+the browser. The trace is read back through ``IO.read`` and parsed as it
+arrives: :class:`TraceParser` decodes one event at a time from a small
+buffer, so a multi-hundred-MB trace never sits in memory as a whole. Only
+the totals below are kept.
+
+Step boundaries are clock-sync markers (``Tracing.recordClockSyncMarker``)
+placed by :func:`trace_step`. Plan steps and ``Desktop.open`` /
+``StartMenu.launch`` place one automatically, and a script can add its
+own::
+
+    await trace_step("drag the Terminal window")
+
+For every step, the renderer main thread's
+
+* busy time (top-level tasks),
+* scripting, style/layout and paint self time (a nested event counts once,
+  towards its own kind, and not again in its parent),
+* garbage-collection pauses, and
+* the longest tasks, with the JS functions that ran inside them
+
+go into the test's result record under ``trace``. ``--keep-trace`` also
+writes the raw trace to ``tmp/traces/<test>.json`` for the DevTools
+Performance panel.
+"""
+
+import asyncio
+import base64
+import bisect
+import codecs
+import contextvars
+import heapq
+import json
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from .browser import BROWSER_SERVER_ENV
+from .suite import TMP_DIR
+
+TRACE_DIR = TMP_DIR / "traces"
+
+TRACE_ENV = "HARNESS_TRACE"
+
+CATEGORIES = [
+    "devtools.timeline",
+    "disabled-by-default-devtools.timeline",
+    "disabled-by-default-devtools.timeline.frame",
+    "v8.execute",
+    "blink.user_timing",
+    "toplevel",
+]
+
+# Bytes asked for per IO.read; the browser may return less
+READ_CHUNK = 1 << 20
+
+# Events are attributed to steps by start time, in buckets this wide
+BUCKET_US = 5000
+
+LONG_TASK_US = 50_000
+# Tasks and JS entry points kept per test; the rest only count towards totals
+TOP_TASKS = 10
+TOP_CALLS = 2000
+CALL_MIN_US = 1000
+CALL_SITES_PER_TASK = 3
+
+STEP_MARKER = "harness-step:"
+
+_SEPARATORS = re.compile(r"[\s,]*")
+
+TASK_EVENTS = {"RunTask", "ThreadControllerImpl::RunTask"}
+SCRIPT_EVENTS = {"EvaluateScript", "FunctionCall", "v8.compile", "v8.compileModule",
+                 "v8.evaluateModule", "TimerFire", "FireAnimationFrame", "FireIdleCallback"}
+STYLE_LAYOUT_EVENTS = {"UpdateLayoutTree", "RecalculateStyles", "Layout"}
+PAINT_EVENTS = {"PrePaint", "Paint", "PaintImage", "Layerize", "UpdateLayer", "CompositeLayers", "Commit"}
+GC_EVENTS = {"MinorGC", "MajorGC"}
+
+# Totals per bucket, in this order
+TOTALS = ("busy", "scripting", "styleLayout", "paint", "gc")
+KIND = {name: TOTALS.index("scripting") for name in SCRIPT_EVENTS}
+KIND.update({name: TOTALS.index("styleLayout") for name in STYLE_LAYOUT_EVENTS})
+KIND.update({name: TOTALS.index("paint") for name in PAINT_EVENTS})
+KIND.update({name: TOTALS.index("gc") for name in GC_EVENTS})
+KIND.update({name: TOTALS.index("busy") for name in TASK_EVENTS})
+
+
+def trace_mode():
+    """``""`` (off), ``"summary"`` or ``"keep"`` (also save the raw trace)."""
+    return os.environ.get(TRACE_ENV, "")
+
+
+class TraceParser:
+    """Incremental decoder for the JSON a trace stream delivers.
+
+    Accepts either ``{"traceEvents": [...], ...}`` or a bare event array.
+    :meth:`feed` returns the events completed by each chunk.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._in_array = False
+        self._done = False
+
+    def feed(self, text):
+        self._buffer += text
+        events = []
+        if self._done or not self._in_array and not self._find_array():
+            return events
+        buffer, pos = self._buffer, 0
+        while True:
+            pos = _SEPARATORS.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            if buffer[pos] == "]":
+                self._done = True
+                pos = len(buffer)
+                break
+            try:
+                event, pos = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The event continues in the next chunk
+                break
+            events.append(event)
+        self._buffer = buffer[pos:]
+        return events
+
+    def _find_array(self):
+        match = re.search(r'"traceEvents"\s*:\s*\[', self._buffer)
+        if match:
+            self._buffer = self._buffer[match.end():]
+        elif self._buffer.lstrip().startswith("["):
+            self._buffer = self._buffer.lstrip()[1:]
+        else:
+            # Keep a tail long enough to hold a split "traceEvents": [
+            self._buffer = self._buffer[-32:]
+            return False
+        self._in_array = True
+        return True
+
+
+@dataclass
+class TraceSummary:
+    """Totals that survive parsing; everything else is dropped as it streams by."""
+
+    buckets: dict = field(default_factory=lambda: defaultdict(lambda: defaultdict(lambda: [0.0] * len(TOTALS))))
+    gc_pauses: dict = field(default_factory=lambda: defaultdict(list))
+    long_tasks: list = field(default_factory=list)
+    calls: list = field(default_factory=list)
+    thread_names: dict = field(default_factory=dict)
+    markers: dict = field(default_factory=dict)
+    events: int = 0
+    # Per thread: end of the current top-level task, and the open work events
+    # as (end, kind, bucket)
+    task_ends: dict = field(default_factory=dict)
+    open_events: dict = field(default_factory=lambda: defaultdict(list))
+
+    def add(self, event):
+        self.events += 1
+        name = event.get("name")
+        phase = event.get("ph")
+        thread = (event.get("pid"), event.get("tid"))
+        if phase == "M":
+            if name == "thread_name":
+                self.thread_names[thread] = event.get("args", {}).get("name")
+            return
+        if name == "clock_sync":
+            sync_id = event.get("args", {}).get("sync_id", "")
+            if sync_id.startswith(STEP_MARKER):
+                self.markers[sync_id[len(STEP_MARKER):]] = event["ts"]
+            return
+        if phase != "X" or name not in KIND:
+            return
+
+        ts, dur = event["ts"], event.get("dur", 0)
+        bucket = self.buckets[thread][ts // BUCKET_US]
+        if name in TASK_EVENTS:
+            # A task run from inside another (nested message loop) is part of its busy time
+            if ts < self.task_ends.get(thread, float("-inf")):
+                return
+            self.task_ends[thread] = ts + dur
+            bucket[KIND[name]] += dur
+            if dur >= LONG_TASK_US:
+                self._keep(self.long_tasks, (dur, ts, thread), TOP_TASKS * 4)
+            return
+
+        # Self time: an event nested in another (FunctionCall in TimerFire,
+        # PaintImage in Paint, GC in a call) is taken out of its parent's
+        # total. Chrome writes a thread's complete events in start order.
+        stack = self.open_events[thread]
+        while stack and ts >= stack[-1][0]:
+            stack.pop()
+        bucket[KIND[name]] += dur
+        if stack and ts + dur <= stack[-1][0]:
+            # Taken from the parent's own bucket, so it stays in the parent's step
+            _, parent_kind, parent_bucket = stack[-1]
+            parent_bucket[parent_kind] -= dur
+        else:
+            stack.clear()
+        stack.append((ts + dur, KIND[name], bucket))
+        if name in GC_EVENTS:
+            self.gc_pauses[thread].append((ts, dur))
+        elif name in SCRIPT_EVENTS and dur >= CALL_MIN_US:
+            self._keep(self.calls, (dur, ts, self.events, thread, _call_site(name, event.get("args", {}))), TOP_CALLS)
+
+    @staticmethod
+    def _keep(heap, item, limit):
+        if len(heap) < limit:
+            heapq.heappush(heap, item)
+        else:
+            heapq.heappushpop(heap, item)
+
+    def main_threads(self):
+        return {thread for thread, name in self.thread_names.items() if name == "CrRendererMain"}
+
+    def steps(self, names):
+        """Per-step totals for the step ids in ``names``, in recording order."""
+        threads = self.main_threads()
+        order = sorted((ts, step_id) for step_id, ts in self.markers.items())
+        starts = [ts for ts, _ in order]
+        ends = starts[1:] + [float("inf")]
+        steps = [{
+            "step": names.get(step_id, step_id),
+            "startMs": round((ts - starts[0]) / 1000, 1),
+            **{f"{total}Ms": 0.0 for total in TOTALS},
+            "gcPauses": 0,
+            "longestGcMs": 0.0,
+            "longTasks": [],
+        } for ts, step_id in order]
+        if not steps:
+            return []
+
+        def step_at(ts):
+            index = bisect.bisect_right(starts, ts) - 1
+            return steps[index] if index >= 0 else None
+
+        for thread in threads:
+            for bucket, totals in self.buckets.get(thread, {}).items():
+                step = step_at(max(bucket * BUCKET_US, starts[0]))
+                if step is not None:
+                    for total, value in zip(TOTALS, totals):
+                        step[f"{total}Ms"] += value / 1000
+            for ts, dur in self.gc_pauses.get(thread, []):
+                step = step_at(ts)
+                if step is not None:
+                    step["gcPauses"] += 1
+                    step["longestGcMs"] = max(step["longestGcMs"], round(dur / 1000, 1))
+
+        calls = sorted(self.calls, key=lambda call: call[1])
+        call_starts = [call[1] for call in calls]
+        for dur, ts, thread in sorted(self.long_tasks, reverse=True):
+            step = step_at(ts)
+            if thread not in threads or step is None or len(step["longTasks"]) >= TOP_TASKS:
+                continue
+            inside = [call for call in calls[bisect.bisect_left(call_starts, ts):
+                                             bisect.bisect_left(call_starts, ts + dur)]
+                      if call[3] == thread]
+            step["longTasks"].append({
+                "startMs": round((ts - starts[0]) / 1000, 1),
+                "durationMs": round(dur / 1000, 1),
+                "callSites": [{**site, "durationMs": round(call_dur / 1000, 1)}
+                              for call_dur, _, _, _, site in sorted(inside, key=lambda c: c[0], reverse=True)
+                              [:CALL_SITES_PER_TASK]],
+            })
+
+        for step, end in zip(steps, ends):
+            for total in TOTALS:
+                step[f"{total}Ms"] = round(step[f"{total}Ms"], 1)
+            if end != float("inf"):
+                step["durationMs"] = round((end - starts[0]) / 1000 - step["startMs"], 1)
+        return steps
+
+
+def _call_site(name, args):
+    data = args.get("data") or args.get("beginData") or {}
+    site = {"event": name}
+    for key in ("functionName", "url", "lineNumber", "columnNumber"):
+        if data.get(key) not in (None, ""):
+            site[key] = data[key]
+    if name == "v8.compile" and "fileName" in args:
+        site["url"] = args["fileName"]
+    return site
+
+
+class Tracer:
+    """One CDP ``Tracing`` session over a whole browser."""
+
+    def __init__(self, cdp):
+        self.cdp = cdp
+        self.names = {}
+        self._complete = None
+
+    @classmethod
+    async def start(cls, browser):
+        # Tracing covers the whole browser: on a shared one it would record
+        # other clients' tests, or fail because they are tracing already
+        if os.environ.get(BROWSER_SERVER_ENV):
+            raise RuntimeError("tracing needs a browser of its own; run without --browser-server")
+        cdp = await browser.new_browser_cdp_session()
+        tracer = cls(cdp)
+        await cdp.send("Tracing.start", {
+            "transferMode": "ReturnAsStream",
+            "streamFormat": "json",
+            "traceConfig": {"includedCategories": CATEGORIES, "recordMode": "recordContinuously"},
+        })
+        await tracer.step("run")
+        return tracer
+
+    async def step(self, name):
+        step_id = str(len(self.names))
+        self.names[step_id] = name
+        await self.cdp.send("Tracing.recordClockSyncMarker", {"syncId": STEP_MARKER + step_id})
+
+    async def stop(self, raw_path=None):
+        """End the trace and return the per-step summary, writing the raw trace to ``raw_path``."""
+        _current_tracer.set(None)
+        complete = asyncio.get_running_loop().create_future()
+        self.cdp.once("Tracing.tracingComplete", lambda params: complete.set_result(params))
+        await self.step("end")
+        await self.cdp.send("Tracing.end")
+        stream = (await complete)["stream"]
+
+        parser, summary = TraceParser(), TraceSummary()
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        raw = None
+        if raw_path is not None:
+            raw_path.parent.mkdir(parents=True, exist_ok=True)
+            raw = open(raw_path, "w", encoding="utf-8")
+        try:
+            while True:
+                chunk = await self.cdp.send("IO.read", {"handle": stream, "size": READ_CHUNK})
+                data = chunk["data"]
+                if chunk.get("base64Encoded"):
+                    data = decoder.decode(base64.b64decode(data), final=chunk.get("eof", False))
+                if raw is not None:
+                    raw.write(data)
+                for event in parser.feed(data):
+                    summary.add(event)
+                if chunk.get("eof"):
+                    break
+        finally:
+            if raw is not None:
+                raw.close()
+            await self.cdp.send("IO.close", {"handle": stream})
+            await self.cdp.detach()
+        # The closing marker only bounds the last real step
+        return [step for step in summary.steps(self.names) if step["step"] != "end"]
+
+
+_current_tracer = contextvars.ContextVar("tracer", default=None)
+
+
+async def start_trace(browser):
+    """Start tracing for the current test if ``HARNESS_TRACE`` asks for it; return the tracer."""
+    if not trace_mode():
+        return None
+    tracer = await Tracer.start(browser)
+    _current_tracer.set(tracer)
+    return tracer
+
+
+async def trace_step(name):
+    """Start a new step in the current test's trace; does nothing when not tracing."""
+    tracer = _current_tracer.get()
+    if tracer is not None:
+        await tracer.step(name)
+
+
+def raw_trace_path(case_name):
+    return TRACE_DIR / f"{case_name}.json" if trace_mode() == "keep" else None
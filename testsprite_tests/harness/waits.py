@@ -0,0 +1,130 @@
+"""Condition-driven waits that replace the fixed pre-click sleeps.
+
+Instead of ``await page.wait_for_timeout(3000)`` before every interaction,
+scripts call ``await settle(page, elem)``, which returns as soon as:
+
+* the window manager has restored its state from localStorage
+  (``<html data-window-state="loaded">`` set by ``window-context.tsx``),
+* no finite CSS/WAAPI animation is still running on the page, and
+* the target element is visible and its box has stopped moving, which also
+  covers framer-motion animations driven from requestAnimationFrame.
+
+Every wait is recorded in the active :class:`WaitLog` so a run can report how
+long it actually waited compared with the sleeps it replaced.
+"""
+
+import contextvars
+import re
+import time
+from dataclasses import dataclass, field
+
+from playwright import async_api
+
+from .actions import timed
+
+# The sleep every generated step used to take before acting
+FIXED_SLEEP_MS = 3000
+
+# Upper bound for a single settle; the action's own timeout still applies after
+SETTLE_TIMEOUT_MS = 5000
+
+# Frames an element's box must stay unchanged to count as stable
+STABLE_FRAMES = 2
+
+PAGE_READY_JS = """
+() => {
+  const state = document.documentElement.dataset.windowState;
+  if (state !== undefined && state !== 'loaded') return false;
+  return document.getAnimations().every(a => {
+    const timing = a.effect && a.effect.getComputedTiming();
+    return a.playState !== 'running' || !timing || timing.iterations === Infinity;
+  });
+}
+"""
+
+ELEMENT_STABLE_JS = """
+([el, frames, timeout]) => new Promise(resolve => {
+  const deadline = performance.now() + timeout;
+  let last = null;
+  let same = 0;
+  const tick = () => {
+    const r = el.getBoundingClientRect();
+    const box = [r.x, r.y, r.width, r.height].join(',');
+    same = box === last ? same + 1 : 0;
+    last = box;
+    if (same >= frames) return resolve(true);
+    if (performance.now() > deadline) return resolve(false);
+    requestAnimationFrame(tick);
+  };
+  requestAnimationFrame(tick);
+})
+"""
+
+
+@dataclass
+class WaitLog:
+    """Durations of every condition wait taken during one test."""
+
+    entries: list = field(default_factory=list)
+
+    def record(self, target, waited_ms, satisfied):
+        self.entries.append({"target": target, "ms": round(waited_ms, 1), "satisfied": satisfied})
+
+    @property
+    def waited_ms(self):
+        return sum(e["ms"] for e in self.entries)
+
+    def summary(self):
+        """Total wait time against what the fixed sleeps would have cost."""
+        replaced = len(self.entries) * FIXED_SLEEP_MS
+        return {
+            "count": len(self.entries),
+            "waitedMs": round(self.waited_ms, 1),
+            "fixedSleepMs": replaced,
+            "savedMs": round(replaced - self.waited_ms, 1),
+            "unsatisfied": sum(not e["satisfied"] for e in self.entries),
+        }
+
+
+_current_log = contextvars.ContextVar("wait_log", default=None)
+
+
+def start_wait_log():
+    """Begin recording waits for the current test and return the log."""
+    log = WaitLog()
+    _current_log.set(log)
+    return log
+
+
+def _describe(page, elem):
+    if elem is None:
+        return page.url
+    match = re.search(r"selector='(.*)'", repr(elem))
+    return match.group(1) if match else repr(elem)
+
+
+@timed("wait", lambda page, elem=None, *_, **__: _describe(page, elem))
+async def settle(page, elem=None, timeout=SETTLE_TIMEOUT_MS):
+    """Wait until ``page`` (and ``elem``, if given) is ready to interact with.
+
+    Never raises on timeout: the following action has its own timeout and
+    actionability checks, and reports a clearer error than the wait would.
+    """
+    started = time.monotonic()
+    satisfied = True
+    try:
+        await page.wait_for_function(PAGE_READY_JS, timeout=timeout, polling="raf")
+        if elem is not None:
+            remaining = max(1, timeout - (time.monotonic() - started) * 1000)
+            await elem.wait_for(state="visible", timeout=remaining)
+            handle = await elem.element_handle(timeout=remaining)
+            try:
+                satisfied = await page.evaluate(ELEMENT_STABLE_JS, [handle, STABLE_FRAMES, remaining])
+            finally:
+                await handle.dispose()
+    except async_api.Error:
+        satisfied = False
+
+    log = _current_log.get()
+    if log is not None:
+        log.record(_describe(page, elem), (time.monotonic() - started) * 1000, satisfied)